@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from contextlib import contextmanager
+from functools import partial
 
 import mysql.connector
 
@@ -28,10 +29,40 @@ from dbt.adapters.contracts.connection import (
 )
 from dbt.adapters.sql import SQLConnectionManager
 from dbt.adapters.events.logging import AdapterLogger
-from typing import Optional
+from dbt.adapters.events.types import SQLQuery
+from dbt_common.events.contextvars import get_node_info
+from dbt_common.events.functions import fire_event
+from dbt_common.utils import cast_to_str
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from dbt.adapters.starrocks.helpers.flight import (
+    FlightSQLClient,
+    get_client as get_flight_client,
+    is_flight_query,
+    iter_batch_rows,
+)
+from dbt.adapters.starrocks.helpers.pool import ConnectionPool, find_pool, get_pool
+from dbt.adapters.starrocks.helpers.statement import QUERY, classify_statement, find_keyword
+from dbt.adapters.starrocks.helpers.stream_load import DEFAULT_CHUNK_SIZE as DEFAULT_STREAM_LOAD_CHUNK_SIZE, StreamLoader
+from dbt.adapters.starrocks.helpers.version import parse_version, server_versions
+
+if TYPE_CHECKING:
+    import agate
 
 logger = AdapterLogger("starrocks")
 
+DEFAULT_FETCH_CHUNK_SIZE = 10000
+
+
+@dataclass
+class StarRocksAdapterResponse(AdapterResponse):
+    task_id: Optional[str] = None
+    task_state: Optional[str] = None
+    polling_latency: Optional[float] = None
+    partitions: Optional[List[str]] = None
+    rows_deleted: Optional[int] = None
+    rows_inserted: Optional[int] = None
+
 
 @dataclass
 class StarRocksCredentials(Credentials):
@@ -47,6 +78,24 @@ class StarRocksCredentials(Credentials):
     use_pure: Optional[str] = None
     is_async: Optional[bool] = False
     async_query_timeout: Optional[int] = 300
+    async_poll_min_delay: Optional[float] = None
+    async_poll_max_delay: Optional[float] = None
+    async_max_inflight_tasks: Optional[int] = None
+    async_resume_key: Optional[str] = None
+    pool_enabled: Optional[bool] = False
+    pool_min_size: Optional[int] = 0
+    pool_max_size: Optional[int] = None
+    pool_idle_timeout: Optional[int] = 300
+    version_cache_ttl: Optional[int] = None
+    # Deprecated, has no effect: large results are streamed with `adapter.stream_query`
+    streaming_fetch: Optional[bool] = False
+    fetch_chunk_size: Optional[int] = DEFAULT_FETCH_CHUNK_SIZE
+    arrow_flight_port: Optional[int] = None
+    arrow_flight_tls: Optional[bool] = False
+    stream_load_port: Optional[int] = None
+    stream_load_tls: Optional[bool] = False
+    stream_load_compression: Optional[bool] = False
+    stream_load_chunk_size: Optional[int] = DEFAULT_STREAM_LOAD_CHUNK_SIZE
 
     def __init__(self, **kwargs):
         for k, v in kwargs.items():
@@ -86,22 +135,76 @@ class StarRocksCredentials(Credentials):
             "use_pure",
             "is_async",
             "async_query_timeout",
+            "async_max_inflight_tasks",
+            "pool_enabled",
+            "arrow_flight_port",
+            "stream_load_port",
         )
 
 
-def _parse_version(result):
-    default_version = (999, 999, 999)
-    first_part = None
+def _connection_kwargs(credentials) -> Dict[str, Any]:
+    kwargs = {"host": credentials.host, "username": credentials.username,
+              "password": credentials.password, "database": credentials.catalog + "." + credentials.schema}
+
+    # Unbuffered reads are scoped to the cursors of `stream`
+    kwargs["buffered"] = True
+
+    if credentials.port:
+        kwargs["port"] = credentials.port
+
+    if credentials.use_pure in ["true", "True"]:
+        kwargs["use_pure"] = True
+
+    return kwargs
+
+
+def _connect(kwargs: Dict[str, Any]):
+    """
+    Opens a new StarRocks handle, creating the database if it does not exist yet.
+
+    :param kwargs: The `mysql.connector.connect` arguments.
+    :return: The connection handle.
+    :raises mysql.connector.Error: If the connection could not be opened.
+    """
+    try:
+        return mysql.connector.connect(**kwargs)
+    except mysql.connector.Error:
+        logger.debug("Failed connection without supplying the `database`. "
+                     "Trying again with `database` included.")
+
+        # Try again with the database included
+        kwargs = dict(kwargs)
+        database_toBeCreated = kwargs["database"]
+        kwargs["database"] = "information_schema"
+
+        handle = mysql.connector.connect(**kwargs)
+        mycursor = handle.cursor()
+        mycursor.execute("CREATE DATABASE " + database_toBeCreated)
+        handle.close()
+
+        kwargs["database"] = database_toBeCreated
+        return mysql.connector.connect(**kwargs)
+
+
+def _limit_sql(sql: str, limit: int) -> str:
+    """
+    Pushes a row limit down to the server, so that the rest of the result set is never produced.
 
-    if '-' in result:
-        first_part = result.split('-')[0]
-    if ' ' in result:
-        first_part = result.split(' ')[0]
+    The limit is set through a `sql_select_limit` hint on the top-level `SELECT` of queries (leading comments and `WITH`
+    clauses are skipped), which leaves the query and its columns untouched. Other statements are returned as-is.
+    """
+    if classify_statement(sql).kind != QUERY:
+        return sql
+    offset = find_keyword(sql, "select")
+    if offset is None:
+        return sql
+    return f"{sql[:offset]} /*+ SET_VAR(sql_select_limit = {int(limit)}) */{sql[offset:]}"
 
-    if first_part and len(first_part.split('.')) == 3:
-        return int(first_part[0]), int(first_part[2]), int(first_part[4])
 
-    return default_version
+def _detect_version(handle) -> str:
+    cursor = handle.cursor()
+    cursor.execute("select current_version()")
+    return cursor.fetchone()[0]
 
 
 class StarRocksConnectionManager(SQLConnectionManager):
@@ -114,79 +217,233 @@ class StarRocksConnectionManager(SQLConnectionManager):
             return connection
 
         credentials = cls.get_credentials(connection.credentials)
-        kwargs = {"host": credentials.host, "username": credentials.username,
-                  "password": credentials.password, "database": credentials.catalog + "." + credentials.schema}
+        kwargs = _connection_kwargs(credentials)
 
-        kwargs["buffered"] = True
+        try:
+            if credentials.pool_enabled:
+                pool = cls._get_pool(credentials)
+                connection.handle = pool.acquire()
+                logger.debug(f"Borrowed pooled connection, pool stats: {pool.stats.to_dict()}")
+            else:
+                connection.handle = _connect(kwargs)
+            connection.state = 'open'
+        except mysql.connector.Error as e:
 
-        if credentials.port:
-            kwargs["port"] = credentials.port
+            logger.debug("Got an error when attempting to open a StarRocks "
+                         "connection: '{}'".format(e))
 
-        if credentials.use_pure in ["true", "True"]:
-            kwargs["use_pure"] = True
+            connection.handle = None
+            connection.state = 'fail'
 
-        try:
-            connection.handle = mysql.connector.connect(**kwargs)
-            connection.state = 'open'
-        except mysql.connector.Error:
+            raise dbt_common.exceptions.ConnectionError(str(e))
 
-            try:
-                logger.debug("Failed connection without supplying the `database`. "
-                             "Trying again with `database` included.")
+        if credentials.version is None:
+            server_versions.get_or_detect(
+                cls._version_key(credentials),
+                partial(_detect_version, connection.handle),
+            )
 
-                # Try again with the database included
-                database_toBeCreated = kwargs["database"]
-                kwargs["database"] = "information_schema"
+        return connection
 
-                connection.handle = mysql.connector.connect(**kwargs)
-                connection.state = 'open'
+    @classmethod
+    def get_credentials(cls, credentials):
+        return credentials
 
-                mycursor = connection.handle.cursor()
+    @classmethod
+    def _version_key(cls, credentials) -> str:
+        return f"{credentials.host}:{credentials.port}"
 
-                mycursor.execute("CREATE DATABASE " + database_toBeCreated)
-                kwargs["database"] = database_toBeCreated
+    @classmethod
+    def get_server_version(cls, credentials) -> Optional[Tuple[int, int, int]]:
+        """
+        Returns the StarRocks version, either pinned in the profile or detected on the first connection to the host.
 
-                connection.handle = mysql.connector.connect(**kwargs)
-                connection.state = 'open'
+        :param credentials: The connection credentials.
+        :return: A (major, minor, patch) tuple, or None if the version is not known (yet).
+        """
+        if credentials.version is not None:
+            version = parse_version(credentials.version.strip())
+            if version is None:
+                logger.debug("Config version '{}' is invalid".format(credentials.version))
+            return version
 
-            except mysql.connector.Error as e:
+        return server_versions.get(cls._version_key(credentials))
 
-                logger.debug("Got an error when attempting to open a StarRocks "
-                             "connection: '{}'".format(e))
+    @staticmethod
+    def _pool_key(credentials) -> Tuple[Tuple[str, Any], ...]:
+        return tuple(sorted(_connection_kwargs(credentials).items()))
 
-                connection.handle = None
-                connection.state = 'fail'
+    @classmethod
+    def _get_pool(cls, credentials) -> ConnectionPool:
+        return get_pool(
+            key=cls._pool_key(credentials),
+            connect=partial(_connect, _connection_kwargs(credentials)),
+            min_size=credentials.pool_min_size or 0,
+            max_size=credentials.pool_max_size,
+            idle_timeout=credentials.pool_idle_timeout,
+        )
 
-                raise dbt_common.exceptions.ConnectionError(str(e))
+    @classmethod
+    def _close_handle(cls, connection: Connection) -> None:
+        credentials = cls.get_credentials(connection.credentials)
+        # Without a pool (e.g. closed on exit), the handle is closed instead of creating a new pool for it
+        pool = find_pool(cls._pool_key(credentials)) if credentials.pool_enabled else None
+        if pool is None:
+            return super()._close_handle(connection)
 
-        if credentials.version is None:
-            cursor = connection.handle.cursor()
-            try:
-                cursor.execute("select current_version()")
-                connection.handle.server_version = _parse_version(
-                    cursor.fetchone()[0])
-            except Exception as e:
-                logger.debug(
-                    "Got an error when obtain StarRocks version exception: '{}'".format(e))
+        # Hand the authenticated handle back to the pool instead of closing it
+        pool.release(connection.handle)
+
+    def cancel(self, connection: Connection):
+        credentials = self.get_credentials(connection.credentials)
+        pool = find_pool(self._pool_key(credentials)) if credentials.pool_enabled else None
+        if pool is not None:
+            # A cancelled handle must never be borrowed again
+            pool.discard(connection.handle)
         else:
-            version = credentials.version.strip().split('.')
-            if len(version) == 3:
-                connection.handle.server_version = (
-                    int(version[0]), int(version[1]), int(version[2]))
-            elif len(version) == 2:
-                connection.handle.server_version = (
-                    int(version[0]), int(version[1]), 0)
-            else:
-                logger.debug("Config version '{}' is invalid".format(version))
+            connection.handle.close()
 
-        return connection
+    def _fetch_chunk_size(self, chunk_size: Optional[int] = None) -> int:
+        return chunk_size or self.profile.credentials.fetch_chunk_size or DEFAULT_FETCH_CHUNK_SIZE
 
     @classmethod
-    def get_credentials(cls, credentials):
-        return credentials
+    def _iter_cursor(cls, cursor, limit: Optional[int], chunk_size: int) -> Iterator[Dict[str, Any]]:
+        if cursor.description is None:
+            return
+
+        column_names = [col[0] for col in cursor.description]
+        remaining = limit
+        while remaining is None or remaining > 0:
+            rows = cursor.fetchmany(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not rows:
+                break
+            if remaining is not None:
+                remaining -= len(rows)
+            yield from cls.process_results(column_names, rows)
+
+    def execute(
+        self,
+        sql: str,
+        auto_begin: bool = False,
+        fetch: bool = False,
+        limit: Optional[int] = None,
+    ) -> Tuple[AdapterResponse, "agate.Table"]:
+        # Results are buffered by the client, only the first rows are produced when they are limited
+        if fetch and limit:
+            sql = _limit_sql(sql, limit)
+        return super().execute(sql=sql, auto_begin=auto_begin, fetch=fetch, limit=limit)
+
+    def _flight_client(self) -> FlightSQLClient:
+        credentials = self.profile.credentials
+        if not credentials.arrow_flight_port:
+            raise dbt_common.exceptions.DbtRuntimeError(
+                "The Arrow Flight SQL transport is disabled, set `arrow_flight_port` in your profile to enable it."
+            )
+        return get_flight_client(
+            host=credentials.host,
+            port=credentials.arrow_flight_port,
+            username=credentials.username,
+            password=credentials.password,
+            tls=bool(credentials.arrow_flight_tls),
+        )
 
-    def cancel(self, connection: Connection):
-        connection.handle.close()
+    def stream_loader(self, database: str, table: str, **kwargs: Any) -> StreamLoader:
+        """
+        Creates a Stream Load client loading into a table, through the FE `stream_load_port`.
+
+        :param database: The database of the table.
+        :param table: The table to load into.
+        :param kwargs: The other arguments of `StreamLoader`.
+        """
+        credentials = self.profile.credentials
+        if not credentials.stream_load_port:
+            raise dbt_common.exceptions.DbtRuntimeError(
+                "Stream Load is disabled, set `stream_load_port` in your profile to enable it."
+            )
+        kwargs.setdefault("compress", bool(credentials.stream_load_compression))
+        return StreamLoader(
+            host=credentials.host,
+            port=credentials.stream_load_port,
+            username=credentials.username,
+            password=credentials.password,
+            database=database,
+            table=table,
+            tls=bool(credentials.stream_load_tls),
+            **kwargs,
+        )
+
+    def fetch_arrow(self, sql: str) -> "pyarrow.Table":
+        """
+        Executes a query through Arrow Flight SQL.
+
+        :param str sql: The query to execute.
+        :return: The results, as an Arrow table made of the record batches sent by the server.
+        """
+        sql = self._add_query_comment(sql)
+        connection = self.get_if_exists()
+        fire_event(SQLQuery(
+            conn_name=cast_to_str(connection.name if connection else "arrow_flight"),
+            sql=sql,
+            node_info=get_node_info(),
+        ))
+        return self._flight_client().query(sql)
+
+    def _stream_flight(self, sql: str, limit: Optional[int]) -> Iterator[Dict[str, Any]]:
+        if not is_flight_query(sql):
+            raise dbt_common.exceptions.DbtRuntimeError(
+                "Only `SELECT` / `WITH` queries can be executed through Arrow Flight SQL."
+            )
+        remaining = limit
+        for batch in self._flight_client().stream(self._add_query_comment(_limit_sql(sql, limit) if limit else sql)):
+            rows = list(iter_batch_rows(batch))
+            if remaining is not None:
+                rows, remaining = rows[:remaining], remaining - len(rows)
+            yield from self.process_results(batch.schema.names, rows)
+            if remaining is not None and remaining <= 0:
+                break
+
+    def stream(
+        self,
+        sql: str,
+        limit: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        arrow: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Executes a query and lazily yields its rows, fetching them from the server in bounded chunks.
+
+        The thread connection is busy until the generator is exhausted or closed, unless the rows are
+        fetched through Arrow Flight SQL.
+
+        :param str sql: The query to execute.
+        :param Optional[int] limit: If set, only yield n number of rows. The limit is pushed down to
+            the server for `SELECT` queries.
+        :param Optional[int] chunk_size: Number of rows fetched at once, defaults to `fetch_chunk_size`.
+            Ignored with `arrow`, where rows are fetched one record batch at a time.
+        :param bool arrow: Fetch the rows through Arrow Flight SQL (requires `arrow_flight_port`). Flight SQL
+            sessions don't share the state of the dbt connection (e.g. temporary tables or `SET` variables).
+        :return: A generator of rows, as dictionaries keyed by column name.
+        """
+        if arrow:
+            yield from self._stream_flight(sql, limit)
+            return
+
+        sql = self._add_query_comment(_limit_sql(sql, limit) if limit else sql)
+        connection = self.get_thread_connection()
+        fire_event(SQLQuery(conn_name=cast_to_str(connection.name), sql=sql, node_info=get_node_info()))
+
+        cursor = connection.handle.cursor(buffered=False)
+        try:
+            with self.exception_handler(sql):
+                cursor.execute(sql)
+                yield from self._iter_cursor(cursor, limit, self._fetch_chunk_size(chunk_size))
+        finally:
+            try:
+                if connection.handle.unread_result:
+                    connection.handle.consume_results()
+                cursor.close()
+            except mysql.connector.Error as e:
+                logger.debug(f"Failed to close streaming cursor: '{e}'")
 
     @contextmanager
     def exception_handler(self, sql):
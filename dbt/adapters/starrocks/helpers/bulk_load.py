@@ -0,0 +1,234 @@
+import dataclasses
+import json
+import os
+from typing import IO, Any, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import agate
+from dbt.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks.helpers.seeds import iter_csv
+from dbt.adapters.starrocks.helpers.stream_load import StreamLoadResult
+
+try:
+    import pyarrow.parquet as parquet
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    parquet = None
+
+
+STREAM_LOAD_METHOD = "stream_load"
+INSERT_METHOD = "insert"
+
+FORMATS = ("csv", "json", "parquet")
+_EXTENSION_FORMATS = {".csv": "csv", ".json": "json", ".jsonl": "json", ".ndjson": "json", ".parquet": "parquet"}
+PARQUET_BATCH_SIZE = 10_000
+JSON_READ_SIZE = 1 << 16  # characters
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadReport:
+    """
+    The report of a bulk load.
+
+    :param method: How rows got loaded, `stream_load` or `insert`.
+    :param rows_loaded: The number of rows loaded.
+    :param rows_filtered: The number of rows filtered out for bad data quality (Stream Load only).
+    :param rows_unselected: The number of rows filtered out by the `where` condition (Stream Load only).
+    :param load_bytes: The number of bytes loaded (Stream Load only).
+    :param load_time_ms: The time spent loading, as reported by StarRocks for Stream Load, otherwise measured.
+    :param labels: The label of each chunk (Stream Load only).
+    :param error_urls: The URLs of the rows filtered out, if any.
+    """
+    method: str
+    rows_loaded: int = 0
+    rows_filtered: int = 0
+    rows_unselected: int = 0
+    load_bytes: int = 0
+    load_time_ms: int = 0
+    labels: Tuple[str, ...] = ()
+    error_urls: Tuple[str, ...] = ()
+
+    @property
+    def chunks(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def from_results(cls, results: Sequence[StreamLoadResult]) -> "LoadReport":
+        return cls(
+            method=STREAM_LOAD_METHOD,
+            rows_loaded=sum(r.rows_loaded for r in results),
+            rows_filtered=sum(r.rows_filtered for r in results),
+            rows_unselected=sum(r.rows_unselected for r in results),
+            load_bytes=sum(r.load_bytes for r in results),
+            load_time_ms=sum(r.load_time_ms for r in results),
+            labels=tuple(r.label for r in results),
+            error_urls=tuple(r.error_url for r in results if r.error_url),
+        )
+
+    def to_dict(self) -> dict:
+        return dict(dataclasses.asdict(self), chunks=self.chunks)
+
+
+def source_format(data: Any, data_format: Optional[str] = None) -> Optional[str]:
+    """
+    Resolves the format of the data to load.
+
+    :param data: A path, or rows.
+    :param data_format: The format, if set explicitly.
+    :return: The format of a file, None for rows.
+    :raises dbt.exceptions.DbtRuntimeError: If the format of a file is unknown.
+    """
+    if not isinstance(data, (str, os.PathLike)):
+        return None
+    data_format = data_format or _EXTENSION_FORMATS.get(os.path.splitext(str(data))[1].lower())
+    if data_format not in FORMATS:
+        raise DbtRuntimeError(f"Unknown format of {data}, set `format` to one of {', '.join(FORMATS)}")
+    return data_format
+
+
+def _iter_csv(path: str, delimiter: str) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    # Read like seeds: rows must have a value per column of the header
+    column_names, rows = iter_csv(path, delimiter)
+    # Empty values are NULLs, like in seeds
+    return column_names, (tuple(value if value != "" else None for value in row) for _, row in rows)
+
+
+def _iter_json(path: str) -> Iterator[Mapping[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        if first == "[":
+            yield from _iter_json_array(f, path)
+            return
+        f.seek(0)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _iter_json_array(f: IO[str], path: str) -> Iterator[Any]:
+    """
+    Decodes the elements of a JSON array one at a time, from a buffer of a few `JSON_READ_SIZE` characters.
+
+    :param f: The file, right after the opening bracket of the array.
+    :param path: The path of the file, for error messages.
+    :raises dbt.exceptions.DbtRuntimeError: If the file isn't a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer, offset, eof = "", 0, False
+    expected = "value or ]"
+    while True:
+        while offset < len(buffer) and buffer[offset].isspace():
+            offset += 1
+        if offset == len(buffer):
+            if eof:
+                raise DbtRuntimeError(f"Invalid JSON array in {path}: unexpected end of file, expected {expected}")
+            buffer, offset = f.read(JSON_READ_SIZE), 0
+            eof = not buffer
+            continue
+
+        char = buffer[offset]
+        if char == "]" and expected != "value":
+            return
+        if expected == ", or ]":
+            if char != ",":
+                raise DbtRuntimeError(f"Invalid JSON array in {path}: unexpected {char!r}, expected {expected}")
+            offset += 1
+            expected = "value"
+            continue
+
+        # A value is only complete once followed by another character (e.g. numbers), or at the end of the file
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, offset)
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise DbtRuntimeError(f"Invalid JSON array in {path}: {e}") from e
+            chunk = f.read(JSON_READ_SIZE)
+            buffer, offset, eof = buffer[offset:] + chunk, 0, not chunk
+        yield value
+        offset = end
+        expected = ", or ]"
+
+
+def _iter_parquet(path: str) -> Iterator[Mapping[str, Any]]:
+    if parquet is None:
+        raise DbtRuntimeError(
+            "Loading Parquet files requires `pyarrow`. Install it with `pip install dbt-starrocks[arrow]`."
+        )
+    for batch in parquet.ParquetFile(path).iter_batches(batch_size=PARQUET_BATCH_SIZE):
+        yield from batch.to_pylist()
+
+
+def _from_mappings(
+    mappings: Iterable[Mapping[str, Any]], columns: Optional[Sequence[str]],
+) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    mappings = iter(mappings)
+    first = next(mappings, None)
+    if first is None:
+        return list(columns or []), iter(())
+    column_names = list(columns or first.keys())
+
+    def _rows() -> Iterator[Tuple[Any, ...]]:
+        yield tuple(first.get(c) for c in column_names)
+        for mapping in mappings:
+            yield tuple(mapping.get(c) for c in column_names)
+
+    return column_names, _rows()
+
+
+def iter_source_rows(
+    data: Any,
+    data_format: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    delimiter: str = ",",
+) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    """
+    Reads the rows to load, one at a time.
+
+    :param data: The path of a CSV, JSON (array or newline-delimited) or Parquet file, an agate table,
+        or an iterable of rows: sequences (which require `columns`) or mappings.
+    :param data_format: The format of the file, inferred from its extension by default.
+    :param columns: The columns of the rows. The columns of files and mappings are read by default.
+    :param delimiter: The delimiter of CSV files.
+    :return: The column names and a generator of rows, as tuples in the order of the column names.
+    :raises dbt.exceptions.DbtRuntimeError: If the columns of sequences are unknown, or a CSV row doesn't have as many
+        values as the header.
+    """
+    data_format = source_format(data, data_format)
+    if data_format == "csv":
+        column_names, rows = _iter_csv(str(data), delimiter)
+        if columns:
+            missing = [c for c in columns if c not in column_names]
+            if missing:
+                raise DbtRuntimeError(f"Columns {', '.join(missing)} not found in {data}")
+            # Only the listed columns are loaded
+            indexes = [column_names.index(c) for c in columns]
+            return list(columns), (tuple(row[i] for i in indexes) for row in rows)
+        return column_names, rows
+    if data_format == "json":
+        return _from_mappings(_iter_json(str(data)), columns)
+    if data_format == "parquet":
+        return _from_mappings(_iter_parquet(str(data)), columns)
+
+    if isinstance(data, agate.Table):
+        if columns:
+            return list(columns), (tuple(row[c] for c in columns) for row in data.rows)
+        return list(data.column_names), (tuple(row) for row in data.rows)
+
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        return list(columns or []), iter(())
+    if isinstance(first, Mapping):
+        return _from_mappings(_chain(first, rows), columns)
+    if not columns:
+        raise DbtRuntimeError("Loading rows which are not mappings requires their `columns`")
+    return list(columns), (tuple(row) for row in _chain(first, rows))
+
+
+def _chain(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    yield first
+    yield from rest
@@ -0,0 +1,236 @@
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+from dbt.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks.helpers.statement import QUERY, classify_statement
+
+try:
+    import pyarrow
+    import pyarrow.flight as flight
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pyarrow = None
+    flight = None
+
+
+logger = AdapterLogger("starrocks")
+
+STATEMENT_QUERY_TYPE_URL = "type.googleapis.com/arrow.flight.protocol.sql.CommandStatementQuery"
+# Endpoint location meaning "fetch the results through the connection that issued the query"
+REUSE_CONNECTION_LOCATION = "arrow-flight-reuse-connection://?"
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        towrite = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(towrite | 0x80)
+        else:
+            out.append(towrite)
+            return bytes(out)
+
+
+def _encode_field(number: int, payload: bytes) -> bytes:
+    # Length-delimited protobuf field (wire type 2)
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _decode_fields(data: bytes) -> Dict[int, bytes]:
+    fields = {}
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        if key & 0x7 != 2:
+            raise ValueError(f"Unsupported protobuf wire type {key & 0x7}")
+        length, pos = _read_varint(data, pos)
+        fields[key >> 3] = data[pos:pos + length]
+        pos += length
+    return fields
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_statement_query(sql: str) -> bytes:
+    """
+    Encodes a Flight SQL `CommandStatementQuery`, wrapped in a protobuf `Any` message.
+
+    The message is small enough to be encoded by hand, which avoids depending on the Flight SQL
+    protobuf definitions.
+
+    :param sql: The query to execute.
+    :return: The serialized command, to be used as a flight descriptor command.
+    """
+    command = _encode_field(1, sql.encode("utf-8"))
+    return _encode_field(1, STATEMENT_QUERY_TYPE_URL.encode("utf-8")) + _encode_field(2, command)
+
+
+def decode_statement_query(command: bytes) -> str:
+    """
+    Decodes a command produced by `encode_statement_query`.
+
+    :param command: The serialized flight descriptor command.
+    :return: The query.
+    """
+    wrapper = _decode_fields(command)
+    if wrapper.get(1, b"").decode("utf-8") != STATEMENT_QUERY_TYPE_URL:
+        raise ValueError("Flight command is not a CommandStatementQuery")
+    return _decode_fields(wrapper.get(2, b""))[1].decode("utf-8")
+
+
+def require_pyarrow() -> None:
+    if flight is None:
+        raise DbtRuntimeError(
+            "The Arrow Flight SQL transport requires `pyarrow`. "
+            "Install it with `pip install dbt-starrocks[arrow]` or unset `arrow_flight_port`."
+        )
+
+
+class FlightSQLClient:
+    """
+    Minimal Arrow Flight SQL client for StarRocks FEs, supporting query statements only.
+
+    :param host: The FE host.
+    :param port: The FE `arrow_flight_port`.
+    :param username: The user to authenticate with.
+    :param password: The password to authenticate with.
+    :param tls: Whether to connect using TLS.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        tls: bool = False,
+    ):
+        require_pyarrow()
+        self._scheme = "grpc+tls" if tls else "grpc"
+        self._username = username or ""
+        self._password = password or ""
+        self._location = f"{self._scheme}://{host}:{port}"
+        self._clients: Dict[str, "flight.FlightClient"] = {}
+        self._lock = threading.Lock()
+        self._options = None
+
+    def _client_for(self, location: Optional[str] = None) -> "flight.FlightClient":
+        location = location or self._location
+        with self._lock:
+            client = self._clients.get(location)
+            if client is None:
+                client = flight.FlightClient(location)
+                self._clients[location] = client
+            return client
+
+    def _call_options(self, refresh: bool = False) -> "flight.FlightCallOptions":
+        with self._lock:
+            options = self._options
+        if options is None or refresh:
+            token_pair = self._client_for().authenticate_basic_token(self._username, self._password)
+            options = flight.FlightCallOptions(headers=[token_pair])
+            with self._lock:
+                self._options = options
+        return options
+
+    def _endpoint_client(self, endpoint: "flight.FlightEndpoint") -> "flight.FlightClient":
+        for location in endpoint.locations:
+            uri = location.uri.decode("utf-8") if isinstance(location.uri, bytes) else str(location.uri)
+            if uri != REUSE_CONNECTION_LOCATION:
+                return self._client_for(uri)
+        return self._client_for()
+
+    def _get_readers(self, sql: str, options) -> List["flight.FlightStreamReader"]:
+        descriptor = flight.FlightDescriptor.for_command(encode_statement_query(sql))
+        info = self._client_for().get_flight_info(descriptor, options)
+        return [self._endpoint_client(endpoint).do_get(endpoint.ticket, options) for endpoint in info.endpoints]
+
+    def _readers(self, sql: str) -> List["flight.FlightStreamReader"]:
+        try:
+            return self._get_readers(sql, self._call_options())
+        except flight.FlightUnauthenticatedError:
+            # The bearer token expired, authenticate again
+            return self._get_readers(sql, self._call_options(refresh=True))
+
+    def stream(self, sql: str) -> Iterator["pyarrow.RecordBatch"]:
+        """
+        Executes a query and yields its results as Arrow record batches.
+
+        :param sql: The query to execute.
+        :return: A generator of record batches.
+        """
+        for reader in self._readers(sql):
+            for chunk in reader:
+                yield chunk.data
+
+    def query(self, sql: str) -> "pyarrow.Table":
+        """
+        Executes a query and returns its results as an Arrow table, keeping the record batches as received.
+
+        :param sql: The query to execute.
+        :return: The results.
+        """
+        tables = [reader.read_all() for reader in self._readers(sql)]
+        if not tables:
+            raise DbtRuntimeError("Arrow Flight SQL query returned no endpoint")
+        return pyarrow.concat_tables(tables) if len(tables) > 1 else tables[0]
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._options = None
+        for client in clients:
+            client.close()
+
+
+_clients: Dict[Tuple, FlightSQLClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(host: str, port: int, username: Optional[str], password: Optional[str], tls: bool = False) -> FlightSQLClient:
+    """
+    Returns the process-wide Flight SQL client for the given credentials, creating it on first use.
+    """
+    key = (host, port, username, password, tls)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = FlightSQLClient(host=host, port=port, username=username, password=password, tls=tls)
+            _clients[key] = client
+        return client
+
+
+def is_flight_query(sql: str) -> bool:
+    """
+    Evaluates if a statement can go through Flight SQL, which only executes queries.
+
+    Statements starting with comments (e.g. dbt query comments) are accepted.
+    """
+    return classify_statement(sql).kind == QUERY
+
+
+def iter_batch_rows(batch: "pyarrow.RecordBatch") -> Iterator[Tuple]:
+    """
+    Converts an Arrow record batch into row tuples.
+    """
+    return zip(*(column.to_pylist() for column in batch.columns))
+
+
+def iter_arrow_rows(table: "pyarrow.Table") -> Iterator[Tuple]:
+    """
+    Converts an Arrow table into row tuples, one record batch at a time.
+    """
+    for batch in table.to_batches():
+        yield from iter_batch_rows(batch)
@@ -0,0 +1,335 @@
+import dataclasses
+import hashlib
+import json
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Collection, Dict, List, Mapping, Optional, Set, Tuple
+
+from dbt.adapters.starrocks.helpers.statement import tokenize
+
+
+SHOW_CREATE_MATERIALIZED_VIEW_TEMPLATE = "show create materialized view {relation}"
+REFRESH_MATERIALIZED_VIEW_TEMPLATE = "refresh materialized view {relation}{partition}{force} with async mode"
+CANCEL_REFRESH_MATERIALIZED_VIEW_TEMPLATE = "cancel refresh materialized view {relation}"
+
+REFRESH_SUCCESS = "success"
+REFRESH_ERROR = "error"
+REFRESH_SKIPPED = "skipped"
+
+# Appended to the comment of materialized views, after their description, to detect definition changes without
+# parsing their query
+DEFINITION_MARKER = "dbt_definition:"
+DEFINITION_HASH_LENGTH = 16
+
+_MARKER_PATTERN = re.compile(re.escape(DEFINITION_MARKER) + r"(?P<hash>[0-9a-f]+)")
+_REFRESH_PATTERN = re.compile(r"\bREFRESH\s+(?P<refresh>.*?)\s*(?=\bPROPERTIES\b|\bAS\b)", re.IGNORECASE | re.DOTALL)
+_PROPERTIES_PATTERN = re.compile(r"\bPROPERTIES\s*\(", re.IGNORECASE)
+_PROPERTY_PATTERN = re.compile(r'\s*"((?:[^"\\]|\\.)*)"\s*=\s*"((?:[^"\\]|\\.)*)"\s*(?P<end>[,)])')
+
+# Clauses of the header of `SHOW CREATE MATERIALIZED VIEW`, before the query
+_HEADER_CLAUSES = ("comment", "partition", "distributed", "order", "refresh", "properties")
+
+
+def definition_hash(sql: str, partition_by: Optional[List[str]], distributed_by: Optional[List[str]], buckets: Any) -> str:
+    """
+    Hashes the parts of a materialized view definition that can't be altered: its query, partitioning and distribution.
+
+    :return: The hash, stored in the comment of the materialized view.
+    """
+    definition = json.dumps([sql.strip(), partition_by, distributed_by, buckets], default=str)
+    return hashlib.sha1(definition.encode("utf-8")).hexdigest()[:DEFINITION_HASH_LENGTH]
+
+
+def definition_comment(digest: str, description: Optional[str] = None) -> str:
+    """
+    Builds the comment of a materialized view: its description, if any, followed by the hash of its definition.
+
+    :param digest: The hash of the definition of the view.
+    :param description: The description of the model, when its docs are persisted.
+    :return: The comment, escaped for a double quoted string literal.
+    """
+    comment = f"{description.strip()} {DEFINITION_MARKER}{digest}" if description else f"{DEFINITION_MARKER}{digest}"
+    return comment.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def parse_definition_hash(comment: Optional[str]) -> Optional[str]:
+    """
+    Reads the hash stored in the comment of a materialized view, following its description if any.
+
+    :return: The hash, or None if the view has none.
+    """
+    matches = _MARKER_PATTERN.findall(comment or "")
+    return matches[-1] if matches else None
+
+
+def normalize_refresh(refresh: Optional[str]) -> str:
+    """
+    Normalizes a refresh scheme (e.g. `async every (interval 1 day)`) for comparisons.
+    """
+    return re.sub(r"""[\s"'`]""", "", refresh or "").upper()
+
+
+@dataclasses.dataclass(frozen=True)
+class DeployedMaterializedView:
+    """
+    The definition of a deployed materialized view, from `SHOW CREATE MATERIALIZED VIEW`.
+
+    :param definition_hash: The hash stored in its comment, None if not created by this adapter version.
+    :param refresh: Its refresh scheme (e.g. `ASYNC EVERY(INTERVAL 1 DAY)`).
+    :param properties: Its properties, including the default ones.
+    :param query: Its query, as stored by StarRocks.
+    :param partition_by: The normalized tokens of its `PARTITION BY` clause.
+    :param distributed_by: The normalized tokens of its `DISTRIBUTED BY` clause.
+    """
+    definition_hash: Optional[str]
+    refresh: Optional[str]
+    properties: Dict[str, str]
+    query: Optional[str] = None
+    partition_by: Tuple[str, ...] = ()
+    distributed_by: Tuple[str, ...] = ()
+
+
+def normalize_tokens(sql: str) -> Tuple[str, ...]:
+    """
+    Normalizes a piece of SQL for comparisons: comments, whitespaces, backticks and semicolons are dropped, and
+    everything but string literals is lowercased.
+    """
+    return tuple(
+        token if token[0] in "'\"" else token.strip("`").lower()
+        for token, _, _ in tokenize(sql)
+        if token != ";"
+    )
+
+
+def _parse_header(create_sql: str) -> Tuple[Dict[str, Tuple[str, ...]], Optional[str]]:
+    # Splits the header into its clauses (e.g. `partition` -> `("by", "(", "dt", ")")`), up to the query
+    clauses: Dict[str, List[str]] = {}
+    clause = None
+    depth = 0
+    for token, _, end in tokenize(create_sql):
+        keyword = token.lower()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and keyword == "as":
+            return {k: normalize_tokens(" ".join(v)) for k, v in clauses.items()}, create_sql[end:]
+        elif depth == 0 and keyword in _HEADER_CLAUSES:
+            clause = keyword
+            clauses[clause] = []
+            continue
+        if clause is not None:
+            clauses[clause].append(token)
+    return {k: normalize_tokens(" ".join(v)) for k, v in clauses.items()}, None
+
+
+def _parse_properties(create_sql: str) -> Dict[str, str]:
+    match = _PROPERTIES_PATTERN.search(create_sql)
+    if not match:
+        return {}
+
+    properties = {}
+    position = match.end()
+    while True:
+        prop = _PROPERTY_PATTERN.match(create_sql, position)
+        if not prop:
+            return properties
+        properties[prop.group(1)] = prop.group(2)
+        position = prop.end()
+        if prop.group("end") == ")":
+            return properties
+
+
+def parse_create_materialized_view(create_sql: str) -> DeployedMaterializedView:
+    """
+    Parses the output of `SHOW CREATE MATERIALIZED VIEW`.
+
+    Only the header of the statement is read: its query is never parsed.
+    """
+    refresh = _REFRESH_PATTERN.search(create_sql)
+    clauses, query = _parse_header(create_sql)
+    return DeployedMaterializedView(
+        definition_hash=parse_definition_hash(" ".join(clauses.get("comment", ()))),
+        refresh=refresh.group("refresh") if refresh else None,
+        properties=_parse_properties(create_sql),
+        query=query,
+        partition_by=clauses.get("partition", ()),
+        distributed_by=clauses.get("distributed", ()),
+    )
+
+
+def _definition_matches(
+    deployed: DeployedMaterializedView,
+    sql: str,
+    partition_by: Optional[List[str]],
+    distributed_by: Optional[List[str]],
+    buckets: Any,
+) -> bool:
+    if deployed.query is None or normalize_tokens(deployed.query) != normalize_tokens(sql):
+        return False
+
+    # Parentheses around partition expressions are optional
+    expected_partition = normalize_tokens(f"by {', '.join(partition_by)}") if partition_by else ()
+    parentheses = ("(", ")")
+    if tuple(t for t in deployed.partition_by if t not in parentheses) != tuple(
+        t for t in expected_partition if t not in parentheses
+    ):
+        return False
+
+    # e.g. `("by", "hash", "(", "id", ")", "buckets", "4")`, or `("by", "random")`
+    distribution = deployed.distributed_by
+    hash_columns = distribution[3:distribution.index(")")] if distribution[1:3] == ("hash", "(") else ()
+    if hash_columns != (normalize_tokens(", ".join(distributed_by)) if distributed_by else ()):
+        return False
+    if buckets is not None:
+        deployed_buckets = distribution[distribution.index("buckets") + 1:][:1] if "buckets" in distribution else ()
+        if deployed_buckets != (str(buckets),):
+            return False
+    return True
+
+
+def definition_changed(
+    deployed: DeployedMaterializedView,
+    sql: str,
+    partition_by: Optional[List[str]],
+    distributed_by: Optional[List[str]],
+    buckets: Any,
+) -> bool:
+    """
+    Evaluates if the parts of a materialized view definition that can't be altered changed.
+
+    The hash stored in the comment of the view is compared with the hash of the model. Views created before
+    hashes got stored have none: their definition, parsed from `SHOW CREATE MATERIALIZED VIEW`, is compared
+    instead, token by token (ignoring comments, whitespaces, backticks and case).
+    """
+    if deployed.definition_hash is not None:
+        return deployed.definition_hash != definition_hash(sql, partition_by, distributed_by, buckets)
+    return not _definition_matches(deployed, sql, partition_by, distributed_by, buckets)
+
+
+def configuration_changes(
+    deployed: DeployedMaterializedView,
+    sql: str,
+    partition_by: Optional[List[str]],
+    distributed_by: Optional[List[str]],
+    buckets: Any,
+    refresh: Optional[str],
+    properties: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Compares a deployed materialized view with its model.
+
+    :param deployed: The deployed materialized view.
+    :param sql: The query of the model.
+    :param partition_by: The `partition_by` of the model.
+    :param distributed_by: The `distributed_by` of the model.
+    :param buckets: The `buckets` of the model.
+    :param refresh: The refresh scheme of the model.
+    :param properties: The properties of the model. Properties set by default are not compared.
+    :return: None if nothing changed, otherwise the changes: `rebuild` (the definition changed),
+        `refresh` (the refresh scheme to set, if changed) and `properties` (the properties to set).
+    """
+    if definition_changed(deployed, sql, partition_by, distributed_by, buckets):
+        return {"rebuild": True, "refresh": None, "properties": {}}
+
+    changed_properties = {
+        key: str(value) for key, value in (properties or {}).items() if deployed.properties.get(key) != str(value)
+    }
+    changed_refresh = refresh if normalize_refresh(refresh) != normalize_refresh(deployed.refresh) else None
+    if not changed_properties and changed_refresh is None:
+        return None
+    return {"rebuild": False, "refresh": changed_refresh, "properties": changed_properties}
+
+
+def refresh_statement(relation: str, start: Any = None, end: Any = None, force: bool = False) -> str:
+    """
+    Builds the statement triggering the refresh of a materialized view, returning the `QUERY_ID` of its task run.
+
+    :param relation: The materialized view.
+    :param start: The start of the partition range to refresh (inclusive), None for all partitions.
+    :param end: The end of the partition range to refresh (exclusive), None for all partitions.
+    :param force: Whether to refresh partitions whose base data didn't change.
+    :raises ValueError: If only one bound of the range is set.
+    """
+    if (start is None) != (end is None):
+        raise ValueError(f"Refreshing a range of partitions of {relation} requires both its start and end")
+
+    partition = f" partition start ('{start}') end ('{end}')" if start is not None else ""
+    return REFRESH_MATERIALIZED_VIEW_TEMPLATE.format(relation=relation, partition=partition, force=" force" if force else "")
+
+
+def upstream_materialized_views(depends_on: Mapping[str, Collection[str]], views: Collection[str]) -> Dict[str, Set[str]]:
+    """
+    Computes the materialized views each materialized view depends on, directly or through other nodes.
+
+    :param depends_on: The nodes each node of the project depends on.
+    :param views: The materialized views, among the nodes.
+    :return: The upstream materialized views of each materialized view.
+    """
+    views = set(views)
+    upstream = {}
+    for view in views:
+        found, seen = set(), set()
+        pending = list(depends_on.get(view, ()))
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node in views:
+                found.add(node)
+            else:
+                pending.extend(depends_on.get(node, ()))
+        upstream[view] = found
+    return upstream
+
+
+def run_in_dependency_order(
+    dependencies: Mapping[str, Collection[str]],
+    run: Callable[[str], Any],
+    parallelism: int,
+) -> Dict[str, Tuple[str, Any]]:
+    """
+    Runs a callable on nodes once their dependencies succeeded, running up to `parallelism` nodes at once.
+
+    Nodes depending on a failed node are skipped.
+
+    :param dependencies: The dependencies of each node. Dependencies which are not nodes are ignored.
+    :param run: The callable to run on each node.
+    :param parallelism: The maximum number of nodes running at once.
+    :return: The outcome of each node: `(success, result)`, `(error, exception)` or `(skipped, None)`.
+    :raises ValueError: If the dependencies have a cycle.
+    """
+    remaining = {node: {d for d in deps if d in dependencies and d != node} for node, deps in dependencies.items()}
+    outcomes: Dict[str, Tuple[str, Any]] = {}
+    running = {}
+
+    def _status(node: str) -> Optional[str]:
+        return outcomes[node][0] if node in outcomes else None
+
+    with ThreadPoolExecutor(max_workers=max(1, parallelism)) as pool:
+        while remaining or running:
+            skipped = True
+            while skipped:
+                skipped = [n for n, deps in remaining.items() if any(_status(d) in (REFRESH_ERROR, REFRESH_SKIPPED) for d in deps)]
+                for node in skipped:
+                    outcomes[node] = (REFRESH_SKIPPED, None)
+                    del remaining[node]
+
+            for node in [n for n, deps in remaining.items() if all(_status(d) == REFRESH_SUCCESS for d in deps)]:
+                running[pool.submit(run, node)] = node
+                del remaining[node]
+
+            if not running:
+                if remaining:
+                    raise ValueError(f"Dependency cycle between {', '.join(sorted(remaining))}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                try:
+                    outcomes[node] = (REFRESH_SUCCESS, future.result())
+                except Exception as e:
+                    outcomes[node] = (REFRESH_ERROR, e)
+    return outcomes
@@ -0,0 +1,205 @@
+import dataclasses
+import datetime
+import decimal
+import re
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+SHOW_PARTITIONS_TEMPLATE = "show partitions from {relation}"
+PARTITION_BOUNDS_TEMPLATE = "select min({column}), max({column}) from {source}"
+
+# e.g. `[types: [DATE]; keys: [2024-01-01]; ..types: [DATE]; keys: [2024-02-01]; )`
+_RANGE_PATTERN = re.compile(
+    r'types:\s*\[(?P<lower_type>[^\]]*)\];\s*keys:\s*\[(?P<lower>[^\]]*)\];\s*\.\.\s*'
+    r'types:\s*\[(?P<upper_type>[^\]]*)\];\s*keys:\s*\[(?P<upper>[^\]]*)\];'
+)
+
+_INTEGER_TYPES = ("TINYINT", "SMALLINT", "INT", "BIGINT", "LARGEINT")
+_DATE_TYPES = ("DATE",)
+_DATETIME_TYPES = ("DATETIME",)
+
+
+def _to_date(value: Any) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    text = str(value).strip()
+    if text.startswith("0000-"):
+        return datetime.date.min
+    return datetime.date.fromisoformat(text[:10])
+
+
+def _to_datetime(value: Any) -> datetime.datetime:
+    if isinstance(value, datetime.datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time())
+    text = str(value).strip()
+    if text.startswith("0000-"):
+        return datetime.datetime.min
+    return datetime.datetime.fromisoformat(text)
+
+
+def convert_partition_value(value: Any, column_type: str) -> Any:
+    """
+    Converts a partition key, or a value of the partition column, to a comparable Python value.
+
+    :param value: The value, either a `SHOW PARTITIONS` key string or a query result.
+    :param column_type: The partition column type, as reported by `SHOW PARTITIONS` (e.g. `DATE`).
+    :return: The converted value.
+    :raises ValueError: If the type is not supported.
+    """
+    column_type = column_type.upper()
+    if column_type in _INTEGER_TYPES:
+        return int(decimal.Decimal(str(value)))
+    if column_type in _DATE_TYPES:
+        return _to_date(value)
+    if column_type in _DATETIME_TYPES:
+        return _to_datetime(value)
+    raise ValueError(f"Unsupported partition column type {column_type}")
+
+
+def partition_literal(key: str, column_type: str) -> str:
+    """
+    Renders a `SHOW PARTITIONS` key as an SQL literal.
+    """
+    return key if column_type.upper() in _INTEGER_TYPES else f"'{key}'"
+
+
+@dataclasses.dataclass(frozen=True)
+class RangePartition:
+    name: str
+    lower_key: str
+    upper_key: str
+    lower: Any
+    upper: Any
+
+
+@dataclasses.dataclass(frozen=True)
+class RangePartitions:
+    """
+    The partitions of a table partitioned by range on a single column, sorted by range.
+    """
+    column: str
+    column_type: str
+    partitions: Tuple[RangePartition, ...]
+
+    def select(self, min_value: Any, max_value: Any) -> Optional[List[RangePartition]]:
+        """
+        Selects the partitions holding the values between `min_value` and `max_value`.
+
+        :param min_value: The minimum value of the partition column in the data to write, None if there is no data.
+        :param max_value: The maximum value of the partition column in the data to write.
+        :return: The partitions, or None if some values may not fall into an existing partition.
+        """
+        if min_value is None or max_value is None:
+            return []
+
+        low = convert_partition_value(min_value, self.column_type)
+        high = convert_partition_value(max_value, self.column_type)
+        selected = [p for p in self.partitions if p.upper > low and p.lower <= high]
+        if not selected or selected[0].lower > low or selected[-1].upper <= high:
+            return None
+
+        # Values between two selected partitions must fall into one of them as well
+        for previous, current in zip(selected, selected[1:]):
+            if previous.upper != current.lower:
+                return None
+        return selected
+
+    def window(self, start: Any, end: Any) -> Optional[List[RangePartition]]:
+        """
+        Selects the partitions holding exactly the values between `start` (inclusive) and `end` (exclusive),
+        e.g. the partitions of a microbatch.
+
+        :param start: The start of the window.
+        :param end: The end of the window.
+        :return: The partitions, empty if no partition overlaps the window yet, or None if the window isn't
+            aligned with the partitions.
+        """
+        if self.column_type.upper() in _DATE_TYPES and any(
+            isinstance(v, datetime.datetime) and v.time() != datetime.time() for v in (start, end)
+        ):
+            # A window within a day can't be mapped to DATE partitions
+            return None
+
+        low = convert_partition_value(start, self.column_type)
+        high = convert_partition_value(end, self.column_type)
+        if low >= high:
+            return None
+
+        overlapping = [p for p in self.partitions if p.upper > low and p.lower < high]
+        if not overlapping:
+            return []
+        if overlapping[0].lower != low or overlapping[-1].upper != high:
+            return None
+        for previous, current in zip(overlapping, overlapping[1:]):
+            if previous.upper != current.lower:
+                return None
+        return overlapping
+
+
+def parse_range(range_value: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Parses the `Range` column of `SHOW PARTITIONS`.
+
+    :return: A tuple of the column type, the lower key (inclusive) and the upper key (exclusive),
+        or None for multi-column or non-range partitions.
+    """
+    match = _RANGE_PATTERN.search(range_value or "")
+    if not match:
+        return None
+
+    lower_type, upper_type = match.group("lower_type").strip(), match.group("upper_type").strip()
+    lower, upper = match.group("lower").strip(), match.group("upper").strip()
+    if "," in lower_type or lower_type != upper_type:
+        return None
+    return lower_type, lower, upper
+
+
+def range_partitions_from_rows(rows: Iterable[Any]) -> Optional[RangePartitions]:
+    """
+    Builds the range partitions of a table from its `SHOW PARTITIONS` rows.
+
+    :param rows: Rows with the `PartitionName`, `PartitionKey` and `Range` columns.
+    :return: The partitions, or None if the table is not partitioned by range on a single column.
+    """
+    column = column_type = None
+    partitions = []
+    for row in rows:
+        key = (row.get("PartitionKey") or "").strip()
+        parsed = parse_range(row.get("Range") or "")
+        if not key or "," in key or parsed is None:
+            return None
+
+        row_type, lower_key, upper_key = parsed
+        if column is None:
+            column, column_type = key, row_type
+        elif (column, column_type) != (key, row_type):
+            return None
+
+        try:
+            lower = convert_partition_value(lower_key, row_type)
+            upper = convert_partition_value(upper_key, row_type)
+        except ValueError:
+            return None
+        partitions.append(RangePartition(row.get("PartitionName"), lower_key, upper_key, lower, upper))
+
+    if not partitions:
+        return None
+    return RangePartitions(column=column, column_type=column_type, partitions=tuple(sorted(partitions, key=lambda p: p.lower)))
+
+
+def group_partitions(partitions: List[RangePartition], groups: int) -> List[List[RangePartition]]:
+    """
+    Splits contiguous partitions into at most `groups` contiguous groups of similar sizes.
+    """
+    groups = max(1, min(groups, len(partitions)))
+    size, extra = divmod(len(partitions), groups)
+    result, start = [], 0
+    for index in range(groups):
+        end = start + size + (1 if index < extra else 0)
+        result.append(partitions[start:end])
+        start = end
+    return result
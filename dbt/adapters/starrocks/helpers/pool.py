@@ -0,0 +1,285 @@
+import atexit
+import collections
+import dataclasses
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Set, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+from dbt.exceptions import DbtRuntimeError
+
+
+logger = AdapterLogger("starrocks")
+
+DEFAULT_ACQUIRE_TIMEOUT = 30  # seconds
+
+
+@dataclasses.dataclass
+class PoolStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    failed_checks: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dataclasses.asdict(self)
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of authenticated connection handles.
+
+    Handles are created through the `connect` callable: `min_size` of them when the pool is created,
+    the others on demand. A borrowed handle is checked for liveness before being handed out, and its
+    session is reset when released, so that no state (e.g. `SET` variables, temporary tables or an
+    open transaction) leaks to its next borrower. Handles idling for longer than `idle_timeout`
+    seconds are closed, keeping at least `min_size` handles around.
+
+    :param connect: Callable returning a new, authenticated handle.
+    :param min_size: Number of handles opened upfront and never evicted for idleness.
+    :param max_size: Maximum number of handles (borrowed + idle). `None` means unbounded.
+    :param idle_timeout: Seconds after which an idle handle is evicted. `None` disables eviction.
+    :param acquire_timeout: Seconds to wait for a handle when the pool is exhausted.
+    :param is_alive: Callable performing the liveness check of a handle.
+    :param reset: Callable resetting the session of a released handle, which is closed if it fails.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 0,
+        max_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+        is_alive: Optional[Callable[[Any], bool]] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+    ):
+        if max_size is not None and max_size < 1:
+            raise DbtRuntimeError(f"Connection pool max size must be at least 1, got {max_size}")
+        if max_size is not None and min_size > max_size:
+            raise DbtRuntimeError(
+                f"Connection pool min size ({min_size}) cannot exceed its max size ({max_size})"
+            )
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.stats = PoolStats()
+
+        self._connect = connect
+        self._is_alive = is_alive or (lambda handle: handle.is_connected())
+        self._reset = reset or _reset_session
+        self._cond = threading.Condition()
+        # (handle, released_at) - most recently released handles are at the right end
+        self._idle: Deque[Tuple[Any, float]] = collections.deque()
+        self._borrowed: Set[int] = set()
+        self._size = 0
+
+        self._prewarm()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def acquire(self) -> Any:
+        """
+        Borrows a handle from the pool, creating a new one if none is idle.
+
+        :return: A live connection handle.
+        :raises dbt.exceptions.DbtRuntimeError: If no handle frees up within `acquire_timeout`.
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+
+        while True:
+            with self._cond:
+                self._evict_idle()
+                handle = None
+                if self._idle:
+                    handle, _ = self._idle.pop()
+                elif self.max_size is None or self._size < self.max_size:
+                    self._size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DbtRuntimeError(
+                            f"Timed out after {self.acquire_timeout}s waiting for a connection "
+                            f"(pool max size is {self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+            if handle is None:
+                return self._create()
+
+            # The liveness check may hit the network, keep it outside of the lock
+            if self._check(handle):
+                with self._cond:
+                    self.stats.hits += 1
+                    self._borrowed.add(id(handle))
+                return handle
+
+            with self._cond:
+                self.stats.failed_checks += 1
+                self._size -= 1
+                self._cond.notify()
+            _close_quietly(handle)
+
+    def release(self, handle: Any) -> None:
+        """
+        Returns a borrowed handle to the pool.
+
+        Handles that were not borrowed from this pool, or were discarded meanwhile, are ignored.
+        Handles whose session can't be reset are discarded.
+        """
+        with self._cond:
+            if id(handle) not in self._borrowed:
+                return
+
+        # The reset hits the network, keep it outside of the lock
+        try:
+            self._reset(handle)
+        except Exception as e:
+            logger.debug(f"Failed to reset pooled connection, discarding it: '{e}'")
+            self.discard(handle)
+            return
+
+        with self._cond:
+            if id(handle) not in self._borrowed:
+                return
+            self._borrowed.discard(id(handle))
+            self._idle.append((handle, time.monotonic()))
+            self._evict_idle()
+            self._cond.notify()
+
+    def discard(self, handle: Any) -> None:
+        """
+        Closes a borrowed handle and removes it from the pool.
+        """
+        with self._cond:
+            if id(handle) not in self._borrowed:
+                return
+            self._borrowed.discard(id(handle))
+            self._size -= 1
+            self._cond.notify()
+        _close_quietly(handle)
+
+    def close(self) -> None:
+        """
+        Closes all idle handles. Borrowed handles are closed when discarded by their borrower.
+        """
+        with self._cond:
+            idle = [handle for handle, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for handle in idle:
+            _close_quietly(handle)
+
+    def _prewarm(self) -> None:
+        while self._size < self.min_size:
+            try:
+                handle = self._connect()
+            except Exception as e:
+                # The next borrower gets to open the connection, and its error
+                logger.debug(f"Failed to open pooled connection upfront: '{e}'")
+                return
+            self._size += 1
+            self._idle.append((handle, time.monotonic()))
+
+    def _create(self) -> Any:
+        try:
+            handle = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self.stats.misses += 1
+            self._borrowed.add(id(handle))
+        return handle
+
+    def _check(self, handle: Any) -> bool:
+        try:
+            return bool(self._is_alive(handle))
+        except Exception as e:
+            logger.debug(f"Pooled connection failed its liveness check: '{e}'")
+            return False
+
+    def _evict_idle(self) -> None:
+        # Must be called with the lock held
+        if self.idle_timeout is None:
+            return
+
+        expired_before = time.monotonic() - self.idle_timeout
+        while self._idle and self._size > self.min_size and self._idle[0][1] < expired_before:
+            handle, _ = self._idle.popleft()
+            self._size -= 1
+            self.stats.evictions += 1
+            _close_quietly(handle)
+
+
+def _reset_session(handle: Any) -> None:
+    # Unread results would make the reset fail
+    if handle.unread_result:
+        handle.consume_results()
+    # Rolls back any open transaction, drops temporary tables and resets the session variables
+    handle.reset_session()
+
+
+def _close_quietly(handle: Any) -> None:
+    try:
+        handle.close()
+    except Exception as e:
+        logger.debug(f"Failed to close pooled connection: '{e}'")
+
+
+_pools: Dict[Hashable, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key: Hashable, connect: Callable[[], Any], **settings) -> ConnectionPool:
+    """
+    Returns the process-wide pool registered under `key`, creating it on first use.
+
+    :param key: The pool key, usually derived from the connection credentials.
+    :param connect: Callable returning a new handle, used when the pool gets created.
+    :param settings: Extra `ConnectionPool` arguments, used when the pool gets created.
+    :return: The shared connection pool.
+    """
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(connect, **settings)
+            _pools[key] = pool
+        return pool
+
+
+def find_pool(key: Hashable) -> Optional[ConnectionPool]:
+    """
+    Returns the process-wide pool registered under `key`, without creating it.
+
+    :param key: The pool key, usually derived from the connection credentials.
+    :return: The shared connection pool, or None if it was never created or got closed since.
+    """
+    with _pools_lock:
+        return _pools.get(key)
+
+
+def close_all_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        logger.debug(f"Closing connection pool, stats: {pool.stats.to_dict()}")
+        pool.close()
+
+
+atexit.register(close_all_pools)
@@ -1,15 +1,24 @@
 import dataclasses
+import os
 import pathlib
 import re
-from typing import Optional
+import threading
+from typing import Dict, List, Optional
 
+from dbt.adapters.events.logging import AdapterLogger
 from dbt.exceptions import DbtRuntimeError
 
+from dbt.adapters.starrocks.helpers.statement import CREATE_TABLE_AS, Statement, classify_statement
+
 
 PRE_CREATE_INSERT_COLUMNS_TAG = "insert_columns"
 PRE_CREATE_MODEL = "pre_create"
 PRE_CREATE_TEMPLATE_PREFIX = "template_"
 
+_TRAILING_AS_PATTERN = re.compile(r'\s*\bas\s*$', re.IGNORECASE)
+
+logger = AdapterLogger("starrocks")
+
 
 @dataclasses.dataclass
 class PreCreateSQLAdapter:
@@ -19,6 +28,7 @@ class PreCreateSQLAdapter:
     insert_statement: Optional[str] = None
     db_name: Optional[str] = None
     table_name: Optional[str] = None
+    statement: Optional[Statement] = dataclasses.field(default=None, repr=False)
 
     @property
     def model_name(self) -> str:
@@ -48,48 +58,166 @@ class PreCreateSQLAdapter:
         raise ValueError("Could not extract relations from SQL statement")
 
     def __post_init__(self):
-        self.db_name, self.table_name = self._get_relations_from_sql(self.raw_sql_statement)
+        if self.statement is None:
+            self.statement = classify_statement(self.raw_sql_statement)
+        target = self.statement.target
+        if target is not None and len(target) == 2:
+            self.db_name, self.table_name = target
+        else:
+            self.db_name, self.table_name = self._get_relations_from_sql(self.raw_sql_statement)
 
 
-def load_create_table_statement(project_root: str, model_paths: list[str], model_file: str, relation_name: str) -> str:
+def _validate_template(path: pathlib.Path, statement: str) -> str:
+    """
+    Checks that a pre-creation SQL template uses the `{relation_name}` placeholder, and no other one.
+
+    :return: The template.
+    :raises dbt.exceptions.DbtRuntimeError: If the template is not valid.
     """
-    Loads the `CREATE TABLE` SQL statement from a predefined file.
+    if "{relation_name}" not in statement:
+        raise DbtRuntimeError(
+            f"You Pre-Create SQL statement must use the '{{relation_name}}' placeholder as the table relation ({path})."
+        )
+    try:
+        statement.format(relation_name="")
+    except (IndexError, KeyError, ValueError) as e:
+        raise DbtRuntimeError(
+            f"Invalid Pre-Create SQL statement {path}: only the '{{relation_name}}' placeholder is supported "
+            f"(braces must be doubled otherwise): {e!r}"
+        )
+    return statement
 
-    This function searches for a `.sql` file containing only the table creation statement
-    (without table properties) for a specific dbt model. The file must follow a specific
-    naming convention and reside within one of the configured model paths.
 
-    Example of expected SQL content in the file:
+@dataclasses.dataclass
+class PreCreateTemplate:
+    path: pathlib.Path
+    mtime: float
+    statement: str
+    insert_columns: List[str]
 
-        CREATE TABLE my_table (
-            col1 VARCHAR(24),
-            col2 INT,
-            col3 INT AUTO_INCREMENT
-        )
 
-    **Note:** Only include the table creation statement without any additional properties
-    like table options.
+class PreCreateTemplateIndex:
+    """
+    Index of the pre-creation SQL templates of a project, by model name.
+
+    Built once, when the adapter gets initialized: all the templates are read and validated upfront. Lookups
+    are dictionary hits, a template being only read again (alone) when its modification time changes.
 
     :param project_root: The root directory of the dbt project.
     :param model_paths: A list of paths (relative to the project root) where dbt models are located.
-    :param model_file: The filename of the dbt model for which to load the pre-create SQL statement.
-    :param relation_name: The relation name (db + table) to inject inside the SQL statement.
-    :return: The SQL query loaded from the file.
-    :raises dbt.exceptions.DbtRuntimeError: If no matching SQL file is found.
+    :param models: The configuration object of the dbt models.
     """
-    for mp in model_paths:
-        _fp = pathlib.Path(project_root) / mp / PRE_CREATE_MODEL / f"{PRE_CREATE_TEMPLATE_PREFIX}{model_file}"
-        if _fp.exists():
-            _statement = _fp.read_text()
-            if "{relation_name}" not in _statement:
-                raise ValueError(
-                    f"You Pre-Create SQL statement must use the '{{relation_name}}' placeholder as the table relation."
-                )
-            return _statement.format(relation_name=relation_name)
-    raise DbtRuntimeError(
-        "Could not find table pre-creation SQL code for the following configuration: "
-        f"project_root=[{project_root}], model_paths=[{model_paths}], model_file=[{model_file}]"
-    )
+
+    def __init__(self, project_root: str, model_paths: List[str], models: dict):
+        self._project_root = project_root
+        self._model_paths = list(model_paths or [])
+        self._config: Dict[str, dict] = dict((models or {}).get(PRE_CREATE_MODEL, {}) or {})
+        self._templates: Dict[str, PreCreateTemplate] = {}
+        self._lock = threading.Lock()
+        self.build()
+
+    @property
+    def models(self) -> List[str]:
+        """
+        The names of the models configured for pre-creation.
+        """
+        return [name for name, config in self._config.items() if config]
+
+    def _template_paths(self) -> Dict[str, pathlib.Path]:
+        paths = {}
+        for mp in self._model_paths:
+            directory = pathlib.Path(self._project_root) / mp / PRE_CREATE_MODEL
+            if not directory.is_dir():
+                continue
+            for path in sorted(directory.glob(f"{PRE_CREATE_TEMPLATE_PREFIX}*.sql")):
+                model_name = path.stem[len(PRE_CREATE_TEMPLATE_PREFIX):]
+                # The first model path wins, like for the template lookup
+                paths.setdefault(model_name, path)
+        return paths
+
+    def _template_path(self, model_name: str) -> Optional[pathlib.Path]:
+        for mp in self._model_paths:
+            path = pathlib.Path(self._project_root, mp, PRE_CREATE_MODEL, f"{PRE_CREATE_TEMPLATE_PREFIX}{model_name}.sql")
+            if path.is_file():
+                return path
+        return None
+
+    def _load(self, model_name: str, path: pathlib.Path) -> PreCreateTemplate:
+        mtime = os.stat(path).st_mtime
+        statement = _validate_template(path, path.read_text())
+        insert_columns = self._config.get(model_name, {}).get(PRE_CREATE_INSERT_COLUMNS_TAG, [])
+        return PreCreateTemplate(path=path, mtime=mtime, statement=statement, insert_columns=list(insert_columns))
+
+    def build(self) -> None:
+        """
+        (Re)builds the index, reading and validating the templates of all the models configured for pre-creation.
+
+        :raises dbt.exceptions.DbtRuntimeError: If a template is not valid.
+        """
+        if not self.models:
+            return
+
+        paths = self._template_paths()
+        templates = {
+            model_name: self._load(model_name, paths[model_name])
+            for model_name in self.models
+            if model_name in paths
+        }
+        for model_name in self.models:
+            if model_name not in paths:
+                logger.warning(f"Model [{model_name}] is configured for pre-creation, but has no template")
+
+        with self._lock:
+            self._templates = templates
+
+    def _reload(self, model_name: str) -> Optional[PreCreateTemplate]:
+        """
+        Reads the template of a single model again, e.g. once it changed, was added or was removed.
+
+        :raises dbt.exceptions.DbtRuntimeError: If the template is not valid.
+        """
+        path = self._template_path(model_name)
+        template = self._load(model_name, path) if path is not None else None
+        with self._lock:
+            if template is None:
+                self._templates.pop(model_name, None)
+            else:
+                self._templates[model_name] = template
+        return template
+
+    def get(self, model_name: str) -> Optional[PreCreateTemplate]:
+        """
+        Looks up the template of a model.
+
+        :param model_name: The model name.
+        :return: The template, or None if the model is not configured for pre-creation.
+        :raises dbt.exceptions.DbtRuntimeError: If the model is configured for pre-creation without a valid template.
+        """
+        if not self._config.get(model_name):
+            return None
+
+        with self._lock:
+            template = self._templates.get(model_name)
+
+        if template is not None:
+            try:
+                mtime = os.stat(template.path).st_mtime
+            except OSError:
+                mtime = None
+            if mtime != template.mtime:
+                logger.debug(f"Reloading pre-creation template {template.path}")
+                template = self._reload(model_name)
+        else:
+            # The template may have been added since the index was built
+            template = self._reload(model_name)
+
+        if template is None:
+            raise DbtRuntimeError(
+                "Could not find table pre-creation SQL code for the following configuration: "
+                f"project_root=[{self._project_root}], model_paths=[{self._model_paths}], "
+                f"model_file=[{model_name}.sql]"
+            )
+        return template
 
 
 def is_pre_creatable(sql: str) -> bool:
@@ -99,37 +227,12 @@ def is_pre_creatable(sql: str) -> bool:
     :param sql: The SQL statement to process.
     :return: True if the SQL contains a pre-creatable statement.
     """
-    # Remove newlines and normalize whitespace
-    sql_clean = sql.strip().replace('\n', '')
-    sql_clean = re.sub(r'\s+', ' ', sql_clean).strip().lower()
-
     # Note: # Pre-Creatable statements are only CREATE TABLE ... AS SELECT
     # https://docs.starrocks.io/docs/sql-reference/sql-statements/table_bucket_part_index/CREATE_TABLE_AS_SELECT/
     #
     # The goal here is to soft-match the pattern for dbt-generated sql queries.
     # It is not intended to be exhaustive nor to validate SQL statement, this will be left to the engine.
-    pre_create_pattern = r'^create\s+table.*select'
-    return bool(re.search(pre_create_pattern, sql_clean))
-
-
-def split_config_select(sql: str) -> tuple[str, str]:
-    _cleaned = sql.replace("\n", "")
-    if "as select" in _cleaned:
-        _splitter = "as select"
-    elif "as with" in _cleaned:
-        _splitter = "as with"
-    else:
-        raise ValueError("Invalid SQL structure - missing `as select` or `as with` clause")
-
-    _splitted = _cleaned.split(_splitter)
-    if len(_splitted) < 2:
-        raise ValueError("Invalid SQL structure - not enough segments")
-
-    # Re-assemble
-    config_stmt = _splitted[0]
-    select_stmt = f"select {_splitted[1]}" if _splitter == "as select" else f"(with {_splitted[1]})"
-
-    return config_stmt, select_stmt
+    return classify_statement(sql).kind == CREATE_TABLE_AS
 
 
 def create_adapter(
@@ -137,6 +240,8 @@ def create_adapter(
     project_root: str,
     model_paths: list[str],
     models: dict,
+    templates: Optional[PreCreateTemplateIndex] = None,
+    statement: Optional[Statement] = None,
 ) -> Optional[PreCreateSQLAdapter]:
     """
     Creates a SQL adapter for pre-create operations.
@@ -145,35 +250,42 @@ def create_adapter(
     :param project_root: The root directory of the dbt project.
     :param model_paths: A list of paths (relative to the project root) where dbt models are located.
     :param models: The configuration object of the dbt models.
+    :param templates: The index of the pre-creation templates, built from the other parameters if omitted.
+    :param statement: The classified statement, classified from `sql` if omitted.
     :return: Configured PreCreateSQLAdapter instance.
     """
-    if not is_pre_creatable(sql=sql):
+    if templates is None:
+        templates = PreCreateTemplateIndex(project_root=project_root, model_paths=model_paths, models=models)
+
+    if not templates.models:
+        # We don't need to pre-create, no model is configured.
+        return None
+
+    statement = statement or classify_statement(sql)
+    if statement.kind != CREATE_TABLE_AS:
         # We don't need to pre-create, it's not a suitable SQL statement.
         return None
 
     # Parse the SQL
-    handler = PreCreateSQLAdapter(raw_sql_statement=sql)
+    handler = PreCreateSQLAdapter(raw_sql_statement=sql, statement=statement)
     _relation = f"`{handler.db_name}`.`{handler.table_name}`"
 
-    if not models.get(PRE_CREATE_MODEL, {}).get(handler.model_name, {}):
+    template = templates.get(handler.model_name)
+    if template is None:
         # We don't need to pre-create, the `pre_create` setting was not set.
         return None
 
     # Prepare the SQL queries
-    _create_statement = load_create_table_statement(
-        project_root=project_root,
-        model_paths=model_paths,
-        model_file=f"{handler.model_name}.sql",
-        relation_name=_relation
-    )
-
-    # Extract column names from the config
-    insert_column_names = models.get(PRE_CREATE_MODEL, {}).get(handler.model_name, {}).get(PRE_CREATE_INSERT_COLUMNS_TAG, [])
-
-    # Set the object values
-    config_split, select_split = split_config_select(sql=handler.raw_sql_statement)
-    handler.config_statement = config_split.split(f"{_relation}")[1]
+    _create_statement = template.statement.format(relation_name=_relation)
+
+    # Set the object values, from the offsets of the statement parts
+    config_split = sql[statement.target_end:statement.body_offset]
+    select_split = sql[statement.body_offset:]
+    if not select_split.lstrip().lower().startswith("select"):
+        select_split = f"({select_split})"
+
+    handler.config_statement = _TRAILING_AS_PATTERN.sub("", config_split)
     handler.create_statement = _create_statement + handler.config_statement
-    handler.insert_statement = f"insert into {_relation} ({','.join(insert_column_names)}) {select_split}"
+    handler.insert_statement = f"insert into {_relation} ({','.join(template.insert_columns)}) {select_split}"
 
-    return handler
\ No newline at end of file
+    return handler
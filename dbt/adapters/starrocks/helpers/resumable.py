@@ -0,0 +1,56 @@
+import hashlib
+import re
+
+
+TASK_ID_PREFIX = "dbt_"
+DIGEST_LENGTH = 16
+
+# Tasks worth waiting for or reusing instead of submitting them again
+RESUMABLE_STATES = ("PENDING", "RUNNING", "SUCCESS", "MERGED")
+FINISHED_OK_STATES = ("SUCCESS", "MERGED")
+
+# Dropped tasks can't be resumed, even while their runs are still listed
+FIND_TASK_RUN_TEMPLATE = (
+    "select * from information_schema.task_runs where task_name = '{task_id}' "
+    "and task_name in (select task_name from information_schema.tasks) order by create_time desc limit 1"
+)
+FIND_RESUMABLE_TASK_RUNS_TEMPLATE = (
+    "select task_name from information_schema.task_runs "
+    "where task_name like '{prefix}%' and state in ({states}) "
+    "and task_name in (select task_name from information_schema.tasks) limit 1"
+)
+FIND_TASKS_TEMPLATE = "select task_name from information_schema.tasks where task_name like '{prefix}%'"
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha1("\x00".join(parts).encode("utf-8")).hexdigest()[:DIGEST_LENGTH]
+
+
+def normalize_relation_name(name: str) -> str:
+    """
+    Normalizes a relation name (e.g. `` `my_db`.`my_table` `` or `my_db.my_table`) for comparisons.
+    """
+    return re.sub(r'\s+', '', name).replace('`', '').lower()
+
+
+def task_id_prefix(resume_key: str, node_id: str, relation_name: str) -> str:
+    """
+    Computes the prefix shared by the tasks submitted by a node to build a relation, within a resumable run.
+
+    :param resume_key: The `async_resume_key` of the run, identical across its attempts.
+    :param node_id: The unique ID of the node (e.g. `model.my_project.my_model`).
+    :param relation_name: The normalized name of the relation written by the tasks.
+    :return: The task ID prefix.
+    """
+    return f"{TASK_ID_PREFIX}{_digest(resume_key, node_id, relation_name)}"
+
+
+def resumable_task_id(prefix: str, sql: str) -> str:
+    """
+    Computes a deterministic task ID, identical for the same statement submitted by any attempt of a run.
+
+    :param prefix: The prefix computed by `task_id_prefix`.
+    :param sql: The statement to submit.
+    :return: The task ID.
+    """
+    return f"{prefix}_{_digest(sql)}"
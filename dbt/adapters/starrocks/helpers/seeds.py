@@ -0,0 +1,135 @@
+import contextlib
+import csv
+import hashlib
+import itertools
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import agate
+from dbt.exceptions import DbtRuntimeError
+from dbt_common.clients.agate_helper import build_type_tester
+
+
+SEED_HASH_TEMPLATE = (
+    "select table_comment from information_schema.tables where table_schema = '{schema}' and table_name = '{table}'"
+)
+SET_TABLE_COMMENT_TEMPLATE = 'alter table {relation} comment = "{comment}"'
+
+# Stored in the comment of seed tables, to skip loading seeds which didn't change
+SEED_HASH_MARKER = "dbt_seed:"
+HASH_BLOCK_SIZE = 1024 * 1024
+# Number of rows column types get inferred from, when streaming seeds
+DEFAULT_SAMPLE_SIZE = 10_000
+
+_MARKER_PATTERN = re.compile(re.escape(SEED_HASH_MARKER) + r"(?P<hash>[0-9a-f]+)")
+
+
+def seed_hash(path: str, column_types: Optional[Dict[str, Any]], delimiter: Optional[str] = None) -> str:
+    """
+    Hashes the content of a seed file along with the configs changing how it's loaded.
+
+    The file is read one block at a time, so hashing doesn't depend on its size.
+
+    :param path: The path of the CSV file.
+    :param column_types: The `column_types` config of the seed.
+    :param delimiter: The `delimiter` config of the seed.
+    :return: The hash, stored in the comment of the seed table.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    digest.update(json.dumps([column_types or {}, delimiter], sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def parse_seed_hash(comment: Optional[str]) -> Optional[str]:
+    """
+    Reads the hash stored in the comment of a seed table.
+
+    :return: The hash, or None if the table has none.
+    """
+    match = _MARKER_PATTERN.search(comment or "")
+    return match.group("hash") if match else None
+
+
+def iter_csv(path: str, delimiter: Optional[str] = None) -> Tuple[List[str], Iterator[Tuple[int, List[str]]]]:
+    """
+    Reads a CSV file one row at a time, checking that each row has a value per column of the header.
+
+    A BOM at the start of the file is skipped, and blank lines are ignored.
+
+    :param path: The path of the CSV file.
+    :param delimiter: The delimiter of the file, `,` by default.
+    :return: The column names, and a generator of the line number and values of each row.
+    :raises dbt.exceptions.DbtRuntimeError: If a row doesn't have as many values as the header.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        column_names = next(csv.reader(f, delimiter=delimiter or ","), [])
+
+    def _rows() -> Iterator[Tuple[int, List[str]]]:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f, delimiter=delimiter or ",")
+            next(reader, None)
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != len(column_names):
+                    raise DbtRuntimeError(
+                        f"Line {reader.line_num} of {path} has {len(row)} values, "
+                        f"expected {len(column_names)} like its header"
+                    )
+                yield reader.line_num, row
+
+    return column_names, _rows()
+
+
+def read_seed_sample(
+    path: str,
+    column_types: Optional[Dict[str, Any]],
+    delimiter: Optional[str] = None,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> agate.Table:
+    """
+    Reads the first rows of a seed file, inferring the column types from them like dbt does from whole seeds.
+
+    :param path: The path of the CSV file.
+    :param column_types: The `column_types` config of the seed, whose columns are read as text.
+    :param delimiter: The `delimiter` config of the seed.
+    :param sample_size: The maximum number of rows to read.
+    :return: The sampled rows.
+    :raises dbt.exceptions.DbtRuntimeError: If a sampled row doesn't have as many values as the header.
+    """
+    type_tester = build_type_tester(text_columns=column_types or {})
+    column_names, rows = iter_csv(path, delimiter)
+    with contextlib.closing(rows):
+        sample = [row for _, row in itertools.islice(rows, sample_size)]
+    return agate.Table(sample, column_names=column_names, column_types=type_tester)
+
+
+def iter_seed_rows(path: str, sample: agate.Table, delimiter: Optional[str] = None) -> Iterator[Tuple[Any, ...]]:
+    """
+    Reads the rows of a seed file one at a time, converting their values to the column types of its sample.
+
+    :param path: The path of the CSV file.
+    :param sample: The sample of the file, from `read_seed_sample`.
+    :param delimiter: The `delimiter` config of the seed.
+    :return: A generator of rows.
+    :raises dbt.exceptions.DbtRuntimeError: If a row doesn't have as many values as the header, or a value doesn't
+        match the type inferred from the sample.
+    """
+    data_types = [column.data_type for column in sample.columns]
+    _, rows = iter_csv(path, delimiter)
+    for line, row in rows:
+        yield _cast_row(row, data_types, path, line)
+
+
+def _cast_row(row: Iterable[str], data_types: List[agate.data_types.DataType], path: str, line: int) -> Tuple[Any, ...]:
+    try:
+        return tuple(data_type.cast(value) for data_type, value in zip(data_types, row))
+    except agate.exceptions.CastError as e:
+        raise DbtRuntimeError(
+            f"Line {line} of {path} doesn't match the column types inferred from its first rows ({e}), "
+            f"set its `column_types` or increase its `seed_sample_size`"
+        )
@@ -0,0 +1,256 @@
+import dataclasses
+import re
+from typing import Iterator, Optional, Tuple
+
+
+CREATE_TABLE_AS = "create_table_as"
+CREATE_TABLE = "create_table"
+INSERT_INTO = "insert_into"
+INSERT_OVERWRITE = "insert_overwrite"
+CACHE_SELECT = "cache_select"
+QUERY = "query"
+OTHER = "other"
+
+SUBMITTABLE_KINDS = (CREATE_TABLE_AS, INSERT_INTO, INSERT_OVERWRITE, CACHE_SELECT)
+
+# Comments and hints (`/*+ ... */`) are skipped, quoted strings and identifiers are single tokens
+_TOKEN_PATTERN = re.compile(
+    r"""(?P<skip>\s+|/\*.*?(?:\*/|\Z)|--[^\n]*|\#[^\n]*)"""
+    r"""|(?P<token>`[^`]*`|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|\w+|.)""",
+    re.DOTALL,
+)
+
+# Keywords starting the body of the statement
+_BODY_KEYWORDS = ("select", "with", "values")
+
+
+@dataclasses.dataclass(frozen=True)
+class Statement:
+    """
+    The leading structure of an SQL statement.
+
+    :param kind: The statement kind (e.g. `create_table_as`, `insert_into`, `query`).
+    :param target: The unquoted parts of the relation written by the statement (e.g. `("my_db", "my_table")`).
+    :param target_end: The offset right after the target relation in the statement.
+    :param body_offset: The offset of the query body (`select`, `with` or `values`) in the statement.
+    :param partitions: The unquoted partitions written by an `INSERT ... PARTITION (...)` statement.
+    """
+    kind: str
+    target: Optional[Tuple[str, ...]] = None
+    target_end: Optional[int] = None
+    body_offset: Optional[int] = None
+    partitions: Optional[Tuple[str, ...]] = None
+
+    @property
+    def target_name(self) -> Optional[str]:
+        """
+        The normalized name of the target relation (e.g. `my_db.my_table`).
+        """
+        if not self.target:
+            return None
+        return ".".join(self.target).lower()
+
+
+def tokenize(sql: str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Lazily reads the tokens of a statement, skipping whitespaces, comments and hints.
+
+    :return: A generator of tuples of a token, its start offset and its end offset.
+    """
+    for match in _TOKEN_PATTERN.finditer(sql):
+        if match.lastgroup == "token":
+            yield match.group(), match.start(), match.end()
+
+
+class _TokenStream:
+    """
+    Lazily reads the tokens of a statement, skipping whitespaces, comments and hints.
+    """
+
+    def __init__(self, sql: str):
+        self._tokens = tokenize(sql)
+        self._peeked: Optional[Tuple[str, int, int]] = None
+
+    def next(self) -> Optional[Tuple[str, int, int]]:
+        """
+        :return: A tuple of the next token, its start offset and its end offset, or None at the end.
+        """
+        if self._peeked is not None:
+            token, self._peeked = self._peeked, None
+            return token
+        return next(self._tokens, None)
+
+    def peek(self) -> Optional[Tuple[str, int, int]]:
+        if self._peeked is None:
+            self._peeked = self.next()
+        return self._peeked
+
+    def next_keyword(self) -> Optional[str]:
+        token = self.next()
+        return token[0].lower() if token is not None else None
+
+    def peek_keyword(self) -> Optional[str]:
+        token = self.peek()
+        return token[0].lower() if token is not None else None
+
+
+def _unquote(token: str) -> str:
+    return token[1:-1] if token.startswith("`") else token
+
+
+def _read_relation(tokens: _TokenStream) -> Tuple[Optional[Tuple[str, ...]], Optional[int]]:
+    """
+    Reads a qualified relation name (e.g. `` `my_db`.`my_table` ``).
+
+    :return: A tuple of the unquoted name parts and the offset right after the name.
+    """
+    token = tokens.next()
+    if token is None:
+        return None, None
+
+    parts = [_unquote(token[0])]
+    end = token[2]
+    while tokens.peek_keyword() == ".":
+        tokens.next()
+        token = tokens.next()
+        if token is None:
+            break
+        parts.append(_unquote(token[0]))
+        end = token[2]
+    return tuple(parts), end
+
+
+def _read_partitions(tokens: _TokenStream) -> Optional[Tuple[str, ...]]:
+    """
+    Reads the `[TEMPORARY] PARTITION (p1, p2, ...)` clause following the target of an `INSERT` statement, if any.
+    """
+    if tokens.peek_keyword() == "temporary":
+        tokens.next()
+    if tokens.peek_keyword() not in ("partition", "partitions"):
+        return None
+    tokens.next()
+    if tokens.peek_keyword() != "(":
+        return None
+    tokens.next()
+
+    partitions = []
+    while True:
+        keyword = tokens.peek_keyword()
+        if keyword is None:
+            return None
+        token = tokens.next()
+        if keyword == ")":
+            return tuple(partitions)
+        if keyword != ",":
+            partitions.append(_unquote(token[0]))
+
+
+def _scan_body(tokens: _TokenStream, after_as: bool) -> Optional[int]:
+    """
+    Scans the header of a statement until the start of its body, ignoring nested parentheses.
+
+    :param after_as: Whether the body must be introduced by `AS` (`CREATE TABLE ... AS SELECT`).
+    :return: The offset of the body, or None if not found.
+    """
+    depth = 0
+    previous = None
+    while True:
+        token = tokens.next()
+        if token is None:
+            return None
+
+        keyword, start, _ = token[0].lower(), token[1], token[2]
+        if keyword == "(":
+            if depth == 0 and after_as and previous == "as":
+                return start
+            depth += 1
+        elif keyword == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0 and keyword == "with" and not after_as and tokens.peek_keyword() == "label":
+            # `INSERT INTO ... WITH LABEL <label>`
+            tokens.next()
+            tokens.next()
+            keyword = "label"
+        elif depth == 0 and keyword in _BODY_KEYWORDS and (not after_as or previous == "as"):
+            return start
+        previous = keyword
+
+
+def classify_statement(sql: str) -> Statement:
+    """
+    Classifies an SQL statement by reading its leading tokens only.
+
+    Comments and optimizer hints are skipped. For `CREATE TABLE` and `INSERT` statements, the target relation is
+    extracted and the header is scanned until the query body, which is never read: classifying a statement costs
+    the same whatever the size of its body. Results aren't cached (which would keep large statements alive): callers
+    classify a statement once and pass the result down (e.g. `StarRocksAdapter.execute`).
+
+    :param sql: The SQL statement to classify.
+    :return: The statement structure.
+    """
+    tokens = _TokenStream(sql)
+    first = tokens.next()
+    if first is None:
+        return Statement(kind=OTHER)
+
+    keyword, start, _ = first
+    keyword = keyword.lower()
+
+    if keyword in ("select", "with"):
+        return Statement(kind=QUERY, body_offset=start)
+
+    if keyword == "cache":
+        second = tokens.next()
+        if second is not None and second[0].lower() == "select":
+            return Statement(kind=CACHE_SELECT, body_offset=second[1])
+        return Statement(kind=OTHER)
+
+    if keyword == "create":
+        if tokens.next_keyword() != "table":
+            return Statement(kind=OTHER)
+        if tokens.peek_keyword() == "if":
+            # `IF NOT EXISTS`
+            tokens.next()
+            tokens.next()
+            tokens.next()
+        target, target_end = _read_relation(tokens)
+        body_offset = _scan_body(tokens, after_as=True)
+        kind = CREATE_TABLE_AS if body_offset is not None else CREATE_TABLE
+        return Statement(kind=kind, target=target, target_end=target_end, body_offset=body_offset)
+
+    if keyword == "insert":
+        mode = tokens.next_keyword()
+        if mode not in ("into", "overwrite"):
+            return Statement(kind=OTHER)
+        target, target_end = _read_relation(tokens)
+        partitions = _read_partitions(tokens)
+        body_offset = _scan_body(tokens, after_as=False)
+        kind = INSERT_INTO if mode == "into" else INSERT_OVERWRITE
+        return Statement(
+            kind=kind, target=target, target_end=target_end, body_offset=body_offset, partitions=partitions
+        )
+
+    return Statement(kind=OTHER)
+
+
+def find_keyword(sql: str, keyword: str) -> Optional[int]:
+    """
+    Finds the first top-level occurrence of a keyword in a statement, i.e. outside of parentheses (e.g. subqueries or
+    `WITH` clauses), comments, hints, strings and quoted identifiers.
+
+    :param sql: The SQL statement to search.
+    :param keyword: The lowercase keyword to find (e.g. `select`).
+    :return: The offset right after the keyword, or None if the statement doesn't contain it.
+    """
+    tokens = _TokenStream(sql)
+    depth = 0
+    token = tokens.next()
+    while token is not None:
+        if token[0] == "(":
+            depth += 1
+        elif token[0] == ")":
+            depth -= 1
+        elif depth == 0 and token[0].lower() == keyword:
+            return token[2]
+        token = tokens.next()
+    return None
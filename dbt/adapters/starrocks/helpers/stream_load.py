@@ -0,0 +1,289 @@
+import base64
+import dataclasses
+import datetime
+import decimal
+import gzip
+import json
+import re
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from dbt.adapters.events.logging import AdapterLogger
+from dbt.exceptions import DbtRuntimeError
+
+
+logger = AdapterLogger("starrocks")
+
+STREAM_LOAD_URL_TEMPLATE = "{scheme}://{host}:{port}/api/{database}/{table}/_stream_load"
+
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_TIMEOUT = 600
+MAX_REDIRECTS = 3
+MAX_LABEL_LENGTH = 128
+
+# Values of the `Status` field of Stream Load results
+SUCCESS_STATUSES = ("Success", "Publish Timeout")
+LABEL_ALREADY_EXISTS = "Label Already Exists"
+FINISHED_JOB_STATUS = "FINISHED"
+
+# The error of an `INSERT ... WITH LABEL` statement reusing the label of a loaded (or loading) transaction
+LABEL_ALREADY_USED = "has already been used"
+
+_LABEL_INVALID_CHARACTERS = re.compile(r"[^-_A-Za-z0-9:]")
+
+
+def make_label(*parts: Any) -> str:
+    """
+    Builds a Stream Load label, only made of the allowed characters and at most 128 characters long.
+    """
+    label = _LABEL_INVALID_CHARACTERS.sub("_", "_".join(str(p) for p in parts if p is not None and p != ""))
+    return label[-MAX_LABEL_LENGTH:]
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def json_chunks(rows: Iterable[Sequence[Any]], column_names: Sequence[str], chunk_size: int) -> Iterator[bytes]:
+    """
+    Encodes rows as JSON arrays of objects (`strip_outer_array`), `chunk_size` rows at a time.
+
+    Only one chunk is held in memory at once.
+
+    :param rows: The rows, with values in the order of `column_names`.
+    :param column_names: The column names.
+    :param chunk_size: The maximum number of rows per chunk.
+    :return: A generator of encoded chunks.
+    """
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append({name: _json_value(value) for name, value in zip(column_names, row)})
+        if len(chunk) >= chunk_size:
+            yield json.dumps(chunk, default=str).encode("utf-8")
+            chunk = []
+    if chunk:
+        yield json.dumps(chunk, default=str).encode("utf-8")
+
+
+@dataclasses.dataclass(frozen=True)
+class StreamLoadResult:
+    """
+    The result of a Stream Load, parsed from its JSON response.
+
+    :param label: The label of the load.
+    :param status: `Success`, `Publish Timeout` (loaded, but not visible yet), `Label Already Exists` or `Fail`.
+    :param message: The message of the load, explaining failures.
+    :param rows_loaded: The number of rows loaded.
+    :param rows_filtered: The number of rows filtered out for bad data quality.
+    :param rows_unselected: The number of rows filtered out by the `where` condition.
+    :param load_bytes: The number of bytes loaded.
+    :param load_time_ms: The duration of the load.
+    :param error_url: The URL of the rows filtered out, if any.
+    :param already_loaded: Whether the label was already loaded, e.g. by a retried request.
+    """
+    label: str
+    status: str
+    message: Optional[str] = None
+    rows_loaded: int = 0
+    rows_filtered: int = 0
+    rows_unselected: int = 0
+    load_bytes: int = 0
+    load_time_ms: int = 0
+    error_url: Optional[str] = None
+    already_loaded: bool = False
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status in SUCCESS_STATUSES or self.already_loaded
+
+    @classmethod
+    def from_response(cls, label: str, payload: Mapping[str, Any]) -> "StreamLoadResult":
+        """
+        Parses the JSON response of a Stream Load.
+
+        :param label: The label of the load, in case the response has none.
+        :param payload: The decoded response.
+        """
+        status = payload.get("Status") or "Fail"
+        return cls(
+            label=payload.get("Label") or label,
+            status=status,
+            message=payload.get("Message") or payload.get("msg"),
+            rows_loaded=int(payload.get("NumberLoadedRows") or 0),
+            rows_filtered=int(payload.get("NumberFilteredRows") or 0),
+            rows_unselected=int(payload.get("NumberUnselectedRows") or 0),
+            load_bytes=int(payload.get("LoadBytes") or 0),
+            load_time_ms=int(payload.get("LoadTimeMs") or 0),
+            error_url=payload.get("ErrorURL") or None,
+            already_loaded=status == LABEL_ALREADY_EXISTS and payload.get("ExistingJobStatus") == FINISHED_JOB_STATUS,
+        )
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # FEs redirect Stream Loads to a BE: the redirect is followed by `StreamLoader`, resending the data
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+class StreamLoader:
+    """
+    Loads data into a table with Stream Load (`PUT /api/{database}/{table}/_stream_load`), through the FE which
+    redirects to a BE.
+
+    :param host: The FE host.
+    :param port: The FE HTTP port.
+    :param username: The user to authenticate with.
+    :param password: The password to authenticate with.
+    :param database: The database of the table.
+    :param table: The table to load into.
+    :param data_format: `json` or `csv`.
+    :param columns: The columns of the loaded data, in order, None to load all the columns of the table.
+    :param properties: Additional Stream Load headers (e.g. `column_separator`, `max_filter_ratio`).
+    :param compress: Whether to gzip the loaded data.
+    :param tls: Whether to connect using HTTPS.
+    :param timeout: The timeout of each request, in seconds.
+    :param retries: The number of times a chunk is sent again on connection errors, with the same label.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        database: str,
+        table: str,
+        data_format: str = "json",
+        columns: Optional[Sequence[str]] = None,
+        properties: Optional[Mapping[str, Any]] = None,
+        compress: bool = False,
+        tls: bool = False,
+        timeout: int = DEFAULT_TIMEOUT,
+        retries: int = 2,
+    ):
+        if data_format not in ("json", "csv"):
+            raise DbtRuntimeError(f"Unsupported Stream Load format {data_format}, expected json or csv")
+
+        self.url = STREAM_LOAD_URL_TEMPLATE.format(
+            scheme="https" if tls else "http", host=host, port=port, database=database, table=table,
+        )
+        self.timeout = timeout
+        self.retries = retries
+        self.compress = compress
+
+        credentials = f"{username or ''}:{password or ''}".encode("utf-8")
+        self._headers = {
+            "Authorization": "Basic " + base64.b64encode(credentials).decode("ascii"),
+            "Expect": "100-continue",
+            "format": data_format,
+        }
+        if data_format == "json":
+            self._headers["strip_outer_array"] = "true"
+        if columns:
+            self._headers["columns"] = ",".join(f"`{c}`" for c in columns)
+        if compress:
+            self._headers["compression"] = "gzip"
+        self._headers.update({k: str(v) for k, v in (properties or {}).items()})
+
+    def _put(self, data: bytes, label: str) -> Dict[str, Any]:
+        url = self.url
+        headers = dict(self._headers, label=label)
+        for _ in range(MAX_REDIRECTS + 1):
+            request = urllib.request.Request(url, data=data, headers=headers, method="PUT")
+            try:
+                with _opener.open(request, timeout=self.timeout) as response:
+                    return json.loads(response.read().decode("utf-8"))
+            except urllib.error.HTTPError as e:
+                location = e.headers.get("Location") if e.code in (301, 302, 303, 307, 308) else None
+                if not location:
+                    raise DbtRuntimeError(f"Stream Load {label} failed with HTTP {e.code}: {e.read()[:1000]!r}")
+                url = location
+        raise DbtRuntimeError(f"Stream Load {label} got redirected more than {MAX_REDIRECTS} times")
+
+    def load(self, data: bytes, label: str) -> StreamLoadResult:
+        """
+        Loads a chunk of data, sending it again with the same label on connection errors, so that it's loaded once.
+
+        :param data: The data, in the format of the loader.
+        :param label: The unique label of the load.
+        :return: The result of the load.
+        :raises dbt.exceptions.DbtRuntimeError: If the load failed.
+        """
+        body = gzip.compress(data) if self.compress else data
+        attempt = 0
+        while True:
+            try:
+                payload = self._put(body, label)
+                break
+            except (urllib.error.URLError, ConnectionError, TimeoutError) as e:
+                if attempt >= self.retries:
+                    raise DbtRuntimeError(f"Stream Load {label} failed: {e}")
+                attempt += 1
+                logger.debug(f"Stream Load {label} failed, retrying ({attempt}/{self.retries}): {e}")
+                time.sleep(min(2 ** attempt, 10))
+
+        result = StreamLoadResult.from_response(label, payload)
+        if not result.succeeded:
+            details = f", see {result.error_url}" if result.error_url else ""
+            raise DbtRuntimeError(f"Stream Load {label} failed ({result.status}): {result.message}{details}")
+        logger.debug(
+            f"Stream Load {label}: {result.status}, {result.rows_loaded} rows loaded, "
+            f"{result.rows_filtered} filtered in {result.load_time_ms}ms"
+        )
+        return result
+
+    def load_chunks(self, chunks: Iterable[bytes], label_prefix: str, parallelism: int = 1) -> List[StreamLoadResult]:
+        """
+        Loads chunks, each with its own label `{label_prefix}_{index}`.
+
+        At most `parallelism` chunks are loaded at once, and read ahead: chunks are only encoded when a load
+        is about to start, so that memory doesn't depend on the size of the data.
+
+        :param chunks: The chunks, in the format of the loader.
+        :param label_prefix: The prefix of the labels, unique to the loaded data.
+        :param parallelism: The maximum number of chunks loaded at once.
+        :return: The result of each load, in the order of the chunks.
+        :raises dbt.exceptions.DbtRuntimeError: If a load failed, once the loads in progress finished.
+        """
+        if parallelism <= 1:
+            return [self.load(chunk, make_label(label_prefix, index)) for index, chunk in enumerate(chunks)]
+
+        results: Dict[int, StreamLoadResult] = {}
+        errors: List[BaseException] = []
+        running: Dict[Future, int] = {}
+
+        def _collect(done: Iterable[Future]) -> None:
+            for future in done:
+                index = running.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    errors.append(e)
+
+        with ThreadPoolExecutor(max_workers=parallelism) as pool:
+            for index, chunk in enumerate(chunks):
+                if len(running) >= parallelism:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    _collect(done)
+                if errors:
+                    break
+                running[pool.submit(self.load, chunk, make_label(label_prefix, index))] = index
+            _collect(wait(running).done)
+
+        if errors:
+            raise errors[0]
+        return [results[index] for index in sorted(results)]
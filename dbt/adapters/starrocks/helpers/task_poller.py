@@ -0,0 +1,385 @@
+import datetime
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import agate
+from dbt.adapters.contracts.connection import AdapterResponse
+from dbt.adapters.events.logging import AdapterLogger
+from dbt.exceptions import DbtRuntimeError
+
+
+logger = AdapterLogger("starrocks")
+
+MIN_POLL_DELAY = 1
+MAX_POLL_DELAY = 60
+POLL_JITTER = 0.1  # +/- 10% of the delay
+# Fraction of the estimated remaining time to wait for, so that polls get closer together near the end
+REMAINING_TIME_FACTOR = 0.5
+POLL_BATCH_SIZE = 100
+# Failed polling queries in a row after which the tasks being polled fail
+MAX_POLL_FAILURES = 5
+POLL_TASKS_TEMPLATE = "select * from information_schema.task_runs where {column} in ({task_names})"
+
+# Columns of `task_runs` identifying polled tasks: submitted tasks by name, other task runs
+# (e.g. materialized view refreshes) by the query ID returned when they got triggered
+TASK_NAME_COLUMN = "TASK_NAME"
+QUERY_ID_COLUMN = "QUERY_ID"
+
+FINISHED_STATES = ("SUCCESS", "MERGED", "FAILED", "unknown")
+
+SQLQueryResult = Tuple[AdapterResponse, "agate.Table"]
+
+
+class TaskCancelledError(DbtRuntimeError):
+    """
+    Raised to the threads waiting for tasks, or for a slot, once the poller got cancelled.
+
+    :param task_id: The cancelled task, if any.
+    :param orphan: True if the task was not returned by `TaskPoller.cancel`, so the waiting thread must drop it.
+    """
+
+    def __init__(self, msg: str, task_id: Optional[str] = None, orphan: bool = False):
+        super().__init__(msg)
+        self.task_id = task_id
+        self.orphan = orphan
+
+
+def parse_progress(progress: Any) -> Optional[float]:
+    """
+    Parses the `PROGRESS` column of `task_runs` (e.g. `42%`).
+
+    :return: The progress as a fraction between 0 and 1, or None if unknown.
+    """
+    try:
+        value = float(str(progress).strip().rstrip('%')) / 100
+    except (TypeError, ValueError):
+        return None
+    return value if 0 <= value <= 1 else None
+
+
+def compute_poll_delay(
+    elapsed: float,
+    progress: Optional[float],
+    attempts: int,
+    min_delay: float = MIN_POLL_DELAY,
+    max_delay: float = MAX_POLL_DELAY,
+    jitter: float = POLL_JITTER,
+) -> float:
+    """
+    Computes the delay before the next poll of a running task.
+
+    When the task reports some progress, its remaining time is extrapolated from the elapsed time and
+    the next poll happens after a fraction of it, so polls get more frequent as the task nears its end.
+    Otherwise, the delay grows exponentially with the number of attempts. Either way, the delay is
+    clamped between `min_delay` and `max_delay` and randomized by +/- `jitter`, so that tasks submitted
+    together don't get polled in lockstep.
+
+    :param elapsed: Seconds since the task was submitted.
+    :param progress: The task progress between 0 and 1, or None if unknown.
+    :param attempts: Number of polls so far.
+    :return: The delay, in seconds.
+    """
+    if progress:
+        remaining = elapsed * (1 - progress) / progress
+        delay = remaining * REMAINING_TIME_FACTOR
+    else:
+        delay = 2 ** attempts
+
+    delay = min(max_delay, max(min_delay, delay))
+    return max(min_delay, delay * random.uniform(1 - jitter, 1 + jitter))
+
+
+def _as_datetime(value: Any) -> Optional[datetime.datetime]:
+    if isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def estimate_polling_latency(task: "PendingTask", row: Any, observed_at: float) -> float:
+    """
+    Estimates how long a finished task waited to be noticed by the poller.
+
+    The server-side duration of the task (`FINISH_TIME` - `CREATE_TIME`) is mapped onto the local clock,
+    starting at the task submission. Without timings, the latency is bounded by the time since the last
+    poll that saw the task running.
+
+    :param task: The finished task.
+    :param row: The `task_runs` row of the task.
+    :param observed_at: When the task was seen finished (monotonic clock).
+    :return: The latency added by polling, in seconds.
+    """
+    upper_bound = observed_at - (task.last_running_poll_at or task.submitted_at)
+
+    create_time = _as_datetime(row.get("CREATE_TIME"))
+    finish_time = _as_datetime(row.get("FINISH_TIME"))
+    if create_time is None or finish_time is None:
+        return upper_bound
+
+    finished_at = task.submitted_at + (finish_time - create_time).total_seconds()
+    return min(upper_bound, max(0.0, observed_at - finished_at))
+
+
+class PendingTask:
+    """
+    A submitted task waiting for completion, resolved by the `TaskPoller`.
+    """
+
+    def __init__(self, task_id: str, column: str = TASK_NAME_COLUMN):
+        self.task_id = task_id
+        self.column = column
+        self.attempts = 1
+        self.submitted_at = time.monotonic()
+        self.next_poll_at = self.submitted_at
+        self.last_running_poll_at: Optional[float] = None
+        self.polling_latency: Optional[float] = None
+        self._done = threading.Event()
+        self._result: Optional[SQLQueryResult] = None
+        self._error: Optional[BaseException] = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the task is finished.
+
+        :param timeout: Maximum number of seconds to wait for.
+        :return: True if the task is finished.
+        """
+        return self._done.wait(timeout)
+
+    def result(self) -> SQLQueryResult:
+        """
+        Blocks until the task is finished and returns the polling results.
+
+        :return: A tuple of the polling query status and the `task_runs` row of the task (empty if not found).
+        :raises Exception: The error raised while polling the task.
+        """
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _resolve(self, result: Optional[SQLQueryResult] = None, error: Optional[BaseException] = None) -> None:
+        if self._done.is_set():
+            # Already cancelled
+            return
+        self._result = result
+        self._error = error
+        self._done.set()
+
+
+class TaskPoller:
+    """
+    Polls the status of all the outstanding submitted tasks of an adapter with a single query per tick.
+
+    Tasks are registered by the dbt threads waiting for them. A background thread, started on demand
+    and stopped once no task is outstanding anymore, queries `information_schema.task_runs` for all
+    the tasks that are due with `task_name IN (...)` and wakes the waiting threads as their tasks finish.
+
+    Each task is polled right after its submission, then according to its progress (see `compute_poll_delay`).
+    A failed polling query doesn't fail its tasks: they are polled again with an exponential backoff, and only
+    fail once `MAX_POLL_FAILURES` polling queries failed in a row.
+
+    The poller also bounds the number of tasks in flight on the cluster, independently of the number of
+    dbt threads: a slot must be acquired before submitting a task, and released once the task finished.
+
+    :param run_query: Callable executing a polling query from the poller thread.
+    :param min_delay: Minimum number of seconds between two polls of a task.
+    :param max_delay: Maximum number of seconds between two polls of a task.
+    :param max_inflight: Maximum number of tasks in flight. `None` means unbounded.
+    """
+
+    def __init__(
+        self,
+        run_query: Callable[[str], SQLQueryResult],
+        min_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        max_inflight: Optional[int] = None,
+    ):
+        if max_inflight is not None and max_inflight < 1:
+            raise DbtRuntimeError(f"The maximum number of in-flight tasks must be at least 1, got {max_inflight}")
+
+        self._run_query = run_query
+        self.min_delay = MIN_POLL_DELAY if min_delay is None else min_delay
+        self.max_delay = MAX_POLL_DELAY if max_delay is None else max_delay
+        self.max_inflight = max_inflight
+        self.peak_inflight = 0
+        self.cancelled = False
+        self._poll_failures = 0
+        self._inflight = 0
+        self._tasks: Dict[str, PendingTask] = {}
+        self._cond = threading.Condition()
+        self._slots_cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def acquire_slot(self, timeout: Optional[float] = None) -> bool:
+        """
+        Reserves a slot for a task to be submitted, waiting for one to free up if needed.
+
+        :param timeout: Maximum number of seconds to wait for, `None` waits indefinitely.
+        :return: True if a slot was acquired.
+        :raises TaskCancelledError: If the poller got cancelled.
+        """
+        with self._slots_cond:
+            if not self._slots_cond.wait_for(lambda: self.cancelled or self._has_free_slot(), timeout):
+                return False
+            if self.cancelled:
+                raise TaskCancelledError("Cancelled while waiting for an in-flight task slot")
+            self._inflight += 1
+            self.peak_inflight = max(self.peak_inflight, self._inflight)
+            return True
+
+    def release_slot(self) -> None:
+        """
+        Frees a slot acquired with `acquire_slot`, once its task finished or failed to be submitted.
+        """
+        with self._slots_cond:
+            self._inflight = max(0, self._inflight - 1)
+            self._slots_cond.notify()
+
+    def _has_free_slot(self) -> bool:
+        return self.max_inflight is None or self._inflight < self.max_inflight
+
+    def submit(self, task_id: str, column: str = TASK_NAME_COLUMN) -> PendingTask:
+        """
+        Registers a submitted task to be polled until completion.
+
+        :param task_id: The task name, as submitted to StarRocks.
+        :param column: The `task_runs` column identifying the task, `QUERY_ID` for task runs without a name of their own.
+        :return: The pending task, to wait for.
+        :raises TaskCancelledError: If the poller got cancelled, the task is then an orphan.
+        """
+        with self._cond:
+            if self.cancelled:
+                raise TaskCancelledError(f"Task [{task_id}] was submitted after the cancellation", task_id, orphan=True)
+            task = self._tasks.get(task_id)
+            if task is None:
+                task = PendingTask(task_id, column)
+                self._tasks[task_id] = task
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="starrocks-task-poller", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return task
+
+    @property
+    def outstanding(self) -> List[str]:
+        with self._cond:
+            return list(self._tasks)
+
+    def cancel(self) -> List[str]:
+        """
+        Stops polling all the outstanding tasks and wakes up their waiting threads with a `TaskCancelledError`.
+
+        The tasks keep running on the cluster, it's up to the caller to drop them. Tasks submitted afterwards
+        are refused, and threads waiting for a slot are woken up with a `TaskCancelledError` as well.
+
+        :return: The IDs of the cancelled tasks.
+        """
+        with self._cond:
+            self.cancelled = True
+            tasks = list(self._tasks.values())
+            self._tasks.clear()
+            self._cond.notify()
+
+        with self._slots_cond:
+            self._slots_cond.notify_all()
+
+        for task in tasks:
+            task._resolve(error=TaskCancelledError(f"Task [{task.task_id}] was cancelled", task.task_id))
+        return [task.task_id for task in tasks]
+
+    def _next_batch(self) -> Optional[List[PendingTask]]:
+        with self._cond:
+            while True:
+                if not self._tasks:
+                    self._thread = None
+                    return None
+
+                now = time.monotonic()
+                due = [task for task in self._tasks.values() if task.next_poll_at <= now]
+                if due:
+                    return due
+
+                next_poll_at = min(task.next_poll_at for task in self._tasks.values())
+                # Woken up early when a new task gets submitted
+                self._cond.wait(next_poll_at - now)
+
+    def _run(self) -> None:
+        while True:
+            due = self._next_batch()
+            if due is None:
+                return
+
+            for column in sorted({task.column for task in due}):
+                tasks = [task for task in due if task.column == column]
+                for start in range(0, len(tasks), POLL_BATCH_SIZE):
+                    self._poll(tasks[start:start + POLL_BATCH_SIZE], column)
+
+    def _poll(self, tasks: List[PendingTask], column: str = TASK_NAME_COLUMN) -> None:
+        task_names = ", ".join(f"'{task.task_id}'" for task in tasks)
+        try:
+            response, table = self._run_query(POLL_TASKS_TEMPLATE.format(column=column.lower(), task_names=task_names))
+        except Exception as e:
+            self._poll_failed(tasks, e)
+            return
+        self._poll_failures = 0
+
+        for task in tasks:
+            task_table = table.where(lambda row, _id=task.task_id: row.get(column) == _id).limit(1)
+            if response.code != 'SUCCESS' or len(task_table) == 0:
+                self._finish(task, result=(response, task_table))
+                continue
+
+            status = task_table[0].get("STATE", "unknown")
+            if status in FINISHED_STATES:
+                task.polling_latency = estimate_polling_latency(task, task_table[0], observed_at=time.monotonic())
+                self._finish(task, result=(response, task_table))
+                continue
+
+            # Compute next delay
+            now = time.monotonic()
+            progress = task_table[0].get("PROGRESS", "unknown")
+            poll_delay = compute_poll_delay(
+                elapsed=now - task.submitted_at,
+                progress=parse_progress(progress),
+                attempts=task.attempts,
+                min_delay=self.min_delay,
+                max_delay=self.max_delay,
+            )
+            task.attempts += 1
+            task.last_running_poll_at = now
+            task.next_poll_at = now + poll_delay
+
+            # Notify end user
+            logger.info(f"Task {task.task_id} progress [{progress}]. Waiting {poll_delay:.1f} seconds...")
+
+    def _poll_failed(self, tasks: List[PendingTask], error: Exception) -> None:
+        # Transient errors (e.g. a dropped connection) must not fail all the tasks being polled
+        self._poll_failures += 1
+        if self._poll_failures >= MAX_POLL_FAILURES:
+            logger.error(f"Polling tasks failed {self._poll_failures} times in a row, giving up: {error}")
+            for task in tasks:
+                self._finish(task, error=error)
+            return
+
+        poll_delay = min(self.max_delay, self.min_delay * 2 ** self._poll_failures)
+        logger.warning(
+            f"Polling {len(tasks)} tasks failed ({self._poll_failures}/{MAX_POLL_FAILURES}), "
+            f"retrying in {poll_delay:.1f} seconds: {error}"
+        )
+        next_poll_at = time.monotonic() + poll_delay
+        for task in tasks:
+            task.next_poll_at = next_poll_at
+
+    def _finish(self, task: PendingTask, result: Optional[SQLQueryResult] = None, error: Optional[BaseException] = None):
+        with self._cond:
+            self._tasks.pop(task.task_id, None)
+        task._resolve(result=result, error=error)
@@ -0,0 +1,150 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+
+
+logger = AdapterLogger("starrocks")
+
+DEFAULT_VERSION = (999, 999, 999)
+VERSION_CACHE_FILE = "starrocks_server_versions.json"
+
+_VERSION_PATTERN = re.compile(r'^\s*v?(\d+)\.(\d+)(?:\.(\d+))?')
+
+VersionTuple = Tuple[int, int, int]
+
+
+def parse_version(version: Optional[str]) -> Optional[VersionTuple]:
+    """
+    Parses a StarRocks version string.
+
+    Accepts the strings returned by `current_version()` (e.g. `3.1.2-4f3fa2b`, `3.10.12-ee`,
+    `3.2.0 RELEASE`) as well as versions pinned in the profile (e.g. `3.1` or `3.1.0`).
+
+    :param version: The version string to parse.
+    :return: A (major, minor, patch) tuple, or None if the string is not a version.
+    """
+    if not version:
+        return None
+
+    match = _VERSION_PATTERN.match(version)
+    if not match:
+        return None
+
+    major, minor, patch = match.groups()
+    return int(major), int(minor), int(patch or 0)
+
+
+class ServerVersionCache:
+    """
+    Process-wide cache of the StarRocks server version, keyed by host.
+
+    The version of a host is detected once, the first time a connection to it is opened, and shared
+    by every connection afterwards. When configured with a path and a TTL, detected versions are also
+    persisted on disk, so that subsequent dbt invocations can skip the detection entirely.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, VersionTuple] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._path: Optional[str] = None
+        self._ttl: Optional[int] = None
+
+    def configure(self, path: Optional[str], ttl: Optional[int]) -> None:
+        """
+        Enables the on-disk persistence of detected versions.
+
+        :param path: The JSON file to persist versions into (usually under `target/`).
+        :param ttl: Number of seconds a persisted version stays valid. `None` disables persistence.
+        """
+        with self._lock:
+            self._path = path if ttl else None
+            self._ttl = ttl
+
+    def get(self, key: str) -> Optional[VersionTuple]:
+        with self._lock:
+            return self._versions.get(key)
+
+    def get_or_detect(self, key: str, detect: Callable[[], str]) -> Optional[VersionTuple]:
+        """
+        Returns the cached version of a host, detecting it if needed.
+
+        Concurrent callers for the same host wait for a single detection.
+
+        :param key: The host key (e.g. `host:port`).
+        :param detect: Callable returning the raw version string of the server.
+        :return: The parsed version, or None if it could not be detected.
+        """
+        with self._lock:
+            if key in self._versions:
+                return self._versions[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._versions:
+                    return self._versions[key]
+
+            version = self._load(key)
+            if version is None:
+                try:
+                    version = parse_version(detect())
+                except Exception as e:
+                    logger.debug("Got an error when obtain StarRocks version exception: '{}'".format(e))
+                    return None
+                if version is None:
+                    return None
+                self._store(key, version)
+
+            with self._lock:
+                self._versions[key] = version
+            return version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+
+    def _load(self, key: str) -> Optional[VersionTuple]:
+        if not self._path:
+            return None
+
+        try:
+            with open(self._path) as f:
+                entry = json.load(f).get(key)
+        except (OSError, ValueError):
+            return None
+
+        if not entry or time.time() - entry.get("detected_at", 0) > self._ttl:
+            return None
+
+        logger.debug(f"Using StarRocks version {entry['version']} of [{key}] cached in {self._path}")
+        return parse_version(entry["version"])
+
+    def _store(self, key: str, version: VersionTuple) -> None:
+        if not self._path:
+            return
+
+        try:
+            with open(self._path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+
+        entries[key] = {"version": "{}.{}.{}".format(*version), "detected_at": time.time()}
+        try:
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            # Write then rename, so that concurrent readers never see a partial file
+            tmp_path = f"{self._path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.debug(f"Could not persist StarRocks version in {self._path}: '{e}'")
+
+
+server_versions = ServerVersionCache()
@@ -12,44 +12,131 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import contextvars
+import dataclasses
+import itertools
+import os
 import re
 import time
 import uuid
-from concurrent.futures import Future
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from functools import partial
-from typing import Callable, Dict, List, Optional, Set, FrozenSet, Tuple, TypeAlias
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, FrozenSet, Tuple, TypeAlias
 
 import agate
 import dbt.exceptions
 from dbt.adapters.base import available
 from dbt.adapters.base.impl import _expect_row_value, catch_as_completed
-from dbt.adapters.base.relation import InformationSchema
+from dbt.adapters.base.relation import BaseRelation, InformationSchema
+from dbt.adapters.capability import Capability, CapabilityDict, CapabilitySupport, Support
 from dbt.adapters.contracts.connection import AdapterResponse
+from dbt.adapters.contracts.relation import RelationConfig
 from dbt.adapters.events.logging import AdapterLogger
 from dbt.adapters.protocol import AdapterConfig
 from dbt.adapters.sql import SQLAdapter
 from dbt.adapters.sql.impl import LIST_RELATIONS_MACRO_NAME, LIST_SCHEMAS_MACRO_NAME
+from dbt.version import __version__ as dbt_version
 from dbt_common.clients.agate_helper import table_from_rows
+from dbt_common.exceptions import DbtDatabaseError
+from dbt_common.events.contextvars import get_node_info
+from dbt_common.invocation import get_invocation_id
 from dbt_common.utils import executor
 from typing_extensions import override
 
 from dbt.adapters.starrocks.column import StarRocksColumn
-from dbt.adapters.starrocks.connections import StarRocksConnectionManager
+from dbt.adapters.starrocks.connections import StarRocksAdapterResponse, StarRocksConnectionManager
+from dbt.adapters.starrocks.helpers.bulk_load import INSERT_METHOD, STREAM_LOAD_METHOD, LoadReport, iter_source_rows
+from dbt.adapters.starrocks.helpers.materialized_view import (
+    CANCEL_REFRESH_MATERIALIZED_VIEW_TEMPLATE,
+    REFRESH_ERROR,
+    REFRESH_SUCCESS,
+    SHOW_CREATE_MATERIALIZED_VIEW_TEMPLATE,
+    configuration_changes,
+    definition_comment,
+    definition_hash,
+    parse_create_materialized_view,
+    refresh_statement,
+    run_in_dependency_order,
+    upstream_materialized_views,
+)
+from dbt.adapters.starrocks.helpers.partitions import (
+    PARTITION_BOUNDS_TEMPLATE,
+    SHOW_PARTITIONS_TEMPLATE,
+    RangePartition,
+    RangePartitions,
+    group_partitions,
+    partition_literal,
+    range_partitions_from_rows,
+)
 from dbt.adapters.starrocks.helpers.pre_create import (
     PreCreateSQLAdapter,
+    PreCreateTemplateIndex,
     create_adapter,
     is_pre_creatable,
 )
+from dbt.adapters.starrocks.helpers.resumable import (
+    FIND_RESUMABLE_TASK_RUNS_TEMPLATE,
+    FIND_TASKS_TEMPLATE,
+    FIND_TASK_RUN_TEMPLATE,
+    FINISHED_OK_STATES,
+    RESUMABLE_STATES,
+    normalize_relation_name,
+    resumable_task_id,
+    task_id_prefix,
+)
+from dbt.adapters.starrocks.helpers.seeds import (
+    DEFAULT_SAMPLE_SIZE,
+    SEED_HASH_MARKER,
+    SEED_HASH_TEMPLATE,
+    SET_TABLE_COMMENT_TEMPLATE,
+    iter_seed_rows,
+    parse_seed_hash,
+    read_seed_sample,
+    seed_hash,
+)
+from dbt.adapters.starrocks.helpers.statement import SUBMITTABLE_KINDS, Statement, classify_statement
+from dbt.adapters.starrocks.helpers.stream_load import LABEL_ALREADY_USED, StreamLoadResult, json_chunks, make_label
+from dbt.adapters.starrocks.helpers.task_poller import (
+    QUERY_ID_COLUMN,
+    TASK_NAME_COLUMN,
+    TaskCancelledError,
+    TaskPoller,
+)
+from dbt.adapters.starrocks.helpers.version import (
+    DEFAULT_VERSION,
+    VERSION_CACHE_FILE,
+    parse_version,
+    server_versions,
+)
 from dbt.adapters.starrocks.relation import StarRocksRelation
 
+if TYPE_CHECKING:
+    import pyarrow
 
 logger = AdapterLogger("starrocks")
 
 SQLQueryResult: TypeAlias = Tuple[AdapterResponse, "agate.Table"]
 
-MAX_POLL_DELAY = 600  # 10 minutes
 SUBMIT_TASK_TEMPLATE = "submit /*+set_var(query_timeout={timeout})*/ task {task_id} as {sql}"
-POLL_TASK_TEMPLATE = "select * from information_schema.task_runs where task_name = '{task_id}'"
+DROP_TASK_TEMPLATE = "drop task {task_id}"
+RELATION_EXISTS_TEMPLATE = (
+    "select 1 from information_schema.tables where table_schema = '{schema}' and table_name = '{table}'"
+)
+TASK_POLLER_CONNECTION_NAME = "starrocks_task_poller"
+TASK_CANCEL_CONNECTION_NAME = "starrocks_task_cancel"
+FIRST_POLL_GRACE_PERIOD = 1  # seconds
+INSERT_OVERWRITE_PARTITIONS_TEMPLATE = (
+    "insert /*+SET_VAR(dynamic_overwrite = false)*/ overwrite {relation} partition ({partitions}) ({columns})\n"
+    "select {columns} from {source}{where}"
+)
+OVERWRITE_CONNECTION_NAME = "starrocks_overwrite_{index}"
+REFRESH_CONNECTION_NAME = "starrocks_refresh_{relation}"
+LIST_RELATIONS_IN_SCHEMAS_MACRO_NAME = "starrocks__list_relations_in_schemas"
+RELATIONS_CACHE_CHUNK_SIZE = 100  # schemas listed per query
+INSERT_BATCH_SIZE = 10000
+# Microbatch models are run by dbt-core from 1.9, which sets the bounds of each batch
+MICROBATCH_SUPPORTED = tuple(int(part) for part in re.findall(r"\d+", dbt_version)[:2]) >= (1, 9)
 
 class StarRocksConfig(AdapterConfig):
     engine: Optional[str] = None
@@ -60,6 +147,12 @@ class StarRocksConfig(AdapterConfig):
     distributed_by: Optional[List[str]] = None
     buckets: Optional[int] = None
     properties: Optional[Dict[str, str]] = None
+    keep_backup: Optional[bool] = None
+    overwrite_scope: Optional[str] = None  # partitions/table
+    overwrite_parallelism: Optional[int] = None
+    merge_delete_column: Optional[str] = None
+    seed_streaming: Optional[bool] = None
+    seed_sample_size: Optional[int] = None
 
 
 class StarRocksAdapter(SQLAdapter):
@@ -68,8 +161,31 @@ class StarRocksAdapter(SQLAdapter):
     AdapterSpecificConfigs = StarRocksConfig
     Column = StarRocksColumn
 
+    _capabilities = CapabilityDict({
+        # Batches write distinct partitions, they can run concurrently
+        Capability.MicrobatchConcurrency: CapabilitySupport(support=Support.Full),
+    } if MICROBATCH_SUPPORTED else {})
+
+    def __init__(self, config, mp_context) -> None:
+        super().__init__(config, mp_context)
+        server_versions.configure(
+            path=os.path.join(config.project_root, getattr(config, "target_path", "target"), VERSION_CACHE_FILE),
+            ttl=config.credentials.version_cache_ttl,
+        )
+        self._task_poller = TaskPoller(
+            self._run_poll_query,
+            min_delay=config.credentials.async_poll_min_delay,
+            max_delay=config.credentials.async_poll_max_delay,
+            max_inflight=config.credentials.async_max_inflight_tasks,
+        )
+        self._pre_create_templates = PreCreateTemplateIndex(
+            project_root=config.project_root,
+            model_paths=config.model_paths,
+            models=config.models,
+        )
+
     @staticmethod
-    def _is_submittable_etl(sql: str) -> bool:
+    def _is_submittable_etl(sql: str, statement: Optional[Statement] = None) -> bool:
         """
         Evaluates if the SQL statement matches supported StarRocks ETL patterns.
 
@@ -81,77 +197,252 @@ class StarRocksAdapter(SQLAdapter):
         Reference: https://docs.starrocks.io/docs/sql-reference/sql-statements/loading_unloading/ETL/SUBMIT_TASK/
 
         :param sql: The SQL statement to evaluate.
+        :param statement: The classified statement, classified from `sql` if omitted.
         :return: True or False depending on whether the SQL statement is a submittable ETL.
         """
-        # Remove newlines and normalize whitespace
-        sql_clean = sql.strip().replace('\n', '')
-        sql_clean = re.sub(r'\s+', ' ', sql_clean).strip().lower()
-
-        # Note: # Supported ETL patterns from StarRocks documentation
-        # https://docs.starrocks.io/docs/sql-reference/sql-statements/loading_unloading/ETL/SUBMIT_TASK/
-        #
-        # The goal here is to soft-match the ETL patterns for dbt-generated sql queries.
+        # The goal here is to soft-match the ETL patterns for dbt-generated sql queries, from their leading tokens.
         # It is not intended to be exhaustive nor to validate SQL statement, this will be left to the engine.
-        suitable_etl_patterns = [
-            r'^create\s+table.*select',
-            r'^insert\s+(into|overwrite)\b',
-            r'^cache\s+select\b'
-        ]
+        return (statement or classify_statement(sql)).kind in SUBMITTABLE_KINDS
+
+    def _run_on_connection(self, name: str, sql: str, fetch: bool = False) -> SQLQueryResult:
+        """
+        Runs a query on a connection of its own, released right after.
+
+        Only meant for threads not running models (e.g. the task poller thread), as it renames the thread connection.
+        """
+        self.connections.set_connection_name(name)
+        try:
+            return self.connections.execute(sql=sql, fetch=fetch)
+        finally:
+            self.connections.release()
+
+    def _run_poll_query(self, sql: str) -> SQLQueryResult:
+        """
+        Runs a task polling query, from the task poller thread.
+
+        The poller thread holds its own connection, released between ticks to avoid stale connections.
+        """
+        return self._run_on_connection(TASK_POLLER_CONNECTION_NAME, sql, fetch=True)
+
+    @staticmethod
+    def _drop_orphan_task(task_id: str, run_sql: Callable[[str], Any]) -> bool:
+        """
+        Drops a submitted task left behind by dbt, which cancels its running TaskRun.
+
+        :param task_id: The task to drop.
+        :param run_sql: Callable executing the `drop task` statement.
+        :return: True if the task got dropped.
+        """
+        try:
+            run_sql(DROP_TASK_TEMPLATE.format(task_id=task_id))
+        except Exception as e:
+            logger.warning(f"Could not drop orphan task [{task_id}], it will run until it finishes: {e}")
+            return False
+        logger.warning(f"Dropped orphan task [{task_id}]")
+        return True
+
+    @override
+    def cancel_open_connections(self):
+        """
+        Drops the submitted tasks still running before cancelling the open connections.
+
+        Otherwise, they would keep running on the cluster for up to `async_query_timeout`.
+        """
+        task_ids = self._task_poller.cancel()
+        if task_ids:
+            logger.info(f"Dropping {len(task_ids)} running submitted tasks...")
+            run_sql = partial(self._run_on_connection, TASK_CANCEL_CONNECTION_NAME)
+            dropped = [task_id for task_id in task_ids if self._drop_orphan_task(task_id, run_sql)]
+            logger.info(f"Dropped {len(dropped)}/{len(task_ids)} orphan tasks: {', '.join(dropped)}")
+        return super().cancel_open_connections()
+
+    @contextmanager
+    def _inflight_task_slot(self) -> Iterator[None]:
+        """
+        Holds one of the `async_max_inflight_tasks` slots while a task gets submitted and waited for.
+
+        A thread waiting for a slot doesn't hold its connection, like a thread waiting for its task.
+        """
+        if not self._task_poller.acquire_slot(timeout=0):
+            logger.info(
+                f"{self._task_poller.inflight} tasks in flight (async_max_inflight_tasks). Waiting for a free slot..."
+            )
+            _connection = self.connections.get_if_exists()
+            if _connection:
+                self.connections.close(_connection)
+            try:
+                self._task_poller.acquire_slot()
+            finally:
+                if _connection:
+                    self.connections.open(_connection)
 
-        return any(re.search(pattern, sql_clean) for pattern in suitable_etl_patterns)
+        try:
+            yield
+        finally:
+            self._task_poller.release_slot()
 
-    def _poll_for_complete_task(self, task_id: str) -> SQLQueryResult:
+    def _poll_for_complete_task(self, task_id: str, column: str = TASK_NAME_COLUMN) -> SQLQueryResult:
         """
-        Polls for the completion of a task.
+        Waits for the completion of a task, polled by the adapter-wide task poller.
 
         :param task_id: The task ID to poll for.
+        :param column: The `task_runs` column identifying the task (`TASK_NAME` or `QUERY_ID`).
         :return: A tuple of the execution status and polling results.
         """
-        _poll_sql = POLL_TASK_TEMPLATE.format(task_id=task_id)
         _connection = self.connections.get_if_exists() or self.connections.begin()
-        _attempts = 1
+        _pending_task = self._task_poller.submit(task_id, column)
 
-        while True:
+        if not _pending_task.wait(timeout=FIRST_POLL_GRACE_PERIOD):
+            # Close connection while waiting to avoid stale connections
+            self.connections.close(_connection)
 
+        try:
+            response, table = _pending_task.result()
+        finally:
             # Open if needed
             self.connections.open(_connection)
 
-            # Get the status from task_runs
-            response, table = super().execute(sql=_poll_sql, fetch=True, limit=1)
-            if response.code != 'SUCCESS':
-                logger.error(
-                    f"Error: Could not poll task [{task_id}]. "
-                    f"Reason: failed with response.code: [{response.code}]"
-                )
-                return response, table
+        if response.code != 'SUCCESS':
+            logger.error(
+                f"Error: Could not poll task [{task_id}]. "
+                f"Reason: failed with response.code: [{response.code}]"
+            )
+            return response, table
 
-            # Check if we got any results
-            if not table or len(table) == 0:
-                logger.info(f"Task {task_id} not found. Aborting...")
-                return response, table
+        # Check if we got any results
+        if not table or len(table) == 0:
+            logger.info(f"Task {task_id} not found. Aborting...")
+            return response, table
 
-            # Validate status
-            status = table[0].get("STATE", "unknown")
-            if status == "FAILED":
-                _error_msg = table[0].get("ERROR_MESSAGE", "")
-                logger.error(f"Task [{task_id}] failed with status [{status}] and error message: {_error_msg}")
-                return response, table
+        # Validate status
+        status = table[0].get("STATE", "unknown")
+        if status == "FAILED":
+            _error_msg = table[0].get("ERROR_MESSAGE", "")
+            logger.error(f"Task [{task_id}] failed with status [{status}] and error message: {_error_msg}")
+        else:
+            logger.info(f"Task [{task_id}] finished with status [{status}]")
 
-            elif status in ["SUCCESS", "MERGED", "unknown"]:
-                logger.info(f"Task [{task_id}] finished with status [{status}]")
-                return response, table
+        # Report the latency added by polling, to help tuning the poll delays
+        _latency = _pending_task.polling_latency
+        if _latency is not None:
+            _latency = round(_latency, 3)
+            logger.debug(f"Task [{task_id}] polling added ~{_latency} seconds of latency")
 
-            # Compute next delay
-            poll_delay = min(MAX_POLL_DELAY, 2 ** _attempts)
-            _attempts += 1
+        return StarRocksAdapterResponse(
+            _message=response._message,
+            code=response.code,
+            rows_affected=response.rows_affected,
+            task_id=task_id,
+            task_state=status,
+            polling_latency=_latency,
+        ), table
 
-            # Notify end user
-            progress = table[0].get("PROGRESS", "unknown")
-            logger.info(f"Task {task_id} progress [{progress}]. Waiting {poll_delay} seconds...")
+    def _task_id_prefix(self, relation_name: Optional[str]) -> Optional[str]:
+        """
+        Computes the prefix of the deterministic IDs of the tasks writing a relation, for the current node.
 
-            # Close connection before sleeping to avoid stale connections
-            self.connections.close(_connection)
-            time.sleep(poll_delay)
+        :return: The prefix, or None if the run is not resumable (`async_resume_key` is not set).
+        """
+        resume_key = self.config.credentials.async_resume_key
+        node_id = get_node_info().get("unique_id")
+        if not resume_key or not node_id or not relation_name:
+            return None
+        return task_id_prefix(resume_key, node_id, relation_name)
+
+    @staticmethod
+    def _relation_exists(relation_name: str, run_sql: Callable[..., SQLQueryResult]) -> bool:
+        *_, schema, table = relation_name.split(".")
+        _, result = run_sql(sql=RELATION_EXISTS_TEMPLATE.format(schema=schema, table=table), fetch=True)
+        return len(result) > 0
+
+    def _find_resumable_task(
+            self,
+            sql: str,
+            run_sql: Callable[..., SQLQueryResult],
+            statement: Optional[Statement] = None,
+    ) -> Tuple[str, Optional["agate.Row"]]:
+        """
+        Computes the ID of the task to submit, and looks for a previous attempt of it worth resuming.
+
+        Without `async_resume_key`, task IDs are random and nothing is resumed. Otherwise, the ID is derived
+        from the resume key, the node, the target relation and the statement. A task submitted with the same ID
+        by a previous attempt is resumed if it's still running, or if it succeeded and its relation still exists.
+        Tasks dropped since (e.g. by `release_resumable_tasks` once their output got published) are not resumed.
+        Other previous attempts get dropped, to reuse their ID.
+
+        :param sql: The statement to submit.
+        :param run_sql: Callable executing queries on the thread connection.
+        :param statement: The classified statement writing the same relation, classified from `sql` if omitted.
+        :return: A tuple of the task ID and the `task_runs` row of the task to resume (None to submit it).
+        """
+        target = (statement or classify_statement(sql)).target_name
+        prefix = self._task_id_prefix(target)
+        if prefix is None:
+            return str(uuid.uuid4()).replace('-', ''), None
+
+        task_id = resumable_task_id(prefix, sql)
+        _, result = run_sql(sql=FIND_TASK_RUN_TEMPLATE.format(task_id=task_id), fetch=True)
+        if len(result) == 0:
+            return task_id, None
+
+        task_run = result[0]
+        state = task_run.get("STATE", "unknown")
+        if state in RESUMABLE_STATES and (state not in FINISHED_OK_STATES or self._relation_exists(target, run_sql)):
+            return task_id, task_run
+
+        logger.info(f"Task [{task_id}] of a previous attempt can't be resumed (state [{state}]), submitting it again")
+        try:
+            run_sql(sql=DROP_TASK_TEMPLATE.format(task_id=task_id))
+        except Exception as e:
+            logger.debug(f"Could not drop task [{task_id}] of a previous attempt: '{e}'")
+        return task_id, None
+
+    @available
+    def has_resumable_task(self, relation: StarRocksRelation) -> bool:
+        """
+        Evaluates if a previous attempt of the current node submitted a task writing `relation` that can be resumed.
+
+        Used to keep such relations instead of dropping them before building the node again.
+
+        :param relation: The relation about to be dropped.
+        :return: True if the relation is written by a running or succeeded task of a previous attempt.
+        """
+        if not self.config.credentials.is_async:
+            return False
+
+        prefix = self._task_id_prefix(normalize_relation_name(f"{relation.schema}.{relation.identifier}"))
+        if prefix is None:
+            return False
+
+        states = ", ".join(f"'{state}'" for state in RESUMABLE_STATES)
+        _, result = self.execute(FIND_RESUMABLE_TASK_RUNS_TEMPLATE.format(prefix=prefix, states=states), fetch=True)
+        return len(result) > 0
+
+    @available
+    def release_resumable_tasks(self, relation: StarRocksRelation) -> List[str]:
+        """
+        Drops the tasks of the current node writing `relation`, so that later attempts don't resume them.
+
+        Meant to be called right before the output of the tasks gets published (e.g. swapped into the target
+        relation), after which `relation` doesn't hold it anymore.
+
+        :param relation: The relation written by the tasks.
+        :return: The IDs of the dropped tasks.
+        """
+        if not self.config.credentials.is_async:
+            return []
+
+        prefix = self._task_id_prefix(normalize_relation_name(f"{relation.schema}.{relation.identifier}"))
+        if prefix is None:
+            return []
+
+        _, result = self.execute(FIND_TASKS_TEMPLATE.format(prefix=prefix), fetch=True)
+        task_ids = [row[0] for row in result]
+        for task_id in task_ids:
+            self.execute(DROP_TASK_TEMPLATE.format(task_id=task_id))
+        if task_ids:
+            logger.debug(f"Released the resumable tasks writing {relation}: {', '.join(task_ids)}")
+        return task_ids
 
     def _execute_async_task(
             self,
@@ -159,7 +450,8 @@ class StarRocksAdapter(SQLAdapter):
             auto_begin: bool = False,
             fetch: bool = False,
             limit: Optional[int] = None,
-            pre_create_handler: Optional[PreCreateSQLAdapter] = None
+            pre_create_handler: Optional[PreCreateSQLAdapter] = None,
+            statement: Optional[Statement] = None,
     ) -> SQLQueryResult:
         """
         Executes an SQL statement asynchronously and wait for completion.
@@ -169,22 +461,44 @@ class StarRocksAdapter(SQLAdapter):
             transaction, automatically begin one.
         :param bool fetch: If set, fetch results.
         :param Optional[int] limit: If set, only fetch n number of rows
+        :param Optional[Statement] statement: The classified statement, classified from `sql` if omitted.
         :return: A tuple of the query status and results (empty if fetch=False).
         :rtype: Tuple[AdapterResponse, "agate.Table"]
         """
-        _task_id = str(uuid.uuid4()).replace('-', '')
         _timeout = self.config.credentials.async_query_timeout
         _run_sql = partial(super().execute, auto_begin=auto_begin, fetch=fetch, limit=limit)
 
-        _submit_statement = sql
-        if pre_create_handler:
+        _submit_statement = pre_create_handler.insert_statement if pre_create_handler else sql
+        _task_id, _task_run = self._find_resumable_task(_submit_statement, _run_sql, statement)
+
+        if _task_run is not None:
+            _state = _task_run.get("STATE", "unknown")
+            if _state in FINISHED_OK_STATES:
+                logger.info(f"Task [{_task_id}] already finished with status [{_state}] in a previous attempt, reusing it")
+                return StarRocksAdapterResponse(
+                    _message=_state, code="SUCCESS", task_id=_task_id, task_state=_state
+                ), agate.Table([])
+
+            logger.info(f"Task [{_task_id}] of a previous attempt is still [{_state}], waiting for it")
+
+        elif pre_create_handler:
             logger.info(f"Pre-creating table `{pre_create_handler.db_name}`.`{pre_create_handler.table_name}`...")
             _run_sql(sql=pre_create_handler.create_statement)
-            _submit_statement = pre_create_handler.insert_statement
 
-        _submit_sql = SUBMIT_TASK_TEMPLATE.format(timeout=_timeout, task_id=_task_id, sql=_submit_statement)
-        _run_sql(sql=_submit_sql)
-        return self._poll_for_complete_task(_task_id)
+        with self._inflight_task_slot():
+            if _task_run is None:
+                _run_sql(sql=SUBMIT_TASK_TEMPLATE.format(timeout=_timeout, task_id=_task_id, sql=_submit_statement))
+            try:
+                return self._poll_for_complete_task(_task_id)
+            except TaskCancelledError as e:
+                if e.orphan:
+                    self._drop_orphan_task(_task_id, lambda drop_sql: _run_sql(sql=drop_sql))
+                raise
+            except KeyboardInterrupt:
+                # The task would keep running on the cluster without anyone waiting for it. Other errors (e.g. a
+                # failed poll) leave it running, to be resumed by the next attempt
+                self._drop_orphan_task(_task_id, lambda drop_sql: _run_sql(sql=drop_sql))
+                raise
 
     def _execute_sync_task(
         self,
@@ -231,7 +545,9 @@ class StarRocksAdapter(SQLAdapter):
 
         Only if the adapter is configured to be async:
         - it will intercept the original SQL statement and prefix it with a `submit task` statement if the SQL is a submittable ETL
-        - it will then poll the task status until the task is completed using basic exponential backoff
+        - it will then wait for the task to complete, polled by the adapter-wide task poller with delays adapting to
+          the progress reported by StarRocks (see `TaskPoller`)
+        - the task ID, its final state and the latency added by polling are reported in the adapter response
 
         :param str sql: The sql to execute.
         :param bool auto_begin: If set, and dbt is not currently inside a
@@ -241,17 +557,23 @@ class StarRocksAdapter(SQLAdapter):
         :return: A tuple of the query status and results (empty if fetch=False).
         :rtype: Tuple[AdapterResponse, "agate.Table"]
         """
+        # Classified once, as only the leading tokens of the statement matter from here on
+        statement = classify_statement(sql)
         pc_handler = create_adapter(
             sql=sql,
             project_root=self.config.project_root,
             model_paths=self.config.model_paths,
             models=self.config.models,
+            templates=self._pre_create_templates,
+            statement=statement,
         )
 
-        _is_async = not self.config.credentials.is_async or not self._is_submittable_etl(sql)
-        _exec_fct: Callable = self._execute_sync_task if _is_async else self._execute_async_task
+        _is_async = not self.config.credentials.is_async or not self._is_submittable_etl(sql, statement)
+        _exec_fct: Callable = (
+            self._execute_sync_task if _is_async else partial(self._execute_async_task, statement=statement)
+        )
 
-        return _exec_fct(
+        response, table = _exec_fct(
             sql=sql,
             auto_begin=auto_begin,
             fetch=fetch,
@@ -259,6 +581,585 @@ class StarRocksAdapter(SQLAdapter):
             pre_create_handler=pc_handler,
         )
 
+        # Report the partitions written by `INSERT ... PARTITION (...)` statements in the run results
+        _partitions = statement.partitions
+        if _partitions:
+            response = self._with_partitions(response, list(_partitions))
+        return response, table
+
+    @staticmethod
+    def _with_partitions(response: AdapterResponse, partitions: List[str]) -> StarRocksAdapterResponse:
+        if isinstance(response, StarRocksAdapterResponse):
+            return dataclasses.replace(response, partitions=partitions)
+        return StarRocksAdapterResponse(
+            _message=response._message,
+            code=response.code,
+            rows_affected=response.rows_affected,
+            query_id=response.query_id,
+            partitions=partitions,
+        )
+
+    @available
+    def report_deleted_rows(self, delete_response: AdapterResponse, response: AdapterResponse) -> StarRocksAdapterResponse:
+        """
+        Reports the rows deleted by a `DELETE` statement in the response of the following `INSERT`
+        (e.g. for the `delete+insert` and `merge` strategies).
+
+        :param delete_response: The response of the `DELETE` statement.
+        :param response: The response of the `INSERT` statement.
+        :return: The response of the `INSERT` statement, with `rows_deleted` and `rows_inserted`.
+        """
+        if not isinstance(response, StarRocksAdapterResponse):
+            response = StarRocksAdapterResponse(
+                _message=response._message,
+                code=response.code,
+                rows_affected=response.rows_affected,
+                query_id=response.query_id,
+            )
+        return dataclasses.replace(
+            response, rows_deleted=delete_response.rows_affected, rows_inserted=response.rows_affected
+        )
+
+    @available
+    def materialized_view_comment(
+        self,
+        sql: str,
+        partition_by: Optional[List[str]],
+        distributed_by: Optional[List[str]],
+        buckets: Optional[int],
+        description: Optional[str] = None,
+    ) -> str:
+        """
+        Computes the comment of a materialized view: its description, followed by the hash of its definition.
+
+        :param description: The description of the model, when `persist_docs` is enabled for relations.
+        """
+        return definition_comment(definition_hash(sql, partition_by, distributed_by, buckets), description)
+
+    @available
+    def get_materialized_view_changes(
+        self,
+        relation: StarRocksRelation,
+        sql: str,
+        partition_by: Optional[List[str]],
+        distributed_by: Optional[List[str]],
+        buckets: Optional[int],
+        refresh: Optional[str],
+        properties: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Compares a deployed materialized view with its model.
+
+        The query, partitioning and distribution are compared through the hash stored in the comment of the view
+        (or, for views created before hashes got stored, with their definition from `SHOW CREATE MATERIALIZED VIEW`),
+        the refresh scheme and properties through `SHOW CREATE MATERIALIZED VIEW`.
+
+        :return: None if nothing changed, otherwise the changes (see `configuration_changes`).
+        """
+        _, table = self.execute(SHOW_CREATE_MATERIALIZED_VIEW_TEMPLATE.format(relation=relation), fetch=True)
+        deployed = parse_create_materialized_view(table[0][1] if len(table) > 0 else "")
+        changes = configuration_changes(deployed, sql, partition_by, distributed_by, buckets, refresh, properties)
+        if changes is not None and changes["rebuild"]:
+            expected_hash = definition_hash(sql, partition_by, distributed_by, buckets)
+            logger.debug(f"Definition of {relation} changed ({deployed.definition_hash} -> {expected_hash})")
+        return changes
+
+    @available
+    def refresh_materialized_view(
+        self,
+        relation: Any,
+        start: Any = None,
+        end: Any = None,
+        force: bool = False,
+    ) -> StarRocksAdapterResponse:
+        """
+        Refreshes a materialized view, or a range of its partitions, and waits for the refresh to finish.
+
+        The refresh task run is polled by the task poller, like submitted tasks.
+
+        :param relation: The materialized view.
+        :param start: The start of the partition range to refresh (inclusive), None for all partitions.
+        :param end: The end of the partition range to refresh (exclusive), None for all partitions.
+        :param force: Whether to refresh partitions whose base data didn't change.
+        :return: The response, with the state of the refresh task run.
+        :raises dbt.exceptions.DbtRuntimeError: If the refresh failed.
+        """
+        try:
+            sql = refresh_statement(str(relation), start, end, force)
+        except ValueError as e:
+            raise dbt.exceptions.DbtRuntimeError(str(e))
+
+        _, table = self.execute(sql, fetch=True)
+        query_id = table[0][0]
+        logger.info(f"Refreshing {relation} (task run [{query_id}])...")
+        try:
+            response, task_runs = self._poll_for_complete_task(query_id, QUERY_ID_COLUMN)
+        except TaskCancelledError:
+            self._drop_orphan_refresh(str(relation))
+            raise
+
+        state = task_runs[0].get("STATE", "unknown") if len(task_runs) > 0 else "unknown"
+        if state not in FINISHED_OK_STATES:
+            message = task_runs[0].get("ERROR_MESSAGE", "") if len(task_runs) > 0 else "task run not found"
+            raise dbt.exceptions.DbtRuntimeError(f"Refresh of {relation} finished with status [{state}]: {message}")
+        return response
+
+    def _drop_orphan_refresh(self, relation: str) -> None:
+        try:
+            self._run_on_connection(TASK_CANCEL_CONNECTION_NAME, CANCEL_REFRESH_MATERIALIZED_VIEW_TEMPLATE.format(relation=relation))
+        except Exception as e:
+            logger.warning(f"Could not cancel the refresh of {relation}, it will run until it finishes: {e}")
+
+    def _refresh_on_connection(self, relation: str, start: Any, end: Any, force: bool) -> StarRocksAdapterResponse:
+        self.connections.set_connection_name(REFRESH_CONNECTION_NAME.format(relation=normalize_relation_name(relation)))
+        try:
+            return self.refresh_materialized_view(relation, start, end, force)
+        finally:
+            self.connections.release()
+
+    @available
+    def refresh_materialized_views(
+        self,
+        views: Dict[str, str],
+        depends_on: Dict[str, List[str]],
+        start: Any = None,
+        end: Any = None,
+        force: bool = False,
+        parallelism: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Refreshes materialized views in dependency order: a view is refreshed once the views it depends on
+        (directly or through other nodes) got refreshed. Independent views are refreshed in parallel,
+        each on its own connection.
+
+        :param views: The relation name of each materialized view, by node ID.
+        :param depends_on: The nodes each node of the project depends on, by node ID.
+        :param start: The start of the partition range to refresh (inclusive), None for all partitions.
+        :param end: The end of the partition range to refresh (exclusive), None for all partitions.
+        :param force: Whether to refresh partitions whose base data didn't change.
+        :param parallelism: The maximum number of views refreshed at once, defaults to the number of threads.
+        :return: The outcome of each view (`success` or `skipped`), by relation name.
+        :raises dbt.exceptions.DbtRuntimeError: If some refreshes failed.
+        """
+        dependencies = upstream_materialized_views(depends_on, views)
+        context = contextvars.copy_context()
+
+        def _refresh(node_id: str) -> StarRocksAdapterResponse:
+            return context.copy().run(self._refresh_on_connection, views[node_id], start, end, force)
+
+        outcomes = run_in_dependency_order(dependencies, _refresh, parallelism or self.config.threads)
+
+        summary = {views[node_id]: status for node_id, (status, _) in outcomes.items()}
+        errors = {views[node_id]: error for node_id, (status, error) in outcomes.items() if status == REFRESH_ERROR}
+        logger.info(
+            f"Refreshed {sum(status == REFRESH_SUCCESS for status in summary.values())}/{len(summary)} materialized views"
+        )
+        if errors:
+            details = "\n".join(f"- {relation}: {error}" for relation, error in errors.items())
+            raise dbt.exceptions.DbtRuntimeError(f"Some materialized views could not be refreshed:\n{details}")
+        return summary
+
+    @available
+    def get_range_partitions(self, relation: StarRocksRelation) -> Optional[RangePartitions]:
+        """
+        Lists the partitions of a table partitioned by range on a single column.
+
+        :param relation: The table.
+        :return: The partitions sorted by range, or None if the table isn't partitioned this way
+            (e.g. not partitioned, list or multi-column partitions).
+        """
+        _, table = self.execute(SHOW_PARTITIONS_TEMPLATE.format(relation=relation), fetch=True)
+        return range_partitions_from_rows(table)
+
+    @available
+    def get_overwrite_partitions(self, range_partitions: RangePartitions, source: str) -> Optional[List[RangePartition]]:
+        """
+        Computes the partitions to overwrite with the rows of `source`, from the min/max of the partition column.
+
+        :param range_partitions: The partitions of the target table, from `get_range_partitions`.
+        :param source: The relation or subquery holding the rows to write.
+        :return: The partitions (empty if `source` is empty), or None if some rows may not fall into
+            an existing partition.
+        """
+        _, table = self.execute(
+            PARTITION_BOUNDS_TEMPLATE.format(column=self.quote(range_partitions.column), source=source), fetch=True
+        )
+        min_value, max_value = table[0][0], table[0][1]
+        partitions = range_partitions.select(min_value, max_value)
+        if partitions is None:
+            logger.warning(
+                f"Values of `{range_partitions.column}` between {min_value} and {max_value} "
+                f"don't all fall into existing partitions, they can't be overwritten by partition"
+            )
+        else:
+            logger.debug(f"Partitions to overwrite: {', '.join(p.name for p in partitions) or 'none'}")
+        return partitions
+
+    @available
+    def get_batch_partitions(
+        self,
+        relation: StarRocksRelation,
+        event_time: str,
+        event_time_start: Any,
+        event_time_end: Any,
+    ) -> List[RangePartition]:
+        """
+        Computes the partitions written by a microbatch.
+
+        :param relation: The target table, partitioned by range on `event_time`.
+        :param event_time: The `event_time` column of the model.
+        :param event_time_start: The start of the batch (inclusive).
+        :param event_time_end: The end of the batch (exclusive).
+        :return: The partitions holding exactly the batch, empty if they don't exist yet.
+        :raises dbt.exceptions.DbtRuntimeError: If the batch can't be mapped to partitions.
+        """
+        range_partitions = self.get_range_partitions(relation)
+        if range_partitions is None or normalize_relation_name(range_partitions.column) != normalize_relation_name(event_time):
+            raise dbt.exceptions.DbtRuntimeError(
+                f"[microbatch] requires {relation} to be partitioned by range on its event_time `{event_time}`"
+            )
+
+        partitions = range_partitions.window(event_time_start, event_time_end)
+        if partitions is None:
+            raise dbt.exceptions.DbtRuntimeError(
+                f"[microbatch] batch [{event_time_start}, {event_time_end}) doesn't match the partitions of {relation}, "
+                f"which must hold whole batches (e.g. partition by `date_trunc('<batch_size>', {event_time})`)"
+            )
+        return partitions
+
+    def _execute_on_connection(self, name: str, sql: str) -> AdapterResponse:
+        """
+        Executes a statement on a connection of its own, from a worker thread of the running node.
+        """
+        self.connections.set_connection_name(name)
+        try:
+            response, _ = self.execute(sql)
+            return response
+        finally:
+            self.connections.release()
+
+    @available
+    def insert_overwrite_partitions(
+        self,
+        relation: StarRocksRelation,
+        source: str,
+        dest_columns: List[StarRocksColumn],
+        range_partitions: RangePartitions,
+        partitions: List[RangePartition],
+        parallelism: int,
+    ) -> StarRocksAdapterResponse:
+        """
+        Overwrites partitions with `INSERT OVERWRITE ... PARTITION` statements running in parallel,
+        each on its own connection and writing a contiguous group of partitions.
+
+        Each statement is atomic, but they are not as a whole: when one fails, the groups overwritten by the
+        others are not rolled back. The error lists the partitions holding the new rows and the other ones.
+
+        :param relation: The target table.
+        :param source: The relation holding the rows to write, visible from other sessions.
+        :param dest_columns: The columns to write.
+        :param range_partitions: The partitions of the target table, from `get_range_partitions`.
+        :param partitions: The contiguous partitions to overwrite, from `get_overwrite_partitions`.
+        :param parallelism: The maximum number of statements running at once.
+        :return: The combined response of the statements.
+        :raises dbt.exceptions.DbtRuntimeError: If a statement failed, once all the statements are over.
+        """
+        column = self.quote(range_partitions.column)
+        columns = ", ".join(self.quote(c.name) for c in dest_columns)
+        groups = group_partitions(partitions, parallelism)
+
+        statements = []
+        for index, group in enumerate(groups):
+            # All rows fall into the partitions, only the bounds between groups are needed
+            conditions = []
+            if index > 0:
+                conditions.append(f"{column} >= {partition_literal(group[0].lower_key, range_partitions.column_type)}")
+            if index < len(groups) - 1:
+                conditions.append(f"{column} < {partition_literal(group[-1].upper_key, range_partitions.column_type)}")
+            statements.append(INSERT_OVERWRITE_PARTITIONS_TEMPLATE.format(
+                relation=relation,
+                partitions=", ".join(self.quote(p.name) for p in group),
+                columns=columns,
+                source=source,
+                where=f" where {' and '.join(conditions)}" if conditions else "",
+            ))
+
+        logger.info(f"Overwriting {len(partitions)} partitions of {relation} with {len(statements)} statements...")
+        with ThreadPoolExecutor(max_workers=len(statements)) as pool:
+            futures = {
+                pool.submit(
+                    contextvars.copy_context().run,
+                    self._execute_on_connection,
+                    OVERWRITE_CONNECTION_NAME.format(index=index),
+                    statement,
+                ): index
+                for index, statement in enumerate(statements)
+            }
+            responses: Dict[int, AdapterResponse] = {}
+            errors: Dict[int, Exception] = {}
+            for future in as_completed(futures):
+                try:
+                    responses[futures[future]] = future.result()
+                except Exception as e:
+                    errors[futures[future]] = e
+
+        if errors:
+            overwritten = [p.name for index in sorted(responses) for p in groups[index]]
+            failed = [p.name for index in sorted(errors) for p in groups[index]]
+            # dbt errors render with a header of their own
+            reason = getattr(errors[min(errors)], "msg", errors[min(errors)])
+            raise dbt.exceptions.DbtRuntimeError(
+                f"Failed to overwrite partitions {', '.join(failed)} of {relation}: {reason}\n"
+                f"Partitions {', '.join(overwritten) or 'none'} were overwritten and hold the new rows, "
+                f"the failed ones still hold the previous rows. Run the model again to overwrite all of them."
+            )
+
+        responses = list(responses.values())
+        rows_affected = sum(r.rows_affected for r in responses if r.rows_affected and r.rows_affected > 0)
+        return StarRocksAdapterResponse(
+            _message=f"INSERT OVERWRITE {len(partitions)} partitions",
+            code="SUCCESS",
+            rows_affected=rows_affected,
+            partitions=[p.name for p in partitions],
+        )
+
+    @available
+    def stream_query(
+        self,
+        sql: str,
+        limit: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        arrow: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Executes a query and lazily yields its rows, without loading the whole result in memory.
+
+        Usable from macros, e.g. `{% for row in adapter.stream_query(sql, limit=1000) %}`.
+
+        :param str sql: The query to execute.
+        :param Optional[int] limit: If set, only yield n number of rows
+        :param Optional[int] chunk_size: Number of rows fetched at once, defaults to `fetch_chunk_size`.
+        :param bool arrow: Fetch the rows through Arrow Flight SQL (requires `arrow_flight_port`).
+        :return: A generator of rows, as dictionaries keyed by column name.
+        """
+        return self.connections.stream(sql, limit=limit, chunk_size=chunk_size, arrow=arrow)
+
+    @available
+    def fetch_arrow(self, sql: str) -> "pyarrow.Table":
+        """
+        Executes a query through Arrow Flight SQL (requires `arrow_flight_port`).
+
+        :param str sql: The query to execute.
+        :return: The results, as an Arrow table made of the record batches sent by the server.
+        """
+        return self.connections.fetch_arrow(sql)
+
+    @available
+    def stream_load_enabled(self) -> bool:
+        """
+        Evaluates if Stream Load is enabled, i.e. `stream_load_port` is set.
+        """
+        return bool(self.config.credentials.stream_load_port)
+
+    @staticmethod
+    def _stream_load_response(results: List[StreamLoadResult]) -> StarRocksAdapterResponse:
+        report = LoadReport.from_results(results)
+        if report.rows_filtered:
+            logger.warning(f"Stream Load filtered out {report.rows_filtered} rows, see {', '.join(report.error_urls)}")
+        return StarRocksAdapterResponse(
+            _message=f"STREAM LOAD {report.rows_loaded}", code="STREAM LOAD", rows_affected=report.rows_loaded,
+        )
+
+    def _insert_rows(
+        self,
+        relation: StarRocksRelation,
+        columns: List[str],
+        rows: Iterator[Tuple[Any, ...]],
+        label_prefix: str,
+    ) -> Tuple[int, List[str]]:
+        # Batches of `INSERT ... VALUES` with bound parameters, when Stream Load is disabled. Like Stream Load chunks,
+        # each batch is labelled `{label_prefix}_{index}`, so that a batch sent again is only loaded once
+        placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        rows_loaded = 0
+        labels = []
+        for index in itertools.count():
+            batch = list(itertools.islice(rows, INSERT_BATCH_SIZE))
+            if not batch:
+                return rows_loaded, labels
+            label = make_label(label_prefix, index)
+            sql = (
+                f"insert into {relation.render()} with label `{label}` ({', '.join(columns)}) values "
+                + ", ".join([placeholders] * len(batch))
+            )
+            try:
+                self.connections.add_query(sql, bindings=[v for row in batch for v in row], abridge_sql_log=True)
+            except DbtDatabaseError as e:
+                if LABEL_ALREADY_USED not in str(e):
+                    raise
+                logger.info(f"Batch {label} was already loaded, skipping it")
+            rows_loaded += len(batch)
+            labels.append(label)
+
+    @available
+    def stream_load_seed(self, relation: StarRocksRelation, agate_table: agate.Table) -> StarRocksAdapterResponse:
+        """
+        Loads the rows of a seed with Stream Load, `stream_load_chunk_size` rows per load.
+
+        Each chunk is labelled after the seed, the dbt invocation and its index, so that a chunk sent again
+        after a connection error is only loaded once.
+
+        :param relation: The seed table.
+        :param agate_table: The rows of the seed.
+        :return: The response, with the number of rows loaded.
+        """
+        column_names = list(agate_table.column_names)
+        loader = self.connections.stream_loader(relation.schema, relation.identifier, columns=column_names)
+        chunks = json_chunks(agate_table.rows, column_names, self.config.credentials.stream_load_chunk_size)
+        label_prefix = make_label("dbt_seed", relation.schema, relation.identifier, get_invocation_id())
+        return self._stream_load_response(loader.load_chunks(chunks, label_prefix))
+
+    @available
+    def get_seed_file_hash(self, model: Any) -> Optional[str]:
+        """
+        Hashes the CSV file of a seed, along with its `column_types` and `delimiter`.
+
+        :param model: The seed node.
+        :return: The hash, or None if the file can't be found.
+        """
+        path = self._seed_path(model)
+        if not os.path.exists(path):
+            return None
+        config = model["config"]
+        return seed_hash(path, config.get("column_types"), config.get("delimiter"))
+
+    @staticmethod
+    def _seed_path(model: Any) -> str:
+        return os.path.join(model["root_path"], model["original_file_path"])
+
+    @available
+    def load_seed_sample(self, model: Any) -> agate.Table:
+        """
+        Reads the first `seed_sample_size` rows of a seed, which its column types get inferred from.
+
+        :param model: The seed node.
+        :return: The sampled rows.
+        """
+        config = model["config"]
+        return read_seed_sample(
+            self._seed_path(model),
+            config.get("column_types"),
+            config.get("delimiter"),
+            config.get("seed_sample_size") or DEFAULT_SAMPLE_SIZE,
+        )
+
+    @available
+    def stream_seed_file(
+        self, relation: StarRocksRelation, model: Any, sample: agate.Table,
+    ) -> StarRocksAdapterResponse:
+        """
+        Loads a seed file one chunk of rows at a time, without reading it whole in memory.
+
+        Rows go through Stream Load if enabled, otherwise through batched `INSERT ... VALUES` statements.
+
+        :param relation: The seed table.
+        :param model: The seed node.
+        :param sample: The sample of the seed, from `load_seed_sample`.
+        :return: The response, with the number of rows loaded.
+        """
+        config = model["config"]
+        column_names = list(sample.column_names)
+        rows = iter_seed_rows(self._seed_path(model), sample, config.get("delimiter"))
+
+        if self.stream_load_enabled():
+            loader = self.connections.stream_loader(relation.schema, relation.identifier, columns=column_names)
+            chunks = json_chunks(rows, column_names, self.config.credentials.stream_load_chunk_size)
+            label_prefix = make_label("dbt_seed", relation.schema, relation.identifier, get_invocation_id())
+            return self._stream_load_response(loader.load_chunks(chunks, label_prefix))
+
+        quote_columns = config.get("quote_columns")
+        columns = [self.quote_seed_column(c, quote_columns) for c in column_names]
+        label_prefix = make_label("dbt_seed", relation.schema, relation.identifier, get_invocation_id())
+        rows_loaded, _ = self._insert_rows(relation, columns, rows, label_prefix)
+        return StarRocksAdapterResponse(_message=f"INSERT {rows_loaded}", code="INSERT", rows_affected=rows_loaded)
+
+    @available
+    def bulk_load(
+        self,
+        relation: StarRocksRelation,
+        data: Any,
+        format: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        parallelism: int = 1,
+        label: Optional[str] = None,
+        properties: Optional[Dict[str, Any]] = None,
+        delimiter: str = ",",
+        chunk_size: Optional[int] = None,
+    ) -> LoadReport:
+        """
+        Loads rows or a file into a table, through Stream Load if enabled, otherwise through batched
+        `INSERT ... VALUES` statements with bound parameters, one after the other.
+
+        Usable from macros, e.g. `{% set report = adapter.bulk_load(ref('audit'), rows) %}`.
+
+        :param relation: The table to load into.
+        :param data: The path of a CSV, JSON (array or newline-delimited) or Parquet file, an agate table,
+            or a list of rows: mappings, or sequences along with `columns`.
+        :param format: The format of the file (`csv`, `json` or `parquet`), inferred from its extension by default.
+        :param columns: The columns to load, all the columns of the data by default.
+        :param parallelism: The maximum number of chunks loaded at once with Stream Load, ignored by `INSERT`.
+        :param label: The prefix of the labels, `{label}_{index}` for each chunk (or `INSERT` batch). Loading
+            with the same label again doesn't load chunks already loaded. Unique to each call by default.
+        :param properties: Additional Stream Load headers (e.g. `max_filter_ratio`, `where`).
+        :param delimiter: The delimiter of CSV files.
+        :param chunk_size: The number of rows per chunk, `stream_load_chunk_size` by default.
+        :return: The report of the load.
+        """
+        column_names, rows = iter_source_rows(data, format, columns, delimiter)
+        if not column_names:
+            return LoadReport(method=STREAM_LOAD_METHOD if self.stream_load_enabled() else INSERT_METHOD)
+
+        label_prefix = label or make_label(
+            "dbt_load", relation.schema, relation.identifier, get_invocation_id(), uuid.uuid4().hex[:8],
+        )
+        if self.stream_load_enabled():
+            loader = self.connections.stream_loader(
+                relation.schema, relation.identifier, columns=column_names, properties=properties,
+            )
+            chunks = json_chunks(rows, column_names, chunk_size or self.config.credentials.stream_load_chunk_size)
+            report = LoadReport.from_results(loader.load_chunks(chunks, label_prefix, parallelism))
+            if report.rows_filtered:
+                logger.warning(
+                    f"Stream Load filtered out {report.rows_filtered} rows, see {', '.join(report.error_urls)}"
+                )
+            return report
+
+        start = time.monotonic()
+        rows_loaded, labels = self._insert_rows(relation, [self.quote(c) for c in column_names], rows, label_prefix)
+        return LoadReport(
+            method=INSERT_METHOD,
+            rows_loaded=rows_loaded,
+            load_time_ms=int((time.monotonic() - start) * 1000),
+            labels=tuple(labels),
+        )
+
+    @available
+    def get_seed_table_hash(self, relation: StarRocksRelation) -> Optional[str]:
+        """
+        Reads the hash of the CSV file a seed table got loaded from, stored in its comment.
+
+        :return: The hash, or None if the table has none.
+        """
+        _, table = self.execute(SEED_HASH_TEMPLATE.format(schema=relation.schema, table=relation.identifier), fetch=True)
+        return parse_seed_hash(table.rows[0][0]) if table.rows else None
+
+    @available
+    def set_seed_table_hash(self, relation: StarRocksRelation, file_hash: Optional[str]) -> None:
+        """
+        Stores the hash of the CSV file a seed table got loaded from in its comment, or clears it.
+        """
+        comment = f"{SEED_HASH_MARKER}{file_hash}" if file_hash else ""
+        self.execute(SET_TABLE_COMMENT_TEMPLATE.format(relation=relation.render(), comment=comment))
+
     @classmethod
     def date_function(cls) -> str:
         return "current_date()"
@@ -293,9 +1194,11 @@ class StarRocksAdapter(SQLAdapter):
     ) -> List[StarRocksRelation]:
         kwargs = {"schema_relation": schema_relation}
         results = self.execute_macro(LIST_RELATIONS_MACRO_NAME, kwargs=kwargs)
+        return self._relations_from_rows(results)
 
+    def _relations_from_rows(self, rows: agate.Table) -> List[StarRocksRelation]:
         relations = []
-        for row in results:
+        for row in rows:
             if len(row) != 4:
                 raise dbt.exceptions.DbtRuntimeError(
                     f"Invalid value from 'show table extended ...', "
@@ -312,6 +1215,43 @@ class StarRocksAdapter(SQLAdapter):
 
         return relations
 
+    def _list_relations_in_schemas(self, schemas: List[str]) -> List[StarRocksRelation]:
+        results = self.execute_macro(LIST_RELATIONS_IN_SCHEMAS_MACRO_NAME, kwargs={"schemas": schemas})
+        return self._relations_from_rows(results)
+
+    @staticmethod
+    def _schema_chunks(cache_schemas: Iterable[BaseRelation], size: int) -> List[List[str]]:
+        schemas = sorted({relation.schema for relation in cache_schemas if relation.schema})
+        return [schemas[i:i + size] for i in range(0, len(schemas), size)]
+
+    @override
+    def _relations_cache_for_schemas(
+        self,
+        relation_configs: Iterable[RelationConfig],
+        cache_schemas: Optional[Set[BaseRelation]] = None,
+    ) -> None:
+        """
+        Fills the relation cache with the relations of all the schemas at once, instead of one query per schema:
+        each query lists the relations of up to `RELATIONS_CACHE_CHUNK_SIZE` schemas (`table_schema in (...)`).
+        """
+        if not cache_schemas:
+            cache_schemas = self._get_cache_schemas(relation_configs)
+
+        chunks = self._schema_chunks(cache_schemas, RELATIONS_CACHE_CHUNK_SIZE)
+        with executor(self.config) as tpe:
+            futures = [
+                tpe.submit_connected(
+                    self, f"list_relations_in_schemas_{index}", self._list_relations_in_schemas, chunk,
+                )
+                for index, chunk in enumerate(chunks)
+            ]
+            for future in as_completed(futures):
+                for relation in future.result():
+                    self.cache.add(relation)
+
+        # Schemas without relations are cached as well
+        self.cache.update_schemas({(relation.database, relation.schema) for relation in cache_schemas if relation.schema})
+
     def get_catalog(self, manifest, used_schemas):
         schema_map = self._get_catalog_schemas(manifest)
         if len(schema_map) > 1:
@@ -352,25 +1292,41 @@ class StarRocksAdapter(SQLAdapter):
         )
         return table.where(_catalog_filter_schemas(used_schemas))
 
+    def _server_version(self) -> Optional[Tuple[int, int, int]]:
+        credentials = self.config.credentials
+        server_version = self.connections.get_server_version(credentials)
+        if server_version is None:
+            conn = self.connections.get_if_exists()
+            if conn:
+                # Accessing the handle opens the connection, which detects the version
+                _ = conn.handle
+                server_version = self.connections.get_server_version(credentials)
+        return server_version
+
     @available
     def is_before_version(self, version: str) -> bool:
-        conn = self.connections.get_if_exists()
-        if conn:
-            server_version = conn.handle.server_version
-            server_version_tuple = tuple(server_version)
-            version_detail_tuple = tuple(
-                int(part) for part in version.split(".") if part.isdigit())
-            if version_detail_tuple > server_version_tuple:
+        server_version = self._server_version()
+        version_detail_tuple = parse_version(version)
+        if server_version and version_detail_tuple:
+            if version_detail_tuple > server_version:
                 return True
         return False
 
+    @available
+    def supports_temporary_tables(self) -> bool:
+        """
+        Evaluates if staging relations can be session temporary tables (StarRocks 3.3.1+).
+
+        In async mode, statements are submitted as tasks running in their own sessions, which can't share
+        temporary tables with the dbt connection.
+        """
+        return not self.config.credentials.is_async and not self.is_before_version("3.3.1")
+
     @available
     def current_version(self):
-        conn = self.connections.get_if_exists()
-        if conn:
-            server_version = conn.handle.server_version
-            if server_version != (999, 999, 999):
-                return "{}.{}.{}".format(server_version[0], server_version[1], server_version[2])
+        server_version = self._server_version()
+        if server_version and server_version != DEFAULT_VERSION:
+            return "{}.{}.{}".format(server_version[0], server_version[1], server_version[2])
         return 'UNKNOWN'
 
     def _get_one_catalog(
@@ -389,7 +1345,10 @@ class StarRocksAdapter(SQLAdapter):
 
     @override
     def valid_incremental_strategies(self):
-        return ["default", "insert_overwrite", "dynamic_overwrite"]
+        strategies = ["default", "insert_overwrite", "dynamic_overwrite", "merge", "delete+insert"]
+        if MICROBATCH_SUPPORTED:
+            strategies.append("microbatch")
+        return strategies
 
 
 def _catalog_filter_schemas(used_schemas: FrozenSet[Tuple[str, str]]) -> Callable[[agate.Row], bool]:
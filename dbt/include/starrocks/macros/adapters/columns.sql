@@ -44,6 +44,17 @@
 {% macro starrocks__sql_convert_columns_in_relation(relation, table, desc_table) -%}
   {% do relation.init_type_map(desc_table) %}
   {% set columns = [] %}
+  {#-- Session temporary tables are not listed in information_schema, only DESC knows them --#}
+  {% if table | length == 0 %}
+    {% for row in desc_table %}
+      {% if '<' in row[1] %}
+        {% do columns.append(api.Column(row[0], row[1])) %}
+      {%- else -%}
+        {% do columns.append(api.Column.from_description(row[0], row[1])) %}
+      {% endif %}
+    {% endfor %}
+    {{ return(columns) }}
+  {% endif %}
   {% for row in table %}
     -- rows[1] means type from information_schema
     {% if row[1] in ['array', 'struct', 'map'] %}
@@ -15,6 +15,11 @@
  */
 
 {% macro starrocks__list_relations_without_caching(schema_relation) -%}
+  {{ return(starrocks__list_relations_in_schemas([schema_relation.schema])) }}
+{%- endmacro %}
+
+{#-- Lists the relations of several schemas at once, e.g. to fill the relation cache --#}
+{% macro starrocks__list_relations_in_schemas(schemas) -%}
   {% call statement('list_relations_without_caching', fetch_result=True) %}
     select
       null as "database",
@@ -29,7 +34,7 @@
     left join information_schema.materialized_views mv
     on tbl.TABLE_SCHEMA = mv.TABLE_SCHEMA
     and tbl.TABLE_NAME = mv.TABLE_NAME
-    where tbl.table_schema = '{{ schema_relation.schema }}'
+    where tbl.table_schema in ('{{ schemas | join("', '") }}')
   {% endcall %}
   {{ return(load_result('list_relations_without_caching').table) }}
 {%- endmacro %}
@@ -97,3 +102,15 @@
     {%- endcall %}
     {{ return(load_result('list_schemas').table) }}
 {%- endmacro %}
+
+{#-- The model (e.g. `PRI_KEYS`, `DUP_KEYS`) and key columns of a table, none if it doesn't exist --#}
+{% macro starrocks__get_table_model(relation) -%}
+  {%- set result = run_query(
+      "select table_model, primary_key from information_schema.tables_config "
+      ~ "where table_schema = '" ~ relation.schema ~ "' and table_name = '" ~ relation.identifier ~ "'"
+  ) -%}
+  {%- if result | length == 0 -%}
+    {{ return(none) }}
+  {%- endif -%}
+  {{ return([result[0][0], (result[0][1] or '') | replace('`', '') | replace(' ', '') | lower]) }}
+{%- endmacro %}
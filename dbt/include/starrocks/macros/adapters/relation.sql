@@ -15,13 +15,18 @@
  */
 
 {% macro starrocks__drop_relation(relation) -%}
-  {% call statement('drop_relation', auto_begin=False) %}
-    {%- if relation.is_materialized_view -%}
-        drop materialized view if exists {{ relation }};
-    {%- else -%}
-        drop {{ relation.type }} if exists {{ relation }};
-    {%- endif -%}
-  {% endcall %}
+  {#-- Keep the relations written by tasks of a previous attempt, which will be resumed --#}
+  {%- if relation.is_table and adapter.has_resumable_task(relation) -%}
+    {{ log("Keeping " ~ relation ~ ", written by a resumable task of a previous attempt", info=True) }}
+  {%- else -%}
+    {% call statement('drop_relation', auto_begin=False) %}
+      {%- if relation.is_materialized_view -%}
+          drop materialized view if exists {{ relation }};
+      {%- else -%}
+          drop {{ relation.type }} if exists {{ relation }};
+      {%- endif -%}
+    {% endcall %}
+  {%- endif -%}
 {%- endmacro %}
 
 {% macro starrocks__rename_relation(from_relation, to_relation) -%}
@@ -35,6 +35,19 @@
     {%- set keys = unique_key if unique_key is sequence and unique_key is not mapping and unique_key is not string else [unique_key] -%}
   {%- endif -%}
 
+  {#-- PRIMARY KEY snapshots are keyed on the snapshot row ID, to be updated with upserts --#}
+  {%- if materialized == 'snapshot' and table_type == 'PRIMARY' -%}
+    {%- set configured_keys = [keys] if keys is string else (keys or ['dbt_scd_id']) -%}
+    {%- if configured_keys | map('lower') | list != ['dbt_scd_id'] -%}
+      {%- set msg -%}
+        PRIMARY KEY snapshots are keyed on dbt_scd_id, remove `keys` ({{ configured_keys | join(', ') }}) or set them to ['dbt_scd_id']
+      {%- endset -%}
+      {{ exceptions.raise_compiler_error(msg) }}
+    {%- endif -%}
+    {%- set keys = ['dbt_scd_id'] -%}
+    {%- set distributed_by = distributed_by or keys -%}
+  {%- endif -%}
+
   {%- if properties is none -%}
         {%- set properties = config.get('properties', {"replication_num":"1"}) -%}
   {%- endif -%}
@@ -15,26 +15,33 @@
  */
 
 {% macro get_incremental_insert_overwrite_sql(arg_dict) %}
-      {% do return(get_insert_overwrite_into_sql(arg_dict["target_relation"], arg_dict["temp_relation"], arg_dict["dest_columns"])) %}
+      {% do return(get_insert_overwrite_into_sql(arg_dict["target_relation"], arg_dict["temp_relation"], arg_dict["dest_columns"], arg_dict.get("partitions"))) %}
 {% endmacro %}
 
 {% macro get_incremental_dynamic_overwrite_sql(arg_dict) %}
       {% do return(get_dynamic_overwrite_into_sql(arg_dict["target_relation"], arg_dict["temp_relation"], arg_dict["dest_columns"])) %}
 {% endmacro %}
 
-{% macro _get_strategy_sql(target_relation, temp_relation, dest_cols_csv, is_dynamic_overwrite) %}
+{% macro _get_strategy_sql(target_relation, temp_relation, dest_cols_csv, is_dynamic_overwrite, partitions=none) %}
     {% set overwrite_type = "TRUE" if is_dynamic_overwrite else "FALSE" %}
 
-    insert /*+SET_VAR(dynamic_overwrite = {{ overwrite_type }})*/ overwrite {{ target_relation }}({{ dest_cols_csv }})
+    insert /*+SET_VAR(dynamic_overwrite = {{ overwrite_type }})*/ overwrite {{ target_relation }}
+    {%- if partitions %} partition ({{ get_quoted_csv(partitions | map(attribute="name")) }}){% endif %}
+    ({{ dest_cols_csv }})
     (
         select {{ dest_cols_csv }}
         from {{ temp_relation }}
     )
 {% endmacro %}
 
-{% macro get_insert_overwrite_into_sql(target_relation, temp_relation, dest_columns) %}
+{#-- `partitions`: the partitions to overwrite (from `adapter.get_overwrite_partitions`), none for the whole table --#}
+{% macro get_insert_overwrite_into_sql(target_relation, temp_relation, dest_columns, partitions=none) %}
     {%- set dest_cols_csv = get_quoted_csv(dest_columns | map(attribute="name")) -%}
-    {%- do return(_get_strategy_sql(target_relation, temp_relation, dest_cols_csv, false)) -%}
+    {%- if partitions is not none and partitions | length == 0 -%}
+      {#-- Empty increment: no partition to overwrite --#}
+      {%- do return("insert into " ~ target_relation ~ " (" ~ dest_cols_csv ~ ") select " ~ dest_cols_csv ~ " from " ~ temp_relation) -%}
+    {%- endif -%}
+    {%- do return(_get_strategy_sql(target_relation, temp_relation, dest_cols_csv, false, partitions)) -%}
 {% endmacro %}
 
 {% macro get_dynamic_overwrite_into_sql(target_relation, temp_relation, dest_columns) %}
@@ -48,3 +55,347 @@
         {%- do return(_get_strategy_sql(target_relation, temp_relation, dest_cols_csv, true)) -%}
     {% endif %}
 {% endmacro %}
+
+{#-- Upserts through PRIMARY KEY semantics: rows inserted into the table replace the rows with the same keys --#}
+{% macro starrocks__get_incremental_merge_sql(arg_dict) %}
+  {%- set target_relation = arg_dict["target_relation"] -%}
+  {%- set source = arg_dict["temp_relation"] -%}
+  {%- set unique_key = arg_dict["unique_key"] -%}
+  {%- if not unique_key -%}
+    {{ exceptions.raise_compiler_error("[merge] requires a unique_key, the PRIMARY KEY of the table") }}
+  {%- endif -%}
+  {%- set keys = unique_key if unique_key is sequence and unique_key is not string else [unique_key] -%}
+
+  {%- set update_columns = config.get('merge_update_columns') -%}
+  {%- set exclude_columns = config.get('merge_exclude_columns') -%}
+  {%- set delete_column = config.get('merge_delete_column') -%}
+  {%- set key_names = keys | map('lower') | list -%}
+  {%- set dest_names = arg_dict["dest_columns"] | map(attribute="name") | list -%}
+
+  {#-- Other table models would append the rows instead of replacing them --#}
+  {%- set table_model = starrocks__get_table_model(target_relation) -%}
+  {%- if table_model is none or table_model[0] != 'PRI_KEYS' or (table_model[1].split(',') | sort) != (key_names | sort) -%}
+    {%- set msg -%}
+      [merge] requires a PRIMARY KEY table whose keys are the unique_key ({{ key_names | join(', ') }}), {{ target_relation }} is not: set `table_type='PRIMARY'` and `keys` (or a `unique_key`) and run with --full-refresh
+    {%- endset -%}
+    {{ exceptions.raise_compiler_error(msg) }}
+  {%- endif -%}
+
+  {%- set partial_update = update_columns is not none or exclude_columns is not none -%}
+  {%- if partial_update -%}
+    {%- if adapter.is_before_version("3.1.0") -%}
+      {%- set msg -%}
+        [merge] partial updates are only available from version 3.1.0 onwards, current version is {{ adapter.current_version() }}
+      {%- endset -%}
+      {{ exceptions.raise_compiler_error(msg) }}
+    {%- endif -%}
+    {%- set excluded = (exclude_columns or []) | map('lower') | list -%}
+    {%- set updated = (update_columns or dest_names) | map('lower') | list -%}
+    {%- set columns = [] -%}
+    {%- for name in dest_names -%}
+      {%- if name | lower in key_names or (name | lower in updated and name | lower not in excluded) -%}
+        {%- do columns.append(name) -%}
+      {%- endif -%}
+    {%- endfor -%}
+  {%- else -%}
+    {%- set columns = dest_names -%}
+  {%- endif -%}
+  {%- set cols_csv = get_quoted_csv(columns) -%}
+
+  {%- set upsert_sql -%}
+    insert {% if partial_update %}/*+SET_VAR(partial_update_mode = 'column')*/ {% endif %}into {{ target_relation }} ({{ cols_csv }})
+    select {{ cols_csv }}
+    from {{ source }}
+    {%- if delete_column %}
+    where coalesce({{ adapter.quote(delete_column) }}, 0) != 1
+    {%- endif %}
+  {%- endset -%}
+
+  {%- if not delete_column -%}
+    {%- do return(upsert_sql) -%}
+  {%- endif -%}
+
+  {#-- Rows flagged with `<merge_delete_column> = 1` delete the rows with the same keys --#}
+  {%- set delete_sql -%}
+    delete from {{ target_relation }}
+    using (
+        select {{ get_quoted_csv(keys) }}
+        from {{ source }}
+        where {{ adapter.quote(delete_column) }} = 1
+    ) as `__dbt_deleted`
+    where {% for key in keys -%}
+      {{ target_relation }}.{{ adapter.quote(key) }} = `__dbt_deleted`.{{ adapter.quote(key) }}
+      {%- if not loop.last %} and {% endif -%}
+    {%- endfor %}
+  {%- endset -%}
+  {%- do return([delete_sql, upsert_sql]) -%}
+{% endmacro %}
+
+{#-- Replaces the rows having the keys of the increment: a predicate DELETE, then an INSERT --#}
+{% macro starrocks__get_incremental_delete_insert_sql(arg_dict) %}
+  {%- set target_relation = arg_dict["target_relation"] -%}
+  {%- set source = arg_dict["temp_relation"] -%}
+  {%- set unique_key = arg_dict["unique_key"] -%}
+  {%- if not unique_key -%}
+    {{ exceptions.raise_compiler_error("[delete+insert] requires a unique_key") }}
+  {%- endif -%}
+  {#-- DELETE with a subquery or USING is only supported on PRIMARY KEY tables --#}
+  {%- set table_model = starrocks__get_table_model(target_relation) -%}
+  {%- if table_model is none or table_model[0] != 'PRI_KEYS' -%}
+    {%- set msg -%}
+      [delete+insert] requires a PRIMARY KEY table, {{ target_relation }} is not: set `table_type='PRIMARY'` and `keys` (or a `unique_key`) and run with --full-refresh
+    {%- endset -%}
+    {{ exceptions.raise_compiler_error(msg) }}
+  {%- endif -%}
+  {%- set keys = unique_key if unique_key is sequence and unique_key is not string else [unique_key] -%}
+  {%- set dest_cols_csv = get_quoted_csv(arg_dict["dest_columns"] | map(attribute="name")) -%}
+
+  {%- set delete_sql -%}
+    delete from {{ target_relation }}
+    {%- if keys | length == 1 %}
+    where {{ adapter.quote(keys[0]) }} in (
+        select {{ adapter.quote(keys[0]) }}
+        from {{ source }}
+    )
+    {%- else %}
+    using (
+        select distinct {{ get_quoted_csv(keys) }}
+        from {{ source }}
+    ) as `__dbt_deleted`
+    where {% for key in keys -%}
+      {{ target_relation }}.{{ adapter.quote(key) }} = `__dbt_deleted`.{{ adapter.quote(key) }}
+      {%- if not loop.last %} and {% endif -%}
+    {%- endfor %}
+    {%- endif %}
+    {%- for predicate in arg_dict["incremental_predicates"] or [] %}
+    and {{ predicate }}
+    {%- endfor %}
+  {%- endset -%}
+
+  {%- set insert_sql -%}
+    insert into {{ target_relation }} ({{ dest_cols_csv }})
+    select {{ dest_cols_csv }}
+    from {{ source }}
+  {%- endset -%}
+  {%- do return([delete_sql, insert_sql]) -%}
+{% endmacro %}
+
+{#-- The batch bounds set by dbt (1.9+) when running a microbatch model --#}
+{% macro starrocks__microbatch_bounds() %}
+  {%- if model.batch is defined and model.batch -%}
+    {%- do return([model.batch.event_time_start, model.batch.event_time_end]) -%}
+  {%- endif -%}
+  {%- set start = model.config.get('__dbt_internal_microbatch_event_time_start') -%}
+  {%- set end = model.config.get('__dbt_internal_microbatch_event_time_end') -%}
+  {%- if start is none or end is none -%}
+    {{ exceptions.raise_compiler_error("[microbatch] batch bounds are missing, it requires dbt-core 1.9 or later") }}
+  {%- endif -%}
+  {%- do return([start, end]) -%}
+{% endmacro %}
+
+{#-- Overwrites the partitions of the batch, each batch writing its own partitions --#}
+{% macro starrocks__get_incremental_microbatch_sql(arg_dict) %}
+  {%- set target_relation = arg_dict["target_relation"] -%}
+  {%- set event_time = config.get('event_time') -%}
+  {%- if not event_time -%}
+    {{ exceptions.raise_compiler_error("[microbatch] requires an event_time") }}
+  {%- endif -%}
+  {%- set bounds = starrocks__microbatch_bounds() -%}
+  {%- set partitions = adapter.get_batch_partitions(target_relation, event_time, bounds[0], bounds[1]) -%}
+  {%- set dest_cols_csv = get_quoted_csv(arg_dict["dest_columns"] | map(attribute="name")) -%}
+
+  {%- if partitions %}
+    insert /*+SET_VAR(dynamic_overwrite = false)*/ overwrite {{ target_relation }} partition ({{ get_quoted_csv(partitions | map(attribute="name")) }}) ({{ dest_cols_csv }})
+  {%- else %}
+    {#-- The partitions of the batch don't exist yet (expression partitioning creates them on write) --#}
+    insert into {{ target_relation }} ({{ dest_cols_csv }})
+  {%- endif %}
+    select {{ dest_cols_csv }}
+    from {{ arg_dict["temp_relation"] }}
+    where {{ event_time }} >= '{{ bounds[0].strftime("%Y-%m-%d %H:%M:%S") }}'
+      and {{ event_time }} < '{{ bounds[1].strftime("%Y-%m-%d %H:%M:%S") }}'
+{% endmacro %}
+
+{% macro starrocks__create_temporary_table_as(relation, sql) -%}
+  {%- set sql_header = config.get('sql_header', none) -%}
+
+  {{ sql_header if sql_header is not none }}
+
+  create temporary table {{ relation.include(database=False) }} as {{ sql }}
+{%- endmacro %}
+
+{#-- Strategies writing the increment with a single INSERT statement, which can read it straight from the model query.
+     Strategies running several statements read a staged increment: the model query must be evaluated once, before
+     the first statement changes the target (e.g. `is_incremental()` filters reading it) --#}
+{% macro starrocks__direct_incremental_strategies() %}
+  {{ return(['default', 'append', 'insert_overwrite', 'dynamic_overwrite', 'merge', 'microbatch']) }}
+{% endmacro %}
+
+{#-- Whether the increment can be read straight from the model query: `merge` deleting rows runs a DELETE first --#}
+{% macro starrocks__is_direct_incremental_strategy(strategy) %}
+  {%- if strategy == 'merge' and config.get('merge_delete_column') -%}
+    {{ return(false) }}
+  {%- endif -%}
+  {{ return(strategy in starrocks__direct_incremental_strategies()) }}
+{% endmacro %}
+
+{% materialization incremental, adapter='starrocks' -%}
+
+  -- relations
+  {%- set existing_relation = load_cached_relation(this) -%}
+  {%- set target_relation = this.incorporate(type='table') -%}
+  {%- set temp_relation = make_temp_relation(target_relation) -%}
+  {%- set intermediate_relation = make_intermediate_relation(target_relation) -%}
+  {%- set backup_relation_type = 'table' if existing_relation is none else existing_relation.type -%}
+  {%- set backup_relation = make_backup_relation(target_relation, backup_relation_type) -%}
+
+  -- configs
+  {%- set unique_key = config.get('unique_key') -%}
+  {%- set full_refresh_mode = (should_full_refresh() or existing_relation.is_view) -%}
+  {%- set on_schema_change = incremental_validate_on_schema_change(config.get('on_schema_change'), default='ignore') -%}
+  {%- set incremental_strategy = config.get('incremental_strategy') or 'default' -%}
+
+  {%- set preexisting_intermediate_relation = load_cached_relation(intermediate_relation) -%}
+  {%- set preexisting_backup_relation = load_cached_relation(backup_relation) -%}
+  {% set grant_config = config.get('grants') %}
+  {{ drop_relation_if_exists(preexisting_intermediate_relation) }}
+  {{ drop_relation_if_exists(preexisting_backup_relation) }}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  {% set to_drop = [] %}
+  {% set sql_header = none %}
+  {% set staging_is_temporary = false %}
+  {% set overwrite_range_partitions = none %}
+  {% set overwrite_partitions = none %}
+  {% set overwrite_parallelism = config.get('overwrite_parallelism', 1) %}
+  {% set pre_build_sql = [] %}
+  {% set strategy_sql_macro_func = adapter.get_incremental_strategy_macro(context, incremental_strategy) %}
+
+  {% if existing_relation is none %}
+      {% set build_sql = get_create_table_as_sql(False, target_relation, sql) %}
+      {% set relation_for_indexes = target_relation %}
+  {% elif full_refresh_mode %}
+      {% set build_sql = get_create_table_as_sql(False, intermediate_relation, sql) %}
+      {% set relation_for_indexes = intermediate_relation %}
+      {% set need_swap = true %}
+  {% else %}
+    {% set contract_config = config.get('contract') %}
+    {% set incremental_predicates = config.get('predicates', none) or config.get('incremental_predicates', none) %}
+
+    {#-- Overwrite only the partitions of range partitioned tables holding increment rows --#}
+    {% if incremental_strategy == 'insert_overwrite' and config.get('overwrite_scope', 'table') == 'partitions' %}
+      {% set overwrite_range_partitions = adapter.get_range_partitions(existing_relation) %}
+    {% endif %}
+
+    {% if on_schema_change == 'ignore' and starrocks__is_direct_incremental_strategy(incremental_strategy) and overwrite_range_partitions is none %}
+      {#-- No schema comparison needed: the INSERT reads the increment straight from the model query --#}
+      {% set source = "(\n" ~ sql ~ "\n) as " ~ adapter.quote(temp_relation.identifier) %}
+      {% set dest_columns = adapter.get_columns_in_relation(existing_relation) %}
+      {% set sql_header = config.get('sql_header', none) %}
+    {% else %}
+      {#-- Stage the increment to compare its schema or compute its partitions, in a session temporary table when possible --#}
+      {#-- Partitions overwritten in parallel read the increment from other sessions --#}
+      {% set staging_is_temporary = adapter.supports_temporary_tables() and (overwrite_range_partitions is none or overwrite_parallelism <= 1) %}
+      {% if staging_is_temporary %}
+        {% do run_query(starrocks__create_temporary_table_as(temp_relation, sql)) %}
+      {% else %}
+        {% do run_query(get_create_table_as_sql(True, temp_relation, sql)) %}
+      {% endif %}
+      {% do to_drop.append(temp_relation) %}
+      {% set source = temp_relation %}
+
+      {% if not contract_config or not contract_config.enforced %}
+        {% do adapter.expand_target_column_types(from_relation=temp_relation, to_relation=target_relation) %}
+      {% endif %}
+      {#-- Process schema changes. Returns dict of changes if successful. Use source columns for upserting/merging --#}
+      {% set dest_columns = process_schema_changes(on_schema_change, temp_relation, existing_relation) %}
+      {% if not dest_columns %}
+        {% set dest_columns = adapter.get_columns_in_relation(existing_relation) %}
+      {% endif %}
+    {% endif %}
+
+    {% if overwrite_range_partitions is not none %}
+      {% set overwrite_partitions = adapter.get_overwrite_partitions(overwrite_range_partitions, source) %}
+      {% if overwrite_partitions is none and not adapter.is_before_version("3.4.0") %}
+        {#-- Some rows need new partitions: let dynamic overwrite create them --#}
+        {% set strategy_sql_macro_func = adapter.get_incremental_strategy_macro(context, 'dynamic_overwrite') %}
+      {% endif %}
+    {% endif %}
+
+    {% set strategy_arg_dict = ({'target_relation': target_relation, 'temp_relation': source, 'unique_key': unique_key, 'dest_columns': dest_columns, 'incremental_predicates': incremental_predicates, 'partitions': overwrite_partitions }) %}
+    {% set build_sql = strategy_sql_macro_func(strategy_arg_dict) %}
+    {#-- Strategies may return DELETE statements to run before the main one, as a list of statements --#}
+    {% if build_sql is not string %}
+      {% set pre_build_sql = build_sql[:-1] %}
+      {% set build_sql = build_sql[-1] %}
+    {% endif %}
+    {% if sql_header is not none %}
+      {% set build_sql = sql_header ~ "\n" ~ build_sql %}
+    {% endif %}
+  {% endif %}
+
+  {% for pre_sql in pre_build_sql %}
+    {% call statement("pre_main") %}
+        {{ sql_header if sql_header is not none }}
+        {{ pre_sql }}
+    {% endcall %}
+  {% endfor %}
+
+  {% if overwrite_partitions and overwrite_partitions | length > 1 and overwrite_parallelism > 1 %}
+    {% set main_response = adapter.insert_overwrite_partitions(target_relation, source, dest_columns, overwrite_range_partitions, overwrite_partitions, overwrite_parallelism) %}
+    {% do store_result('main', response=main_response) %}
+  {% else %}
+    {% call statement("main") %}
+        {{ build_sql }}
+    {% endcall %}
+    {% if pre_build_sql %}
+      {% set main_result = load_result("main") %}
+      {% do store_result("main", response=adapter.report_deleted_rows(load_result("pre_main").response, main_result.response), agate_table=main_result.table) %}
+    {% endif %}
+  {% endif %}
+
+  {% if existing_relation is none or existing_relation.is_view or should_full_refresh() %}
+    {% do create_indexes(relation_for_indexes) %}
+  {% endif %}
+
+  {% if need_swap %}
+    {% if existing_relation.is_table %}
+      {{ starrocks__swap_table(target_relation, intermediate_relation) }}
+      {% set previous_relation = intermediate_relation %}
+    {% else %}
+      {% do adapter.rename_relation(target_relation, backup_relation) %}
+      {% do adapter.rename_relation(intermediate_relation, target_relation) %}
+      {% set previous_relation = backup_relation %}
+    {% endif %}
+  {% endif %}
+
+  {% set should_revoke = should_revoke(existing_relation, full_refresh_mode) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+
+  {% do persist_docs(target_relation, model) %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  {% do adapter.commit() %}
+
+  {% if need_swap %}
+    {% call statement('drop_previous_data', auto_begin=False) %}
+      drop {{ previous_relation.type or 'table' }} if exists {{ previous_relation }}
+    {% endcall %}
+    {% do adapter.cache_dropped(previous_relation) %}
+  {% endif %}
+
+  {% for rel in to_drop %}
+    {% call statement('drop_staging', auto_begin=False) %}
+      drop {{ 'temporary ' if staging_is_temporary }}table if exists {{ rel }}
+    {% endcall %}
+    {% do adapter.cache_dropped(rel) %}
+  {% endfor %}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{%- endmaterialization %}
@@ -14,8 +14,11 @@
     {%- set distributed_by = config.get('distributed_by') -%}
     {%- set properties = config.get('properties') -%}
     {%- set refresh_method = config.get('refresh_method', 'manual') -%}
+    {#-- The description shares the comment with the hash of the definition, see starrocks__persist_docs --#}
+    {%- set description = model.description if config.persist_relation_docs() else none -%}
 
     create materialized view {{ relation }}
+    comment "{{ adapter.materialized_view_comment(sql, partition_by, distributed_by, buckets, description) }}"
 
     {%- if partition_by is not none -%}
         PARTITION BY (
@@ -52,6 +55,11 @@
 
 {% endmacro %}
 
+{#-- The comment of materialized views is set when they're created, along with the hash of their definition --#}
+{% macro starrocks__persist_docs(relation, model, for_relation, for_columns) -%}
+    {%- do return(default__persist_docs(relation, model, for_relation and not relation.is_materialized_view, for_columns)) -%}
+{%- endmacro %}
+
 {% macro starrocks__get_drop_relation_sql(relation) %}
     {% call statement(name="main") %}
         {%- if relation.is_materialized_view -%}
@@ -62,7 +70,23 @@
     {% endcall %}
 {% endmacro %}
 
+{#-- None when the deployed view matches the model, otherwise the changes to apply --#}
 {% macro starrocks__get_materialized_view_configuration_changes(existing_relation, new_config) %}
+    {%- set changes = adapter.get_materialized_view_changes(
+        existing_relation,
+        sql,
+        new_config.get('partition_by'),
+        new_config.get('distributed_by'),
+        new_config.get('buckets'),
+        new_config.get('refresh_method', 'manual'),
+        new_config.get('properties'),
+    ) -%}
+    {%- do return(changes) -%}
+{% endmacro %}
+
+{#-- Nothing to do for unchanged views: StarRocks refreshes them according to their refresh scheme --#}
+{% macro starrocks__refresh_materialized_view(relation) %}
+    {%- do return('') -%}
 {% endmacro %}
 
 {% macro starrocks__get_alter_materialized_view_as_sql(
@@ -74,6 +98,47 @@
     intermediate_relation
 ) %}
 
-    {{ starrocks__get_replace_materialized_view_as_sql(relation, sql, existing_relation, backup_relation, intermediate_relation) }}
+    {%- if configuration_changes['rebuild'] -%}
+        {#-- The query, partitioning or distribution changed --#}
+        {{ starrocks__get_replace_materialized_view_as_sql(relation, sql, existing_relation, backup_relation, intermediate_relation) }}
+    {%- else -%}
+        {%- set statements = [] -%}
+        {%- if configuration_changes['refresh'] is not none -%}
+            {%- do statements.append("alter materialized view " ~ relation ~ " refresh " ~ configuration_changes['refresh']) -%}
+        {%- endif -%}
+        {%- for key, value in configuration_changes['properties'].items() -%}
+            {%- do statements.append("alter materialized view " ~ relation ~ ' set ("' ~ key ~ '" = "' ~ value ~ '")') -%}
+        {%- endfor -%}
+        {#-- The last statement is run as the main statement of the model --#}
+        {%- for statement_sql in statements[:-1] -%}
+            {%- do run_query(statement_sql) -%}
+        {%- endfor -%}
+        {{ statements[-1] }}
+    {%- endif -%}
+
+{% endmacro %}
+{#--
+  Refreshes materialized views (all of them, or the `select`ed ones) in dependency order and waits for them, e.g.
+  `dbt run-operation refresh_materialized_views --args '{select: [my_mv], start: "2024-01-01", end: "2024-02-01"}'`
+--#}
+{% macro refresh_materialized_views(select=none, start=none, end=none, force=false, parallelism=none) %}
+    {%- set views = {} -%}
+    {%- set depends_on = {} -%}
+    {%- for node in graph.nodes.values() -%}
+        {%- do depends_on.update({node.unique_id: node.depends_on.nodes}) -%}
+        {%- if node.resource_type == 'model' and node.config.materialized == 'materialized_view' and (select is none or node.name in select) -%}
+            {%- do views.update({node.unique_id: node.relation_name}) -%}
+        {%- endif -%}
+    {%- endfor -%}
 
-{% endmacro %}
\ No newline at end of file
+    {%- if views | length == 0 -%}
+        {{ log("No materialized view to refresh", info=true) }}
+        {%- do return({}) -%}
+    {%- endif -%}
+
+    {%- set summary = adapter.refresh_materialized_views(views, depends_on, start, end, force, parallelism) -%}
+    {%- for relation, status in summary.items() -%}
+        {{ log(relation ~ ": " ~ status, info=true) }}
+    {%- endfor -%}
+    {%- do return(summary) -%}
+{% endmacro %}
@@ -44,3 +44,70 @@
   as {{ sql }}
 
 {%- endmacro %}
+
+{% macro starrocks__swap_table(relation, other_relation) -%}
+  {% call statement('swap_table', auto_begin=False) %}
+    alter table {{ relation }} swap with {{ other_relation.identifier }}
+  {% endcall %}
+{%- endmacro %}
+
+{% materialization table, adapter='starrocks' %}
+
+  {%- set existing_relation = load_cached_relation(this) -%}
+  {%- set target_relation = this.incorporate(type='table') -%}
+  {%- set intermediate_relation = make_intermediate_relation(target_relation) -%}
+  {%- set preexisting_intermediate_relation = load_cached_relation(intermediate_relation) -%}
+  {%- set backup_relation = make_backup_relation(target_relation, 'table') -%}
+  {%- set keep_backup = config.get('keep_backup', false) -%}
+  {%- set grant_config = config.get('grants') -%}
+
+  {#-- Only tables can be swapped, other relations get replaced --#}
+  {%- set swap = existing_relation is not none and existing_relation.is_table -%}
+
+  {{ drop_relation_if_exists(preexisting_intermediate_relation) }}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  -- build model into the shadow relation
+  {% call statement('main') -%}
+    {{ get_create_table_as_sql(False, intermediate_relation, sql) }}
+  {%- endcall %}
+
+  {% do create_indexes(intermediate_relation) %}
+
+  {% if swap %}
+    {#-- A retry must not reuse the tasks which built the shadow relation, since it's about to hold other data --#}
+    {% do adapter.release_resumable_tasks(intermediate_relation) %}
+
+    -- publish atomically, the shadow relation now holds the previous data
+    {{ starrocks__swap_table(target_relation, intermediate_relation) }}
+
+    {% if keep_backup %}
+      {{ drop_relation_if_exists(load_cached_relation(backup_relation)) }}
+      {{ adapter.rename_relation(intermediate_relation, backup_relation) }}
+    {% else %}
+      {#-- Without FORCE, the data is moved to the recycle bin and reclaimed in the background by the FE --#}
+      {% call statement('drop_previous_data', auto_begin=False) %}
+        drop table if exists {{ intermediate_relation }}
+      {% endcall %}
+      {% do adapter.cache_dropped(intermediate_relation) %}
+    {% endif %}
+  {% else %}
+    {{ drop_relation_if_exists(existing_relation) }}
+    {{ adapter.rename_relation(intermediate_relation, target_relation) }}
+  {% endif %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  {% set should_revoke = should_revoke(existing_relation, full_refresh_mode=True) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+
+  {% do persist_docs(target_relation, model) %}
+
+  {{ adapter.commit() }}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+{% endmaterialization %}
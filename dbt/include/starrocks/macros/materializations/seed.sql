@@ -0,0 +1,118 @@
+/*
+ * Copyright 2021-present StarRocks, Inc. All rights reserved.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     https:*www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+{% materialization seed, adapter='starrocks' %}
+
+  {%- set identifier = model['alias'] -%}
+  {%- set full_refresh_mode = (should_full_refresh()) -%}
+
+  {%- set old_relation = adapter.get_relation(database=database, schema=schema, identifier=identifier) -%}
+
+  {%- set exists_as_table = (old_relation is not none and old_relation.is_table) -%}
+  {%- set exists_as_view = (old_relation is not none and old_relation.is_view) -%}
+
+  {%- set grant_config = config.get('grants') -%}
+  {%- set target_relation = this.incorporate(type='table') -%}
+
+  {#-- Seeds whose file and column types didn't change since they got loaded are skipped, without reading them --#}
+  {%- set store_hash = not adapter.is_before_version('3.1.0') -%}
+  {%- set file_hash = adapter.get_seed_file_hash(model) if store_hash else none -%}
+  {%- set table_hash = adapter.get_seed_table_hash(old_relation) if exists_as_table and file_hash is not none else none -%}
+
+  {% if table_hash is not none and table_hash == file_hash and not full_refresh_mode %}
+    {{ log("Skipping seed " ~ target_relation ~ ", its file didn't change since it got loaded") }}
+    {%- do store_result('agate_table', response='OK', agate_table=run_query("select * from " ~ target_relation.render() ~ " limit 0")) -%}
+
+    {{ run_hooks(pre_hooks, inside_transaction=False) }}
+    {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+    {% call noop_statement('main', 'SKIP', 'SKIP', 0) %}
+      -- {{ target_relation.render() }} is up to date ({{ file_hash }})
+    {% endcall %}
+
+    {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke(old_relation, False)) %}
+
+    {{ run_hooks(post_hooks, inside_transaction=True) }}
+    {{ adapter.commit() }}
+    {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+    {{ return({'relations': [target_relation]}) }}
+  {% endif %}
+
+  {#-- Streamed seeds are read one chunk at a time, their column types inferred from their first rows --#}
+  {%- set streaming = config.get('seed_streaming', false) -%}
+  {%- set agate_table = adapter.load_seed_sample(model) if streaming else load_agate_table() -%}
+  -- grab current tables grants config for comparison later on
+
+  {%- do store_result('agate_table', response='OK', agate_table=agate_table) -%}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+
+  -- `BEGIN` happens here:
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  -- build model
+  {% set create_table_sql = "" %}
+  {% if exists_as_view %}
+    {{ exceptions.raise_compiler_error("Cannot seed to '{}', it is a view".format(old_relation.render())) }}
+  {% elif exists_as_table %}
+    {% if table_hash is not none %}
+      {#-- A load failing midway mustn't leave a table looking up to date --#}
+      {% do adapter.set_seed_table_hash(old_relation, none) %}
+    {% endif %}
+    {% set create_table_sql = reset_csv_table(model, full_refresh_mode, old_relation, agate_table) %}
+  {% else %}
+    {% set create_table_sql = create_csv_table(model, agate_table) %}
+  {% endif %}
+
+  {% set code = 'CREATE' if full_refresh_mode else 'INSERT' %}
+  {% if streaming %}
+    {% set response = adapter.stream_seed_file(target_relation, model, agate_table) %}
+    {% set rows_affected = response.rows_affected %}
+    {% set sql = "/* " ~ rows_affected ~ " rows streamed into " ~ target_relation.render() ~ " */" %}
+  {% else %}
+    {% set rows_affected = (agate_table.rows | length) %}
+    {% set sql = load_csv_rows(model, agate_table) %}
+  {% endif %}
+
+  {% call noop_statement('main', code ~ ' ' ~ rows_affected, code, rows_affected) %}
+    {{ get_csv_sql(create_table_sql, sql) }};
+  {% endcall %}
+
+  {% if file_hash is not none %}
+    {% do adapter.set_seed_table_hash(target_relation, file_hash) %}
+  {% endif %}
+
+  {% set should_revoke = should_revoke(old_relation, full_refresh_mode) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+
+  {% do persist_docs(target_relation, model) %}
+
+  {% if full_refresh_mode or not exists_as_table %}
+    {% do create_indexes(target_relation) %}
+  {% endif %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  -- `COMMIT` happens here
+  {{ adapter.commit() }}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{% endmaterialization %}
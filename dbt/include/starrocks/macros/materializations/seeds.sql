@@ -44,3 +44,12 @@
   {{ return(sql) }}
 
 {%- endmacro %}
+
+{% macro starrocks__load_csv_rows(model, agate_table) %}
+  {% if not adapter.stream_load_enabled() %}
+    {{ return(default__load_csv_rows(model, agate_table)) }}
+  {% endif %}
+
+  {% set response = adapter.stream_load_seed(this, agate_table) %}
+  {{ return("/* Stream Load of " ~ response.rows_affected ~ " rows into " ~ this.render() ~ " */") }}
+{% endmacro %}
@@ -26,6 +26,7 @@
 
   {%- set strategy_name = config.get('strategy') -%}
   {%- set unique_key = config.get('unique_key') %}
+  {%- set upsert = config.get('table_type') == 'PRIMARY' -%}
 
   {% if not adapter.check_schema_exists(model.database, model.schema) %}
     {% do create_schema(model.database, model.schema) %}
@@ -51,6 +52,14 @@
   {% if not target_relation_exists %}
 
       {% set build_sql = build_snapshot_table(strategy, model['compiled_sql']) %}
+      {% if upsert %}
+        {#-- PRIMARY KEY columns come first --#}
+        {% set snapshot_columns = [] %}
+        {% for column in get_columns_in_query(build_sql) | reject('equalto', 'dbt_scd_id') %}
+          {% do snapshot_columns.append(adapter.quote(column)) %}
+        {% endfor %}
+        {% set build_sql = "select dbt_scd_id, " ~ snapshot_columns | join(', ') ~ " from (\n" ~ build_sql ~ "\n) as dbt_snapshot_source" %}
+      {% endif %}
       {% set final_sql = create_table_as(False, target_relation, build_sql) %}
 
       {% call statement('main') %}
@@ -102,13 +111,22 @@
          )
       %}
 
-      {% call statement('main') %}
-          {{ final_sql_update }}
-      {% endcall %}
-
-      {% call statement('main') %}
-          {{ final_sql_insert }}
-      {% endcall %}
+      {% if upsert %}
+        {% do starrocks__check_snapshot_primary_key(target_relation) %}
+        {% for upsert_sql in starrocks__snapshot_upsert_sql(target_relation, staging_table, quoted_source_columns, config.get('snapshot_partial_update', false)) %}
+          {% call statement('main') %}
+              {{ upsert_sql }}
+          {% endcall %}
+        {% endfor %}
+      {% else %}
+        {% call statement('main') %}
+            {{ final_sql_update }}
+        {% endcall %}
+
+        {% call statement('main') %}
+            {{ final_sql_insert }}
+        {% endcall %}
+      {% endif %}
 
   {% endif %}
 
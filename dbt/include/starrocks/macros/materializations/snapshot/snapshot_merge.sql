@@ -32,3 +32,61 @@
     from {{ source }} as DBT_INTERNAL_SOURCE
     where DBT_INTERNAL_SOURCE.dbt_change_type = 'insert'
 {% endmacro %}
+
+{#-- Applies the invalidations and the new versions to a PRIMARY KEY snapshot keyed on dbt_scd_id, with upserts --#}
+{% macro starrocks__snapshot_upsert_sql(target, source, insert_cols, partial_update=false) -%}
+    {%- set insert_cols_csv = insert_cols | join(', ') -%}
+    {%- set valid_to = adapter.quote('dbt_valid_to') | lower -%}
+
+    {%- set insert_sql -%}
+        select {% for column in insert_cols -%}
+            DBT_INTERNAL_SOURCE.{{ column }} {%- if not loop.last %}, {%- endif %}
+        {%- endfor %}
+        from {{ source }} as DBT_INTERNAL_SOURCE
+        where DBT_INTERNAL_SOURCE.dbt_change_type = 'insert'
+    {%- endset -%}
+
+    {%- if partial_update -%}
+        {#-- Only dbt_valid_to is written for invalidated rows: the target isn't read --#}
+        {%- set invalidate_sql -%}
+            insert /*+SET_VAR(partial_update_mode = 'column')*/ into {{ target }} (dbt_scd_id, dbt_valid_to)
+            select dbt_scd_id, dbt_valid_to
+            from {{ source }}
+            where dbt_change_type in ('update', 'delete')
+        {%- endset -%}
+        {%- do return([invalidate_sql, "insert into " ~ target ~ " (" ~ insert_cols_csv ~ ")\n" ~ insert_sql]) -%}
+    {%- endif -%}
+
+    {%- set upsert_sql -%}
+        insert into {{ target }} ({{ insert_cols_csv }})
+        select {% for column in insert_cols -%}
+            {%- if column | lower == valid_to -%}
+                DBT_INTERNAL_SOURCE.dbt_valid_to
+            {%- else -%}
+                DBT_INTERNAL_DEST.{{ column }}
+            {%- endif -%}
+            {%- if not loop.last %}, {% endif %}
+        {%- endfor %}
+        from {{ target }} as DBT_INTERNAL_DEST
+        join (
+            select dbt_scd_id, dbt_valid_to
+            from {{ source }}
+            where dbt_change_type in ('update', 'delete')
+        ) as DBT_INTERNAL_SOURCE
+        on DBT_INTERNAL_SOURCE.dbt_scd_id = DBT_INTERNAL_DEST.dbt_scd_id
+        where DBT_INTERNAL_DEST.dbt_valid_to is null
+        union all
+        {{ insert_sql }}
+    {%- endset -%}
+    {%- do return([upsert_sql]) -%}
+{% endmacro %}
+
+{% macro starrocks__check_snapshot_primary_key(relation) -%}
+    {%- set table_model = starrocks__get_table_model(relation) -%}
+    {%- if table_model is none or table_model[0] != 'PRI_KEYS' or table_model[1] != 'dbt_scd_id' -%}
+        {%- set msg -%}
+            Snapshot {{ relation }} must be a PRIMARY KEY table keyed on dbt_scd_id to be updated with upserts (table_type='PRIMARY'), rebuild it or remove table_type
+        {%- endset -%}
+        {{ exceptions.raise_compiler_error(msg) }}
+    {%- endif -%}
+{%- endmacro %}
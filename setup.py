@@ -60,6 +60,9 @@ setup(
         "dbt-core~=1.8.0",
         "mysql-connector-python>=8.1",
     ],
+    extras_require={
+        "arrow": ["pyarrow>=14.0"],
+    },
     zip_safe=False,
     classifiers=[
         'Development Status :: 5 - Production/Stable',
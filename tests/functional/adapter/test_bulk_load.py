@@ -0,0 +1,30 @@
+import pytest
+
+from dbt.tests.util import relation_from_name, run_dbt, write_file
+
+
+load_audit_sql = """
+{% macro load_audit() %}
+  {% set relation = api.Relation.create(schema=target.schema, identifier='audit', type='table') %}
+  {% do run_query('create table ' ~ relation ~ ' (id int, name varchar(10)) distributed by hash(id)') %}
+  {% set report = adapter.bulk_load(relation, [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]) %}
+  {% do log('rows_loaded=' ~ report.rows_loaded, info=True) %}
+  {% set report = adapter.bulk_load(relation, var('project_root') ~ '/extract.csv') %}
+  {% do log('rows_loaded=' ~ report.rows_loaded, info=True) %}
+{% endmacro %}
+"""
+
+
+class TestBulkLoad:
+
+    @pytest.fixture(scope="class")
+    def macros(self):
+        return {"load_audit.sql": load_audit_sql}
+
+    def test_bulk_load(self, project):
+        write_file("id,name\n3,c\n4,\n", project.project_root, "extract.csv")
+
+        run_dbt(["run-operation", "load_audit", "--vars", f"{{project_root: '{project.project_root}'}}"])
+
+        relation = relation_from_name(project.adapter, "audit")
+        assert project.run_sql(f"select count(*), count(name) from {relation}", fetch="one") == (4, 3)
@@ -192,3 +192,55 @@ class TestDynamicOverwriteStrategyIncrementalModel(TestBaseIncrementalStrategyMo
         assert len(results) == 1
 
         check_relations_equal(project.adapter, ["dynamic_partition_2", "incremental"])
+
+
+class TestStagedDefaultStrategyIncrementalModel(TestOmittedStrategyIncrementalModel):
+    """The schema comparison requires staging the increment, in a temporary table when supported."""
+
+    @staticmethod
+    def _get_strategy():
+        return {"+incremental_strategy": "default", "+on_schema_change": "append_new_columns"}
+
+    def _specific_assertions(self, project):
+        super()._specific_assertions(project)
+
+        # The staging relation is not left behind
+        rows = project.run_sql(
+            f"select table_name from information_schema.tables where table_schema = '{project.test_schema}' "
+            f"and table_name like '%__dbt_tmp'",
+            fetch="all",
+        )
+        assert rows == []
+
+
+class TestRangePartitionedInsertOverwriteStrategyIncrementalModel(TestBaseIncrementalStrategyModel):
+    """With overwrite_scope='partitions', only the partitions holding increment rows get overwritten."""
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {
+            "name": "test_incremental",
+            "models": {
+                "+materialized": "incremental",
+                "+partition_type": "RANGE",
+                "+partition_by": ["partition_key"],
+                "+partition_by_init": [
+                    "PARTITION p1 VALUES [('1'), ('2')), PARTITION p2 VALUES [('2'), ('3'))"
+                ],
+                "+incremental_strategy": "insert_overwrite",
+                "+overwrite_scope": "partitions",
+            }
+        }
+
+    @staticmethod
+    def _get_strategy():
+        return {"+incremental_strategy": "insert_overwrite"}
+
+    def _specific_assertions(self, project):
+        check_relations_equal(project.adapter, ["partition_1_added", "incremental"])
+
+        results = run_dbt(["run", "--vars", "seed_name: partition_2_base"])
+        assert len(results) == 1
+        assert results[0].adapter_response["partitions"] == ["p2"]
+
+        check_relations_equal(project.adapter, ["dynamic_partition_2", "incremental"])
@@ -0,0 +1,132 @@
+import pytest
+
+from dbt.tests.util import relation_from_name, run_dbt
+
+
+seed_csv = """
+id,value
+1,10
+2,20
+""".lstrip()
+
+mv_sql = """
+{{
+    config(
+        materialized='materialized_view',
+        distributed_by=['id'],
+        buckets=2,
+        refresh_method=var('refresh_method', 'manual'),
+        properties={"replication_num": "1", "session.query_timeout": var('query_timeout', '600')},
+    )
+}}
+
+select id, sum(value) as total from {{ ref('seed') }} group by id {{ var('extra', '') }}
+""".lstrip()
+
+
+class TestMaterializedViewChanges:
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"seed.csv": seed_csv}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"my_mv.sql": mv_sql}
+
+    @staticmethod
+    def _create_time(project):
+        relation = relation_from_name(project.adapter, "my_mv")
+        return project.run_sql(
+            f"select create_time from information_schema.tables "
+            f"where table_schema = '{relation.schema}' and table_name = '{relation.identifier}'",
+            fetch="one",
+        )[0]
+
+    def test_changes(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run"])
+        created = self._create_time(project)
+
+        # Unchanged: skipped
+        results = run_dbt(["run"])
+        assert results[0].adapter_response["code"] == "skip"
+
+        # Property and refresh scheme changes: altered in place
+        results = run_dbt(["run", "--vars", "{query_timeout: '900', refresh_method: 'async every (interval 1 day)'}"])
+        assert results[0].adapter_response["code"] != "skip"
+        assert self._create_time(project) == created
+        results = run_dbt(["run", "--vars", "{query_timeout: '900', refresh_method: 'async every (interval 1 day)'}"])
+        assert results[0].adapter_response["code"] == "skip"
+
+        # Query changes: rebuilt
+        run_dbt(["run", "--vars", "{query_timeout: '900', refresh_method: 'async every (interval 1 day)', extra: 'having total > 0'}"])
+        relation = relation_from_name(project.adapter, "my_mv")
+        assert "dbt_definition:" in project.run_sql(f"show create materialized view {relation}", fetch="one")[1]
+
+
+documented_schema_yml = """
+version: 2
+models:
+  - name: my_mv
+    description: Totals per "id"
+    config:
+      persist_docs:
+        relation: true
+"""
+
+
+class TestMaterializedViewDescription:
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"seed.csv": seed_csv}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"my_mv.sql": mv_sql, "schema.yml": documented_schema_yml}
+
+    def test_description(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run"])
+        relation = relation_from_name(project.adapter, "my_mv")
+        create_sql = project.run_sql(f"show create materialized view {relation}", fetch="one")[1]
+        assert "Totals per" in create_sql and "dbt_definition:" in create_sql
+
+        # The description doesn't hide the hash of the definition
+        results = run_dbt(["run"])
+        assert results[0].adapter_response["code"] == "skip"
+
+
+mv_a_sql = """
+{{ config(materialized='materialized_view', distributed_by=['id'], buckets=2, refresh_method='deferred manual') }}
+
+select id, value from {{ ref('seed') }}
+""".lstrip()
+
+mv_b_sql = """
+{{ config(materialized='materialized_view', distributed_by=['id'], buckets=2, refresh_method='deferred manual') }}
+
+select id, value * 2 as double_value from {{ ref('mv_a') }}
+""".lstrip()
+
+
+class TestRefreshMaterializedViews:
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"seed.csv": seed_csv}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"mv_a.sql": mv_a_sql, "mv_b.sql": mv_b_sql}
+
+    def test_refresh(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run"])
+        mv_b = relation_from_name(project.adapter, "mv_b")
+        assert project.run_sql(f"select count(*) from {mv_b}", fetch="one")[0] == 0
+
+        # mv_b is refreshed after mv_a, once it holds data
+        run_dbt(["run-operation", "refresh_materialized_views", "--args", "{parallelism: 2}"])
+        assert project.run_sql(f"select count(*) from {mv_b}", fetch="one")[0] == 2
@@ -0,0 +1,168 @@
+import pytest
+
+from dbt.tests.util import check_relations_equal, relation_from_name, run_dbt
+
+
+changes_base_csv = """
+id,name,score,__op
+1,a,10,0
+2,b,20,0
+3,c,30,0
+""".lstrip()
+
+changes_next_csv = """
+id,name,score,__op
+2,B,21,0
+3,c,30,1
+4,d,40,0
+""".lstrip()
+
+expected_upsert_csv = """
+id,name,score
+1,a,10
+2,B,21
+3,c,30
+4,d,40
+""".lstrip()
+
+expected_delete_csv = """
+id,name,score
+1,a,10
+2,B,21
+4,d,40
+""".lstrip()
+
+expected_partial_csv = """
+id,name,score
+1,a,10
+2,b,21
+3,c,30
+4,,40
+""".lstrip()
+
+merge_sql = """
+{{ config(materialized='incremental', incremental_strategy='merge', unique_key='id') }}
+
+select id, name, score from {{ ref(var('seed_name', 'changes_base')) }}
+""".lstrip()
+
+merge_delete_sql = """
+{{ config(materialized='incremental', incremental_strategy='merge', unique_key='id', merge_delete_column='__op') }}
+
+select id, name, score{% if is_incremental() %}, __op{% endif %} from {{ ref(var('seed_name', 'changes_base')) }}
+""".lstrip()
+
+merge_partial_sql = """
+{{ config(materialized='incremental', incremental_strategy='merge', unique_key='id', merge_update_columns=['score']) }}
+
+select id, name, score from {{ ref(var('seed_name', 'changes_base')) }}
+""".lstrip()
+
+# A DUPLICATE KEY table, built before the model got a unique_key
+merge_on_duplicate_sql = """
+{% set merging = var('merging', false) %}
+{{ config(materialized='incremental', incremental_strategy=('merge' if merging else 'default'), unique_key=('id' if merging else none)) }}
+
+select id, name, score from {{ ref('changes_base') }}
+""".lstrip()
+
+
+delete_insert_sql = """
+{{ config(materialized='incremental', incremental_strategy='delete+insert', unique_key='id') }}
+
+select id, name, score from {{ ref(var('seed_name', 'changes_base')) }}
+""".lstrip()
+
+
+class BaseMergeStrategy:
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {
+            "changes_base.csv": changes_base_csv,
+            "changes_next.csv": changes_next_csv,
+            "expected_upsert.csv": expected_upsert_csv,
+            "expected_delete.csv": expected_delete_csv,
+            "expected_partial.csv": expected_partial_csv,
+        }
+
+    def _run_twice(self):
+        run_dbt(["seed"])
+        assert len(run_dbt(["run"])) == 1
+        assert len(run_dbt(["run", "--vars", "seed_name: changes_next"])) == 1
+
+
+class TestMergeStrategy(BaseMergeStrategy):
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"merge_model.sql": merge_sql}
+
+    def test_upsert(self, project):
+        self._run_twice()
+
+        check_relations_equal(project.adapter, ["expected_upsert", "merge_model"])
+
+        # No staging relation is created
+        relation = relation_from_name(project.adapter, "merge_model")
+        rows = project.run_sql(
+            f"select table_name from information_schema.tables where table_schema = '{relation.schema}' "
+            f"and table_name like '%__dbt_tmp'",
+            fetch="all",
+        )
+        assert rows == []
+
+
+class TestMergeStrategyWithDeleteColumn(BaseMergeStrategy):
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"merge_model.sql": merge_delete_sql}
+
+    def test_delete(self, project):
+        self._run_twice()
+
+        check_relations_equal(project.adapter, ["expected_delete", "merge_model"])
+
+
+class TestMergeStrategyPartialUpdate(BaseMergeStrategy):
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"merge_model.sql": merge_partial_sql}
+
+    def test_partial_update(self, project):
+        self._run_twice()
+
+        check_relations_equal(project.adapter, ["expected_partial", "merge_model"])
+
+
+class TestMergeStrategyRequiresPrimaryKey(BaseMergeStrategy):
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"merge_model.sql": merge_on_duplicate_sql}
+
+    def test_not_primary_key(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run"])
+        results = run_dbt(["run", "--vars", "merging: true"], expect_pass=False)
+
+        assert "requires a PRIMARY KEY table" in results[0].message
+        assert "--full-refresh" in results[0].message
+
+
+class TestDeleteInsertStrategy(BaseMergeStrategy):
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"merge_model.sql": delete_insert_sql}
+
+    def test_delete_insert(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run"])
+        results = run_dbt(["run", "--vars", "seed_name: changes_next"])
+
+        check_relations_equal(project.adapter, ["expected_upsert", "merge_model"])
+        assert results[0].adapter_response["rows_deleted"] == 2
+        assert results[0].adapter_response["rows_inserted"] == 3
@@ -0,0 +1,63 @@
+import pytest
+
+from dbt.tests.util import relation_from_name, run_dbt
+
+from dbt.adapters.starrocks.impl import MICROBATCH_SUPPORTED
+
+
+events_csv = """
+id,event_time
+1,2024-01-01 10:00:00
+2,2024-01-02 10:00:00
+3,2024-01-03 10:00:00
+""".lstrip()
+
+input_model_sql = """
+{{ config(materialized='table', event_time='event_time') }}
+
+select id, cast(event_time as datetime) as event_time from {{ ref('events') }}
+""".lstrip()
+
+microbatch_model_sql = """
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='microbatch',
+        event_time='event_time',
+        batch_size='day',
+        begin='2024-01-01',
+        partition_type='Expr',
+        partition_by=["date_trunc('day', event_time)"],
+    )
+}}
+
+select id, event_time from {{ ref('input_model') }}
+""".lstrip()
+
+
+@pytest.mark.skipif(not MICROBATCH_SUPPORTED, reason="microbatch requires dbt-core 1.9")
+class TestMicrobatch:
+    """Each batch overwrites its own daily partition."""
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"events.csv": events_csv}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"input_model.sql": input_model_sql, "microbatch_model.sql": microbatch_model_sql}
+
+    @staticmethod
+    def _ids(project):
+        relation = relation_from_name(project.adapter, "microbatch_model")
+        return [row[0] for row in project.run_sql(f"select id from {relation} order by id", fetch="all")]
+
+    def test_microbatch(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run", "--event-time-start", "2024-01-01", "--event-time-end", "2024-01-04"])
+        assert self._ids(project) == [1, 2, 3]
+
+        # Rerunning batches overwrites their partitions instead of duplicating rows
+        project.run_sql(f"delete from {relation_from_name(project.adapter, 'input_model')} where id = 2")
+        run_dbt(["run", "--select", "microbatch_model", "--event-time-start", "2024-01-02", "--event-time-end", "2024-01-04"])
+        assert self._ids(project) == [1, 3]
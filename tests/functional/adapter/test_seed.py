@@ -0,0 +1,53 @@
+import pytest
+
+from dbt.tests.util import relation_from_name, run_dbt, write_file
+
+
+seed_csv = """
+id,name
+1,a
+2,b
+""".lstrip()
+
+
+class TestUnchangedSeedSkipped:
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"my_seed.csv": seed_csv}
+
+    def test_skipped(self, project):
+        assert run_dbt(["seed"])[0].adapter_response["code"] == "INSERT"
+
+        # Unchanged: not loaded again
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["code"] == "SKIP"
+
+        relation = relation_from_name(project.adapter, "my_seed")
+        assert project.run_sql(f"select count(*) from {relation}", fetch="one")[0] == 2
+
+        # Full refresh
+        assert run_dbt(["seed", "--full-refresh"])[0].adapter_response["code"] == "CREATE"
+
+        # Changed
+        write_file(seed_csv + "3,c\n", project.project_root, "seeds", "my_seed.csv")
+        assert run_dbt(["seed"])[0].adapter_response["code"] == "INSERT"
+        assert project.run_sql(f"select count(*) from {relation}", fetch="one")[0] == 3
+
+
+class TestStreamedSeed:
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"my_seed.csv": seed_csv + "".join(f"{i},name {i}\n" for i in range(3, 1000))}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"seeds": {"+seed_streaming": True, "+seed_sample_size": 10}}
+
+    def test_streamed(self, project):
+        results = run_dbt(["seed"])
+
+        assert results[0].adapter_response["rows_affected"] == 999
+        relation = relation_from_name(project.adapter, "my_seed")
+        assert project.run_sql(f"select count(*), max(id) from {relation}", fetch="one") == (999, 999)
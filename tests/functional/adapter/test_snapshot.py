@@ -0,0 +1,70 @@
+import pytest
+
+from dbt.tests.util import relation_from_name, run_dbt
+
+
+base_csv = """
+id,name,updated_at
+1,a,2024-01-01 00:00:00
+2,b,2024-01-01 00:00:00
+3,c,2024-01-01 00:00:00
+""".lstrip()
+
+snapshot_sql = """
+{% snapshot pk_snapshot %}
+{{ config(target_schema=schema, strategy='timestamp', unique_key='id', updated_at='updated_at', table_type='PRIMARY',
+          snapshot_partial_update=var('partial_update', false)) }}
+select * from {{ ref('base') }}
+{% endsnapshot %}
+""".lstrip()
+
+
+class BasePrimaryKeySnapshot:
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"base.csv": base_csv}
+
+    @pytest.fixture(scope="class")
+    def snapshots(self):
+        return {"pk_snapshot.sql": snapshot_sql}
+
+    def _snapshot_twice(self, project, partial_update):
+        run_dbt(["seed"])
+        run_dbt(["snapshot"])
+
+        seed = relation_from_name(project.adapter, "base")
+        project.run_sql(f"update {seed} set name = 'B', updated_at = '2024-01-02 00:00:00' where id = 2")
+        project.run_sql(f"insert into {seed} values (4, 'd', '2024-01-02 00:00:00')")
+        run_dbt(["snapshot", "--vars", f"partial_update: {str(partial_update).lower()}"])
+
+        snapshot = relation_from_name(project.adapter, "pk_snapshot")
+        return project.run_sql(
+            f"select id, name, dbt_valid_to is null from {snapshot} order by id, dbt_valid_from",
+            fetch="all",
+        ), snapshot
+
+    def _check(self, project, partial_update):
+        rows, snapshot = self._snapshot_twice(project, partial_update)
+
+        assert [tuple(row) for row in rows] == [
+            (1, "a", 1), (2, "b", 0), (2, "B", 1), (3, "c", 1), (4, "d", 1),
+        ]
+        table_model = project.run_sql(
+            f"select table_model, primary_key from information_schema.tables_config "
+            f"where table_schema = '{snapshot.schema}' and table_name = '{snapshot.identifier}'",
+            fetch="one",
+        )
+        assert table_model[0] == "PRI_KEYS"
+
+
+class TestPrimaryKeySnapshot(BasePrimaryKeySnapshot):
+
+    def test_upsert(self, project):
+        self._check(project, partial_update=False)
+
+
+class TestPrimaryKeySnapshotPartialUpdate(BasePrimaryKeySnapshot):
+
+    def test_partial_update(self, project):
+        self._check(project, partial_update=True)
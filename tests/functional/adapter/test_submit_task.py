@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from dbt.tests.util import run_dbt, run_dbt_and_capture, check_relations_equal, relation_from_name
@@ -96,7 +98,7 @@ class TestSubmitTaskModel:
 
         results, stdout = run_dbt_and_capture(["run", "--select", "model_a"])
         assert len(results) == 1
-        assert "Waiting 4 seconds..." in stdout
+        assert re.search(r"Waiting [0-9.]+ seconds\.\.\.", stdout)
         check_relations_equal(project.adapter, ["seed_a", "model_a"])
 
         self._doc_tests()
@@ -152,7 +154,7 @@ class TestSubmitTaskWithPropsModel:
 
         results, stdout = run_dbt_and_capture(["run", "--select", "model_a"])
         assert len(results) == 1
-        assert "Waiting 4 seconds..." in stdout
+        assert re.search(r"Waiting [0-9.]+ seconds\.\.\.", stdout)
         check_relations_equal(project.adapter, ["seed_a", "model_a"])
 
         self._doc_tests()
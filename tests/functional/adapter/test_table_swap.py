@@ -0,0 +1,106 @@
+import pytest
+
+from dbt.tests.util import relation_from_name, run_dbt, run_dbt_and_capture, write_file
+
+
+seed_a_csv = """
+id,value
+1,a
+2,b
+3,c
+""".lstrip()
+
+model_a_sql = """
+{{ config(materialized='table') }}
+
+select * from {{ ref('seed_a') }} where id <= {{ var('max_id', 3) }}
+""".lstrip()
+
+model_a_keep_backup_sql = """
+{{ config(materialized='table', keep_backup=true) }}
+
+select * from {{ ref('seed_a') }} where id <= {{ var('max_id', 3) }}
+""".lstrip()
+
+view_a_sql = """
+{{ config(materialized='view') }}
+
+select * from {{ ref('seed_a') }}
+""".lstrip()
+
+
+class BaseTableSwap:
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"seed_a.csv": seed_a_csv}
+
+    @staticmethod
+    def _row_count(project, name):
+        relation = relation_from_name(project.adapter, name)
+        return project.run_sql(f"select count(*) from {relation}", fetch="one")[0]
+
+    @staticmethod
+    def _relation_names(project):
+        rows = project.run_sql(
+            f"select table_name from information_schema.tables where table_schema = '{project.test_schema}'",
+            fetch="all",
+        )
+        return {row[0] for row in rows}
+
+
+class TestTableSwap(BaseTableSwap):
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"model_a.sql": model_a_sql}
+
+    def test_swap(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run"])
+        assert self._row_count(project, "model_a") == 3
+
+        results, stdout = run_dbt_and_capture(["--debug", "run", "--vars", "max_id: 2"])
+        assert len(results) == 1
+        assert "swap with" in stdout
+        assert self._row_count(project, "model_a") == 2
+
+        # Neither the shadow relation nor a backup are left behind
+        assert self._relation_names(project) == {"seed_a", "model_a"}
+
+
+class TestTableSwapKeepBackup(BaseTableSwap):
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"model_a.sql": model_a_keep_backup_sql}
+
+    def test_keep_backup(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run"])
+        run_dbt(["run", "--vars", "max_id: 2"])
+
+        assert self._row_count(project, "model_a") == 2
+        assert self._row_count(project, "model_a__dbt_backup") == 3
+
+        # The previous backup is replaced
+        run_dbt(["run", "--vars", "max_id: 1"])
+        assert self._row_count(project, "model_a") == 1
+        assert self._row_count(project, "model_a__dbt_backup") == 2
+
+
+class TestViewToTable(BaseTableSwap):
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"model_a.sql": view_a_sql}
+
+    def test_view_replaced(self, project):
+        run_dbt(["seed"])
+        run_dbt(["run"])
+
+        write_file(model_a_sql, project.project_root, "models", "model_a.sql")
+        run_dbt(["run"])
+
+        assert self._row_count(project, "model_a") == 3
+        assert self._relation_names(project) == {"seed_a", "model_a"}
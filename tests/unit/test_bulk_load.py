@@ -0,0 +1,158 @@
+import json
+from types import SimpleNamespace
+
+import agate
+import pytest
+from dbt.exceptions import DbtRuntimeError
+from dbt_common.exceptions import DbtDatabaseError
+
+from dbt.adapters.starrocks import impl
+
+from dbt.adapters.starrocks.helpers import bulk_load
+from dbt.adapters.starrocks.helpers.bulk_load import LoadReport, iter_source_rows, source_format
+from dbt.adapters.starrocks.helpers.stream_load import StreamLoadResult
+from dbt.adapters.starrocks.impl import StarRocksAdapter
+
+
+def _read(*args, **kwargs):
+    column_names, rows = iter_source_rows(*args, **kwargs)
+    return column_names, list(rows)
+
+
+class TestSourceRows:
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / "extract.csv"
+        path.write_text("id,name\n1,a\n2,\n")
+
+        assert _read(str(path)) == (["id", "name"], [("1", "a"), ("2", None)])
+        assert _read(str(path), columns=["name"]) == (["name"], [("a",), (None,)])
+        with pytest.raises(DbtRuntimeError, match="Columns other not found"):
+            iter_source_rows(str(path), columns=["other"])
+
+    def test_csv_ragged_row(self, tmp_path):
+        path = tmp_path / "extract.csv"
+        path.write_text("id,name\n1,a\n2\n")
+
+        with pytest.raises(DbtRuntimeError, match="Line 3 of .*extract.csv has 1 values, expected 2"):
+            _read(str(path), columns=["name"])
+
+    def test_csv_bom(self, tmp_path):
+        path = tmp_path / "extract.csv"
+        path.write_bytes("id,name\n1,a\n".encode("utf-8-sig"))
+
+        assert _read(str(path), columns=["id"]) == (["id"], [("1",)])
+
+    @pytest.mark.parametrize(
+        "content",
+        ['[{"id": 1, "name": "a"}, {"id": 2}]', '{"id": 1, "name": "a"}\n\n{"id": 2}\n'],
+    )
+    def test_json(self, tmp_path, content):
+        path = tmp_path / "extract.json"
+        path.write_text(content)
+
+        assert _read(str(path)) == (["id", "name"], [(1, "a"), (2, None)])
+
+    def test_json_array_read_incrementally(self, tmp_path, monkeypatch):
+        rows = [{"id": i, "name": f"a, ]{i}", "tags": [i, [i]], "score": i * 10} for i in range(200)]
+        path = tmp_path / "extract.json"
+        path.write_text(" \n" + json.dumps(rows, indent=2))
+        # Values span several reads
+        monkeypatch.setattr(bulk_load, "JSON_READ_SIZE", 7)
+
+        assert _read(str(path)) == (
+            ["id", "name", "tags", "score"], [(r["id"], r["name"], r["tags"], r["score"]) for r in rows]
+        )
+
+    @pytest.mark.parametrize("content", ["[]", " [ ] "])
+    def test_json_empty_array(self, tmp_path, content):
+        path = tmp_path / "extract.json"
+        path.write_text(content)
+
+        assert _read(str(path)) == ([], [])
+
+    @pytest.mark.parametrize("content", ['[{"id": 1} {"id": 2}]', '[{"id": 1},]', '[{"id": 1}', '[{"id": 1'])
+    def test_json_invalid_array(self, tmp_path, content):
+        path = tmp_path / "extract.json"
+        path.write_text(content)
+
+        with pytest.raises(DbtRuntimeError, match="Invalid JSON array in .*extract.json"):
+            _read(str(path))
+
+    def test_parquet(self, tmp_path):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as parquet
+
+        path = tmp_path / "extract.data"
+        parquet.write_table(pyarrow.table({"id": [1, 2], "name": ["a", None]}), str(path))
+
+        assert _read(str(path), "parquet") == (["id", "name"], [(1, "a"), (2, None)])
+
+    def test_rows(self):
+        assert _read([{"id": 1, "name": "a"}]) == (["id", "name"], [(1, "a")])
+        assert _read([(1, "a")], columns=["id", "name"]) == (["id", "name"], [(1, "a")])
+        assert _read([]) == ([], [])
+        with pytest.raises(DbtRuntimeError, match="requires their `columns`"):
+            iter_source_rows([(1, "a")])
+
+        table = agate.Table([(1, "a")], column_names=["id", "name"])
+        assert _read(table, columns=["name"]) == (["name"], [("a",)])
+
+    def test_format(self):
+        assert source_format("extract.NDJSON") == "json"
+        assert source_format([]) is None
+        with pytest.raises(DbtRuntimeError, match="Unknown format"):
+            source_format("extract.txt")
+
+
+class TestLoadReport:
+
+    def test_from_results(self):
+        report = LoadReport.from_results([
+            StreamLoadResult(label="l_0", status="Success", rows_loaded=2, load_bytes=10, load_time_ms=3),
+            StreamLoadResult(label="l_1", status="Success", rows_loaded=1, rows_filtered=1, load_bytes=5,
+                             load_time_ms=4, error_url="http://be/err"),
+        ])
+
+        assert report.to_dict() == {
+            "method": "stream_load", "rows_loaded": 3, "rows_filtered": 1, "rows_unselected": 0, "load_bytes": 15,
+            "load_time_ms": 7, "labels": ("l_0", "l_1"), "error_urls": ("http://be/err",), "chunks": 2,
+        }
+        assert json.dumps(report.to_dict())
+
+
+class TestInsertFallback:
+
+    def test_batches_are_labelled(self, monkeypatch):
+        monkeypatch.setattr(impl, "INSERT_BATCH_SIZE", 2)
+        statements = []
+
+        def add_query(sql, bindings=None, abridge_sql_log=False):
+            statements.append(sql)
+            if "`extract_1`" in sql:
+                # Loaded by a previous attempt
+                raise DbtDatabaseError("Label [extract_1] has already been used.")
+
+        adapter = StarRocksAdapter.__new__(StarRocksAdapter)
+        adapter.config = SimpleNamespace(credentials=SimpleNamespace(stream_load_port=None))
+        adapter.connections = SimpleNamespace(add_query=add_query)
+        relation = SimpleNamespace(schema="my_db", identifier="audit", render=lambda: "`my_db`.`audit`")
+
+        report = adapter.bulk_load(relation, [{"id": i} for i in range(5)], label="extract")
+
+        assert report.method == "insert"
+        assert report.rows_loaded == 5
+        assert report.labels == ("extract_0", "extract_1", "extract_2")
+        assert statements[0] == "insert into `my_db`.`audit` with label `extract_0` (`id`) values (%s), (%s)"
+
+    def test_other_errors_are_raised(self):
+        def add_query(sql, bindings=None, abridge_sql_log=False):
+            raise DbtDatabaseError("Column count doesn't match value count")
+
+        adapter = StarRocksAdapter.__new__(StarRocksAdapter)
+        adapter.config = SimpleNamespace(credentials=SimpleNamespace(stream_load_port=None))
+        adapter.connections = SimpleNamespace(add_query=add_query)
+        relation = SimpleNamespace(schema="my_db", identifier="audit", render=lambda: "`my_db`.`audit`")
+
+        with pytest.raises(DbtDatabaseError):
+            adapter.bulk_load(relation, [{"id": 1}], label="extract")
@@ -0,0 +1,139 @@
+import base64
+
+import pytest
+
+flight = pytest.importorskip("pyarrow.flight")
+import pyarrow
+from dbt_common.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks.connections import StarRocksConnectionManager
+from dbt.adapters.starrocks.helpers.flight import (
+    FlightSQLClient,
+    decode_statement_query,
+    encode_statement_query,
+    is_flight_query,
+    iter_arrow_rows,
+)
+
+USERNAME = "root"
+PASSWORD = "secret"
+TOKEN = "stand-in-token"
+
+
+class BasicAuthMiddleware(flight.ServerMiddleware):
+    def sending_headers(self):
+        return {"authorization": f"Bearer {TOKEN}"}
+
+
+class BasicAuthMiddlewareFactory(flight.ServerMiddlewareFactory):
+    """Mimics the FE authentication: basic credentials are exchanged for a bearer token."""
+
+    def start_call(self, info, headers):
+        auth = next(iter(headers.get("authorization", [])), "")
+        if auth == f"Bearer {TOKEN}":
+            return None
+        if auth.startswith("Basic "):
+            username, password = base64.b64decode(auth[6:]).decode().split(":", 1)
+            if (username, password) == (USERNAME, PASSWORD):
+                return BasicAuthMiddleware()
+        raise flight.FlightUnauthenticatedError("invalid credentials")
+
+
+class NoOpAuthHandler(flight.ServerAuthHandler):
+    def authenticate(self, outgoing, incoming):
+        pass
+
+    def is_valid(self, token):
+        return ""
+
+
+class StandInFlightSQLServer(flight.FlightServerBase):
+    """Serves canned results for Flight SQL statement queries, split in several record batches."""
+
+    def __init__(self, results):
+        super().__init__(
+            "grpc://127.0.0.1:0",
+            auth_handler=NoOpAuthHandler(),
+            middleware={"auth": BasicAuthMiddlewareFactory()},
+        )
+        self.results = results
+        self.queries = []
+
+    def get_flight_info(self, context, descriptor):
+        sql = decode_statement_query(descriptor.command)
+        self.queries.append(sql)
+        table = self.results[sql]
+        endpoint = flight.FlightEndpoint(sql.encode(), ["arrow-flight-reuse-connection://?"])
+        return flight.FlightInfo(table.schema, descriptor, [endpoint], table.num_rows, -1)
+
+    def do_get(self, context, ticket):
+        table = self.results[ticket.ticket.decode()]
+        return flight.RecordBatchStream(pyarrow.Table.from_batches(table.to_batches(max_chunksize=2)))
+
+
+@pytest.fixture
+def server():
+    results = {
+        "select id, name from t": pyarrow.table({"id": [1, 2, 3, 4, 5], "name": list("abcde")}),
+        "select /*+ SET_VAR(sql_select_limit = 3) */ id, name from t": pyarrow.table(
+            {"id": [1, 2, 3], "name": list("abc")}
+        ),
+    }
+    with StandInFlightSQLServer(results) as server:
+        yield server
+
+
+class TestFlightSQL:
+
+    def test_statement_query_roundtrip(self):
+        sql = "select * from `db`.`t` where name = 'é'" * 20
+        assert decode_statement_query(encode_statement_query(sql)) == sql
+
+    @pytest.mark.parametrize(
+        "sql, expected",
+        [
+            ("select 1", True),
+            ("/* {\"app\": \"dbt\"} */\n  with a as (select 1) select * from a", True),
+            ("insert into t select 1", False),
+            ("create table t as select 1", False),
+        ]
+    )
+    def test_is_flight_query(self, sql, expected):
+        assert is_flight_query(sql) == expected
+
+    def test_query_returns_record_batches(self, server):
+        client = FlightSQLClient("127.0.0.1", server.port, USERNAME, PASSWORD)
+
+        table = client.query("select id, name from t")
+
+        assert table.num_rows == 5
+        assert len(table.to_batches()) == 3
+        assert list(iter_arrow_rows(table))[:2] == [(1, "a"), (2, "b")]
+        assert server.queries == ["select id, name from t"]
+
+    def test_stream(self, server):
+        client = FlightSQLClient("127.0.0.1", server.port, USERNAME, PASSWORD)
+
+        batches = list(client.stream("select id, name from t"))
+
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+
+    def test_stream_rows_opt_in(self, server, monkeypatch):
+        client = FlightSQLClient("127.0.0.1", server.port, USERNAME, PASSWORD)
+        manager = StarRocksConnectionManager.__new__(StarRocksConnectionManager)
+        monkeypatch.setattr(manager, "_flight_client", lambda: client)
+        monkeypatch.setattr(manager, "_add_query_comment", lambda sql: sql)
+
+        rows = list(manager.stream("select id, name from t", limit=3, arrow=True))
+
+        assert rows == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"}]
+        assert server.queries == ["select /*+ SET_VAR(sql_select_limit = 3) */ id, name from t"]
+
+        with pytest.raises(DbtRuntimeError):
+            list(manager.stream("insert into t select 1", arrow=True))
+
+    def test_invalid_credentials(self, server):
+        client = FlightSQLClient("127.0.0.1", server.port, USERNAME, "wrong")
+
+        with pytest.raises(flight.FlightUnauthenticatedError):
+            client.query("select id, name from t")
@@ -0,0 +1,201 @@
+import threading
+import time
+
+import pytest
+
+from dbt.adapters.starrocks.helpers.materialized_view import (
+    configuration_changes,
+    definition_changed,
+    definition_comment,
+    definition_hash,
+    normalize_refresh,
+    parse_create_materialized_view,
+    parse_definition_hash,
+    refresh_statement,
+    run_in_dependency_order,
+    upstream_materialized_views,
+)
+
+
+SQL = "select id, sum(value) as total from `my_db`.`my_table` group by id"
+HASH = definition_hash(SQL, None, ["id"], 4)
+
+SHOW_CREATE = f'''CREATE MATERIALIZED VIEW `my_mv` (`id`, `total`)
+COMMENT "dbt_definition:{HASH}"
+DISTRIBUTED BY HASH(`id`) BUCKETS 4
+REFRESH ASYNC START("2024-01-01 10:00:00") EVERY(INTERVAL 1 DAY)
+PROPERTIES (
+"replication_num" = "1",
+"session.query_timeout" = "600",
+"storage_medium" = "HDD"
+)
+AS SELECT `my_table`.`id`, sum(`my_table`.`value`) AS `total`
+FROM `my_db`.`my_table` WHERE `my_table`.`name` = "PROPERTIES ("
+GROUP BY `my_table`.`id`;'''
+
+REFRESH = "async start('2024-01-01 10:00:00') every (interval 1 day)"
+
+LEGACY_SQL = """
+-- Daily totals
+select id, date_trunc('day', dt) as dt, count(*) as total
+from `my_db`.`events`
+where status = 'ok'
+group by id, date_trunc('day', dt)
+"""
+
+LEGACY_SHOW_CREATE = '''CREATE MATERIALIZED VIEW `my_mv` (`id`, `dt`, `total`)
+PARTITION BY (date_trunc('day', `dt`))
+DISTRIBUTED BY HASH(`id`) BUCKETS 4
+REFRESH MANUAL
+PROPERTIES (
+"replication_num" = "1"
+)
+AS select id, date_trunc('day', dt) as dt, count(*) as total
+from `my_db`.`events`
+where status = 'ok'
+group by id, date_trunc('day', dt);'''
+
+
+class TestMaterializedViewChanges:
+
+    def test_parse(self):
+        deployed = parse_create_materialized_view(SHOW_CREATE)
+
+        assert deployed.definition_hash == HASH
+        assert normalize_refresh(deployed.refresh) == normalize_refresh(REFRESH)
+        assert deployed.properties == {
+            "replication_num": "1", "session.query_timeout": "600", "storage_medium": "HDD"
+        }
+
+    def test_unchanged(self):
+        deployed = parse_create_materialized_view(SHOW_CREATE)
+
+        # Properties set by default are not compared
+        assert configuration_changes(deployed, SQL, None, ["id"], 4, REFRESH, {"session.query_timeout": 600}) is None
+
+    def test_alterable_changes(self):
+        deployed = parse_create_materialized_view(SHOW_CREATE)
+
+        assert configuration_changes(deployed, SQL, None, ["id"], 4, "manual", {"session.query_timeout": "900"}) == {
+            "rebuild": False, "refresh": "manual", "properties": {"session.query_timeout": "900"}
+        }
+
+    def test_definition_changes(self):
+        deployed = parse_create_materialized_view(SHOW_CREATE)
+
+        assert definition_hash(SQL + " having total > 0", None, ["id"], 4) != HASH
+        assert definition_hash(SQL, None, ["id"], 8) != HASH
+        assert configuration_changes(deployed, SQL, None, ["id"], 8, REFRESH, None)["rebuild"]
+
+    def test_comment_with_description(self):
+        # The description of the model precedes the hash, e.g. with `persist_docs`
+        comment = definition_comment(HASH, 'Totals per "id"\nsee dbt_definition:0123 ')
+        assert comment == f'Totals per \\"id\\"\nsee dbt_definition:0123 dbt_definition:{HASH}'
+        assert parse_definition_hash(comment) == HASH
+
+        deployed = parse_create_materialized_view(
+            SHOW_CREATE.replace(f'COMMENT "dbt_definition:{HASH}"', f'COMMENT "{comment}"')
+        )
+        assert deployed.definition_hash == HASH
+        assert configuration_changes(deployed, SQL, None, ["id"], 4, REFRESH, None) is None
+
+    def test_hash_only_read_from_comment(self):
+        deployed = parse_create_materialized_view(
+            f"CREATE MATERIALIZED VIEW `my_mv` COMMENT \"Totals\" REFRESH MANUAL AS SELECT 'dbt_definition:{HASH}'"
+        )
+
+        assert deployed.definition_hash is None
+
+    def test_not_created_by_dbt(self):
+        deployed = parse_create_materialized_view("CREATE MATERIALIZED VIEW `my_mv` REFRESH MANUAL AS SELECT 1")
+
+        assert deployed.definition_hash is None
+        assert configuration_changes(deployed, SQL, None, ["id"], 4, "manual", None)["rebuild"]
+
+    @pytest.mark.parametrize(
+        "sql, partition_by, distributed_by, buckets, changed",
+        [
+            (LEGACY_SQL, ["date_trunc('day', dt)"], ["id"], 4, False),
+            (LEGACY_SQL.upper().replace("'DAY'", "'day'").replace("'OK'", "'ok'"), ["date_trunc('day', dt)"], ["id"], None, False),
+            # Compared tokens keep the case of string literals
+            (LEGACY_SQL.replace("'ok'", "'OK'"), ["date_trunc('day', dt)"], ["id"], 4, True),
+            (LEGACY_SQL + " having count(*) > 1", ["date_trunc('day', dt)"], ["id"], 4, True),
+            (LEGACY_SQL, ["dt"], ["id"], 4, True),
+            (LEGACY_SQL, None, ["id"], 4, True),
+            (LEGACY_SQL, ["date_trunc('day', dt)"], ["dt"], 4, True),
+            (LEGACY_SQL, ["date_trunc('day', dt)"], ["id"], 8, True),
+        ]
+    )
+    def test_without_definition_hash(self, sql, partition_by, distributed_by, buckets, changed):
+        # Views created before the hash got stored are compared with their definition instead
+        deployed = parse_create_materialized_view(LEGACY_SHOW_CREATE)
+
+        assert deployed.definition_hash is None
+        assert definition_changed(deployed, sql, partition_by, distributed_by, buckets) == changed
+        changes = configuration_changes(deployed, sql, partition_by, distributed_by, buckets, "manual", None)
+        assert (changes is not None and changes["rebuild"]) == changed
+
+
+class TestRefresh:
+
+    def test_refresh_statement(self):
+        assert refresh_statement("`db`.`mv`") == "refresh materialized view `db`.`mv` with async mode"
+        assert refresh_statement("`db`.`mv`", "2024-01-01", "2024-02-01", force=True) == (
+            "refresh materialized view `db`.`mv` partition start ('2024-01-01') end ('2024-02-01') force with async mode"
+        )
+        with pytest.raises(ValueError):
+            refresh_statement("`db`.`mv`", start="2024-01-01")
+
+    def test_upstream_materialized_views(self):
+        depends_on = {
+            "mv_a": ["source"],
+            "view_b": ["mv_a"],
+            "mv_c": ["view_b", "mv_a"],
+            "mv_d": ["source"],
+        }
+
+        assert upstream_materialized_views(depends_on, ["mv_a", "mv_c", "mv_d"]) == {
+            "mv_a": set(), "mv_c": {"mv_a"}, "mv_d": set()
+        }
+
+
+class TestRunInDependencyOrder:
+
+    def test_order_and_parallelism(self):
+        lock = threading.Lock()
+        order, running, peak = [], [0], [0]
+
+        def run(node):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+                order.append(node)
+            return node.upper()
+
+        dependencies = {"a": [], "b": [], "c": [], "d": ["a", "b"], "e": ["d"]}
+        outcomes = run_in_dependency_order(dependencies, run, parallelism=2)
+
+        assert outcomes["e"] == ("success", "E")
+        assert peak[0] == 2
+        assert order.index("d") > max(order.index("a"), order.index("b"))
+        assert order.index("e") > order.index("d")
+
+    def test_failures_skip_downstream(self):
+        def run(node):
+            if node == "a":
+                raise RuntimeError("boom")
+            return node
+
+        outcomes = run_in_dependency_order({"a": [], "b": ["a"], "c": ["b"], "d": []}, run, parallelism=4)
+
+        assert outcomes["a"][0] == "error"
+        assert outcomes["b"] == ("skipped", None)
+        assert outcomes["c"] == ("skipped", None)
+        assert outcomes["d"] == ("success", "d")
+
+    def test_cycle(self):
+        with pytest.raises(ValueError):
+            run_in_dependency_order({"a": ["b"], "b": ["a"]}, lambda node: node, parallelism=1)
@@ -0,0 +1,151 @@
+import datetime
+import decimal
+
+import pytest
+from dbt.adapters.capability import Capability
+from dbt.adapters.contracts.connection import AdapterResponse
+from dbt.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks.helpers.partitions import (
+    group_partitions,
+    parse_range,
+    partition_literal,
+    range_partitions_from_rows,
+)
+from dbt.adapters.starrocks.impl import MICROBATCH_SUPPORTED, StarRocksAdapter
+
+
+def _range(column_type, lower, upper):
+    return f"[types: [{column_type}]; keys: [{lower}]; ..types: [{column_type}]; keys: [{upper}]; )"
+
+
+def _rows(*bounds, column_type="DATE", key="dt"):
+    return [
+        {"PartitionName": f"p{i}", "PartitionKey": key, "Range": _range(column_type, lower, upper)}
+        for i, (lower, upper) in enumerate(bounds)
+    ]
+
+
+MONTHS = _rows(("2024-01-01", "2024-02-01"), ("2024-02-01", "2024-03-01"), ("2024-03-01", "2024-04-01"))
+
+
+class TestRangePartitions:
+
+    def test_parse_range(self):
+        assert parse_range(_range("DATE", "2024-01-01", "2024-02-01")) == ("DATE", "2024-01-01", "2024-02-01")
+        assert parse_range("") is None
+
+    def test_not_range_partitioned(self):
+        # Unpartitioned tables have a single partition without key
+        assert range_partitions_from_rows([{"PartitionName": "t", "PartitionKey": "", "Range": ""}]) is None
+        # Multi-column partitions
+        assert range_partitions_from_rows(_rows(("2024-01-01", "2024-02-01"), key="dt, id")) is None
+        assert range_partitions_from_rows([]) is None
+
+    def test_sorted(self):
+        partitions = range_partitions_from_rows(list(reversed(MONTHS)))
+
+        assert partitions.column == "dt"
+        assert [p.name for p in partitions.partitions] == ["p0", "p1", "p2"]
+
+    @pytest.mark.parametrize(
+        "min_value, max_value, expected",
+        [
+            (datetime.date(2024, 1, 15), datetime.date(2024, 1, 20), ["p0"]),
+            (datetime.date(2024, 1, 31), datetime.date(2024, 2, 1), ["p0", "p1"]),
+            (datetime.datetime(2024, 2, 3, 10), datetime.datetime(2024, 3, 31, 23), ["p1", "p2"]),
+            (None, None, []),
+            # Not covered by existing partitions
+            (datetime.date(2023, 12, 31), datetime.date(2024, 1, 2), None),
+            (datetime.date(2024, 3, 1), datetime.date(2024, 4, 1), None),
+        ]
+    )
+    def test_select(self, min_value, max_value, expected):
+        selected = range_partitions_from_rows(MONTHS).select(min_value, max_value)
+
+        if expected is None:
+            assert selected is None
+        else:
+            assert [p.name for p in selected] == expected
+
+    def test_select_gap(self):
+        partitions = range_partitions_from_rows(_rows(("2024-01-01", "2024-02-01"), ("2024-03-01", "2024-04-01")))
+
+        assert partitions.select(datetime.date(2024, 1, 1), datetime.date(2024, 3, 1)) is None
+
+    def test_select_integers(self):
+        partitions = range_partitions_from_rows(_rows(("0", "100"), ("100", "200"), column_type="BIGINT", key="id"))
+
+        assert [p.name for p in partitions.select(decimal.Decimal(99), decimal.Decimal(100))] == ["p0", "p1"]
+        assert partition_literal("100", "BIGINT") == "100"
+        assert partition_literal("2024-01-01", "DATE") == "'2024-01-01'"
+
+    def test_group(self):
+        partitions = list(range_partitions_from_rows(MONTHS).partitions)
+
+        assert [[p.name for p in g] for g in group_partitions(partitions, 2)] == [["p0", "p1"], ["p2"]]
+        assert len(group_partitions(partitions, 10)) == 3
+        assert len(group_partitions(partitions, 0)) == 1
+
+
+class TestResponsePartitions:
+
+    def test_with_partitions(self):
+        response = StarRocksAdapter._with_partitions(AdapterResponse(_message="OK", rows_affected=3), ["p1", "p2"])
+
+        assert response.partitions == ["p1", "p2"]
+        assert response.rows_affected == 3
+        assert StarRocksAdapter._with_partitions(response, ["p3"]).partitions == ["p3"]
+
+
+class TestParallelOverwrite:
+
+    def test_partial_failure_is_reported(self):
+        adapter = StarRocksAdapter.__new__(StarRocksAdapter)
+        range_partitions = range_partitions_from_rows(MONTHS)
+
+        def execute_on_connection(name, sql):
+            if "`p1`" in sql:
+                raise DbtRuntimeError("Memory limit exceeded")
+            return AdapterResponse(_message="OK", rows_affected=1)
+
+        adapter._execute_on_connection = execute_on_connection
+
+        with pytest.raises(DbtRuntimeError) as e:
+            adapter.insert_overwrite_partitions(
+                "`my_db`.`my_table`", "`my_db`.`my_table__dbt_tmp`", [], range_partitions,
+                list(range_partitions.partitions), parallelism=3,
+            )
+
+        assert "Failed to overwrite partitions p1 of `my_db`.`my_table`: Memory limit exceeded" in str(e.value)
+        assert "Partitions p0, p2 were overwritten" in str(e.value)
+
+
+class TestPartitionWindow:
+
+    @pytest.mark.parametrize(
+        "start, end, expected",
+        [
+            (datetime.datetime(2024, 1, 1), datetime.datetime(2024, 2, 1), ["p0"]),
+            (datetime.datetime(2024, 2, 1), datetime.datetime(2024, 4, 1), ["p1", "p2"]),
+            # No partition yet
+            (datetime.datetime(2024, 5, 1), datetime.datetime(2024, 6, 1), []),
+            # Not aligned
+            (datetime.datetime(2024, 1, 1), datetime.datetime(2024, 1, 2), None),
+            (datetime.datetime(2024, 3, 1), datetime.datetime(2024, 5, 1), None),
+            (datetime.datetime(2024, 1, 1, 1), datetime.datetime(2024, 2, 1, 1), None),
+        ]
+    )
+    def test_window(self, start, end, expected):
+        selected = range_partitions_from_rows(MONTHS).window(start, end)
+
+        if expected is None:
+            assert selected is None
+        else:
+            assert [p.name for p in selected] == expected
+
+    def test_microbatch_concurrency(self):
+        # Only offered by dbt-core versions running microbatch models
+        assert StarRocksAdapter.supports(Capability.MicrobatchConcurrency) == MICROBATCH_SUPPORTED
+        strategies = StarRocksAdapter.__new__(StarRocksAdapter).valid_incremental_strategies()
+        assert ("microbatch" in strategies) == MICROBATCH_SUPPORTED
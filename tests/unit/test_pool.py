@@ -0,0 +1,175 @@
+import threading
+import time
+
+import pytest
+from dbt.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks.helpers.pool import ConnectionPool, close_all_pools, find_pool, get_pool
+
+
+class FakeHandle:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+        self.unread_result = False
+        self.resets = 0
+
+    def is_connected(self):
+        return self.alive
+
+    def consume_results(self):
+        self.unread_result = False
+
+    def reset_session(self):
+        if self.unread_result:
+            raise RuntimeError("Unread result found")
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+        self.alive = False
+
+
+class TestConnectionPool:
+
+    def test_reuses_released_handle(self):
+        pool = ConnectionPool(FakeHandle)
+
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        assert first is second
+        assert pool.stats.misses == 1
+        assert pool.stats.hits == 1
+
+    def test_dead_handle_is_replaced(self):
+        pool = ConnectionPool(FakeHandle)
+
+        first = pool.acquire()
+        pool.release(first)
+        first.alive = False
+        second = pool.acquire()
+
+        assert first is not second
+        assert first.closed
+        assert pool.stats.failed_checks == 1
+        assert pool.size == 1
+
+    def test_discarded_handle_is_not_reused(self):
+        pool = ConnectionPool(FakeHandle)
+
+        first = pool.acquire()
+        pool.discard(first)
+        # Releasing after a discard (cancel, then close) must be a no-op
+        pool.release(first)
+
+        assert first.closed
+        assert pool.idle_count == 0
+        assert pool.size == 0
+
+    def test_idle_eviction_keeps_min_size(self):
+        pool = ConnectionPool(FakeHandle, min_size=1, idle_timeout=0)
+
+        handles = [pool.acquire() for _ in range(3)]
+        for handle in handles:
+            pool.release(handle)
+
+        assert pool.size == 1
+        assert pool.stats.evictions == 2
+        assert sum(handle.closed for handle in handles) == 2
+
+    def test_session_is_reset_on_release(self):
+        pool = ConnectionPool(FakeHandle)
+
+        first = pool.acquire()
+        first.unread_result = True
+        pool.release(first)
+
+        assert first.resets == 1
+        assert not first.unread_result
+        assert pool.acquire() is first
+
+    def test_handle_failing_reset_is_discarded(self):
+        def reset(handle):
+            raise RuntimeError("Lost connection")
+
+        pool = ConnectionPool(FakeHandle, reset=reset)
+
+        first = pool.acquire()
+        pool.release(first)
+
+        assert first.closed
+        assert pool.idle_count == 0
+        assert pool.size == 0
+        assert pool.acquire() is not first
+
+    def test_min_size_is_opened_upfront(self):
+        pool = ConnectionPool(FakeHandle, min_size=2)
+
+        assert pool.size == 2
+        assert pool.idle_count == 2
+
+        pool.acquire()
+        assert pool.stats.hits == 1
+        assert pool.stats.misses == 0
+
+    def test_min_size_failing_connect(self):
+        def connect():
+            raise RuntimeError("Connection refused")
+
+        pool = ConnectionPool(connect, min_size=2)
+
+        assert pool.size == 0
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+
+    def test_max_size_times_out(self):
+        pool = ConnectionPool(FakeHandle, max_size=1, acquire_timeout=0.05)
+
+        pool.acquire()
+        with pytest.raises(DbtRuntimeError):
+            pool.acquire()
+
+    def test_max_size_waits_for_release(self):
+        pool = ConnectionPool(FakeHandle, max_size=1, acquire_timeout=5)
+        first = pool.acquire()
+
+        timer = threading.Timer(0.05, pool.release, args=(first,))
+        timer.start()
+        start = time.monotonic()
+        second = pool.acquire()
+        timer.join()
+
+        assert second is first
+        assert time.monotonic() - start < 5
+
+    def test_shared_across_threads(self):
+        pool = ConnectionPool(FakeHandle, max_size=4)
+
+        def borrow():
+            for _ in range(50):
+                pool.release(pool.acquire())
+
+        threads = [threading.Thread(target=borrow) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert pool.size <= 4
+        assert pool.stats.hits + pool.stats.misses == 400
+
+
+class TestPoolRegistry:
+
+    def test_find_pool(self):
+        key = ("test_find_pool",)
+        assert find_pool(key) is None
+
+        pool = get_pool(key, FakeHandle)
+
+        assert find_pool(key) is pool
+        close_all_pools()
+        # Closed pools are not found anymore, their handles get closed instead of being released to a new pool
+        assert find_pool(key) is None
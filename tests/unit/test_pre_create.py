@@ -1,7 +1,11 @@
+import os
+import pathlib
+
 import pytest
+from dbt.exceptions import DbtRuntimeError
 
 from dbt.adapters.starrocks.helpers.pre_create import (
-    is_pre_creatable, split_config_select,
+    PreCreateTemplateIndex, is_pre_creatable,
 )
 
 
@@ -48,29 +52,6 @@ select * from final"""
     def test_is_pre_creatable(self, sql):
         assert is_pre_creatable(sql) == True
 
-    @pytest.mark.parametrize("sql", [complex_dbt_str])
-    def test_split_ok(self, sql):
-        config_split, select_split = split_config_select(sql)
-        assert config_split == '  create table `jaffle_shop`.`customers__dbt_tmp`    PROPERTIES (      "replication_num" = "1"    )  '
-        assert select_split == (
-            'as '
-            'with  customers as ('
-            '    select * from `jaffle_shop`.`stg_customers`'
-            '),'
-            'orders as ('
-            '    select * from `jaffle_shop`.`stg_orders`'
-            '),'
-            'final as ('
-            '    select'
-            '        customers.customer_id,'
-            '        customers.first_name,'
-            '    from customers'
-            '    left join customer_orders'
-            '        on customers.customer_id = customer_orders.customer_id'
-            ')'
-            'select * from final'
-        )
-
     @pytest.mark.parametrize("sql", [
         # DBT-like statements
         """select
@@ -133,3 +114,90 @@ FROM `renamed`
     ])
     def test_is_not_pre_creatable(self, sql):
         assert is_pre_creatable(sql) == False
+
+
+class TestPreCreateTemplateIndex:
+
+    models = {"pre_create": {"model_a": {"insert_columns": ["id", "value"]}}}
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "models" / "pre_create").mkdir(parents=True)
+        (tmp_path / "models" / "pre_create" / "template_model_a.sql").write_text(
+            "create table {relation_name} (id BIGINT)"
+        )
+        return tmp_path
+
+    def _index(self, project, models=None):
+        return PreCreateTemplateIndex(project_root=str(project), model_paths=["models"], models=models or self.models)
+
+    def test_lookup(self, project):
+        index = self._index(project)
+
+        template = index.get("model_a")
+
+        assert template.statement == "create table {relation_name} (id BIGINT)"
+        assert template.insert_columns == ["id", "value"]
+        assert index.get("model_b") is None
+
+    def test_lookup_does_not_read_files(self, project, monkeypatch):
+        index = self._index(project)
+
+        def read_text(*args, **kwargs):
+            raise AssertionError("Template read again")
+
+        monkeypatch.setattr(pathlib.Path, "read_text", read_text)
+        assert index.get("model_a") is not None
+
+    def test_reloaded_on_change(self, project):
+        index = self._index(project)
+        path = project / "models" / "pre_create" / "template_model_a.sql"
+
+        path.write_text("create table {relation_name} (id INT)")
+        os.utime(path, (0, 12345))
+
+        assert index.get("model_a").statement == "create table {relation_name} (id INT)"
+
+    def test_only_changed_template_reloaded(self, project):
+        models = {"pre_create": {"model_a": {"insert_columns": ["id"]}, "model_b": {"insert_columns": ["id"]}}}
+        (project / "models" / "pre_create" / "template_model_b.sql").write_text("create table {relation_name} (id INT)")
+        index = self._index(project, models=models)
+        path = project / "models" / "pre_create" / "template_model_a.sql"
+        read = []
+        read_text = pathlib.Path.read_text
+
+        path.write_text("create table {relation_name} (id INT)")
+        os.utime(path, (0, 12345))
+        with pytest.MonkeyPatch.context() as m:
+            m.setattr(pathlib.Path, "read_text", lambda p, *args, **kwargs: read.append(p.name) or read_text(p))
+            assert index.get("model_a").statement == "create table {relation_name} (id INT)"
+            assert index.get("model_b") is not None
+
+        assert read == ["template_model_a.sql"]
+
+    def test_removed_template(self, project):
+        index = self._index(project)
+
+        (project / "models" / "pre_create" / "template_model_a.sql").unlink()
+
+        with pytest.raises(DbtRuntimeError):
+            index.get("model_a")
+
+    @pytest.mark.parametrize("statement", [
+        "create table my_table (id BIGINT)",
+        "create table {relation_name} (id BIGINT) properties ({other})",
+    ])
+    def test_validated_upfront(self, project, statement):
+        (project / "models" / "pre_create" / "template_model_a.sql").write_text(statement)
+
+        with pytest.raises(DbtRuntimeError):
+            self._index(project)
+
+    def test_missing_template(self, project):
+        index = self._index(project, models={"pre_create": {"model_b": {"insert_columns": ["id"]}}})
+
+        with pytest.raises(DbtRuntimeError):
+            index.get("model_b")
+
+    def test_no_configured_model(self, project):
+        assert self._index(project, models={"my_domain": {}}).models == []
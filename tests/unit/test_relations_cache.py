@@ -0,0 +1,16 @@
+from dbt.adapters.starrocks.impl import StarRocksAdapter
+from dbt.adapters.starrocks.relation import StarRocksRelation
+
+
+class TestRelationsCache:
+
+    def test_schema_chunks(self):
+        schemas = {StarRocksRelation.create(schema=f"schema_{i:03}") for i in range(250)}
+        schemas.add(StarRocksRelation.create(schema=None))
+
+        chunks = StarRocksAdapter._schema_chunks(schemas, 100)
+
+        assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+        assert chunks[0][0] == "schema_000"
+        assert chunks[2][-1] == "schema_249"
+        assert StarRocksAdapter._schema_chunks(set(), 100) == []
@@ -0,0 +1,40 @@
+import pytest
+
+from dbt.adapters.starrocks.helpers.resumable import (
+    normalize_relation_name,
+    resumable_task_id,
+    task_id_prefix,
+)
+
+
+class TestNormalizeRelationName:
+
+    def test_normalize(self):
+        assert normalize_relation_name("`my_db` . `My_Table`") == "my_db.my_table"
+
+
+class TestResumableTaskId:
+
+    def test_deterministic(self):
+        prefix = task_id_prefix("run_1", "model.project.my_model", "my_db.my_table")
+
+        assert prefix == task_id_prefix("run_1", "model.project.my_model", "my_db.my_table")
+        assert resumable_task_id(prefix, "insert into t select 1") == resumable_task_id(prefix, "insert into t select 1")
+
+    def test_distinct(self):
+        prefix = task_id_prefix("run_1", "model.project.my_model", "my_db.my_table")
+        ids = {
+            prefix,
+            task_id_prefix("run_2", "model.project.my_model", "my_db.my_table"),
+            task_id_prefix("run_1", "model.project.other_model", "my_db.my_table"),
+            task_id_prefix("run_1", "model.project.my_model", "my_db.other_table"),
+        }
+
+        assert len(ids) == 4
+        assert resumable_task_id(prefix, "select 1") != resumable_task_id(prefix, "select 2")
+
+    def test_valid_task_name(self):
+        task_id = resumable_task_id(task_id_prefix("run_1", "model.project.my_model", "my_db.my_table"), "select 1")
+
+        assert task_id.startswith(task_id_prefix("run_1", "model.project.my_model", "my_db.my_table") + "_")
+        assert task_id.replace("_", "").isalnum()
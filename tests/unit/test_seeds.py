@@ -0,0 +1,99 @@
+import datetime
+import decimal
+import tracemalloc
+
+import pytest
+from dbt.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks.helpers.seeds import (
+    SEED_HASH_MARKER,
+    iter_seed_rows,
+    parse_seed_hash,
+    read_seed_sample,
+    seed_hash,
+)
+
+
+class TestSeedHash:
+
+    def test_hash(self, tmp_path):
+        path = tmp_path / "my_seed.csv"
+        path.write_text("id,name\n1,a\n")
+        file_hash = seed_hash(str(path), {"id": "bigint"})
+
+        assert seed_hash(str(path), {"id": "bigint"}) == file_hash
+        # The configs changing how the file is loaded change the hash
+        assert seed_hash(str(path), {"id": "int"}) != file_hash
+        assert seed_hash(str(path), {"id": "bigint"}, delimiter="|") != file_hash
+
+        path.write_text("id,name\n1,b\n")
+        assert seed_hash(str(path), {"id": "bigint"}) != file_hash
+
+    def test_parse(self):
+        assert parse_seed_hash(f"{SEED_HASH_MARKER}0123abcd") == "0123abcd"
+        assert parse_seed_hash("a table") is None
+        assert parse_seed_hash(None) is None
+
+
+class TestStreamedSeed:
+
+    def test_sample(self, tmp_path):
+        path = tmp_path / "my_seed.csv"
+        path.write_text("id,name,day,flag\n1,a,2024-01-01,true\n2,,2024-01-02,false\n3,c,2024-01-03,\n")
+
+        sample = read_seed_sample(str(path), {"name": "varchar(10)"}, sample_size=2)
+
+        assert len(sample.rows) == 2
+        assert [type(c.data_type).__name__ for c in sample.columns] == ["Number", "Text", "Date", "Boolean"]
+        assert list(iter_seed_rows(str(path), sample)) == [
+            (decimal.Decimal(1), "a", datetime.date(2024, 1, 1), True),
+            (decimal.Decimal(2), None, datetime.date(2024, 1, 2), False),
+            (decimal.Decimal(3), "c", datetime.date(2024, 1, 3), None),
+        ]
+
+    def test_type_mismatch(self, tmp_path):
+        path = tmp_path / "my_seed.csv"
+        path.write_text("id\n1\n2\nthree\n")
+
+        sample = read_seed_sample(str(path), {}, sample_size=2)
+
+        with pytest.raises(DbtRuntimeError, match="Line 4 .*column_types"):
+            list(iter_seed_rows(str(path), sample))
+
+    def test_ragged_row(self, tmp_path):
+        path = tmp_path / "my_seed.csv"
+        path.write_text("id,name\n1,a\n2\n")
+
+        sample = read_seed_sample(str(path), {}, sample_size=1)
+
+        with pytest.raises(DbtRuntimeError, match="Line 3 of .*my_seed.csv has 1 values, expected 2"):
+            list(iter_seed_rows(str(path), sample))
+        with pytest.raises(DbtRuntimeError, match="Line 3 "):
+            read_seed_sample(str(path), {})
+
+    def test_bom(self, tmp_path):
+        path = tmp_path / "my_seed.csv"
+        path.write_bytes("id,name\n1,a\n".encode("utf-8-sig"))
+
+        sample = read_seed_sample(str(path), {})
+
+        assert sample.column_names == ("id", "name")
+        assert list(iter_seed_rows(str(path), sample)) == [(decimal.Decimal(1), "a")]
+
+    def test_constant_memory(self, tmp_path):
+        path = tmp_path / "large_seed.csv"
+        with open(path, "w") as f:
+            f.write("id,name,amount\n")
+            for i in range(100_000):
+                f.write(f"{i},name {i},{i}.5\n")
+
+        tracemalloc.start()
+        try:
+            sample = read_seed_sample(str(path), {}, sample_size=100)
+            count = sum(1 for _ in iter_seed_rows(str(path), sample))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == 100_000
+        assert peak < path.stat().st_size / 10
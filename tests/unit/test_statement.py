@@ -0,0 +1,188 @@
+import re
+import timeit
+from types import SimpleNamespace
+
+import pytest
+from dbt.adapters.contracts.connection import AdapterResponse
+from dbt.adapters.sql import SQLAdapter
+
+from dbt.adapters.starrocks import impl
+from dbt.adapters.starrocks.helpers import pre_create
+from dbt.adapters.starrocks.helpers.pre_create import PreCreateTemplateIndex, create_adapter, is_pre_creatable
+from dbt.adapters.starrocks.helpers.statement import (
+    CACHE_SELECT,
+    CREATE_TABLE,
+    CREATE_TABLE_AS,
+    INSERT_INTO,
+    INSERT_OVERWRITE,
+    OTHER,
+    QUERY,
+    classify_statement,
+    find_keyword,
+)
+from dbt.adapters.starrocks.impl import StarRocksAdapter
+
+
+class TestClassifyStatement:
+
+    @pytest.mark.parametrize(
+        "sql, kind, target, body",
+        [
+            (
+                """/* {"app": "dbt"} */ create table `my_db`.`my_table__dbt_tmp`
+                PROPERTIES ("replication_num" = "1") as with x as (select 1) select * from x""",
+                CREATE_TABLE_AS, ("my_db", "my_table__dbt_tmp"), "with x as",
+            ),
+            ("create table if not exists my_db.my_table (id) as (select 1)", CREATE_TABLE_AS, ("my_db", "my_table"), "(select 1)"),
+            ("create table `my_db`.`my_table` (`id` int) properties ('a' = 'b')", CREATE_TABLE, ("my_db", "my_table"), None),
+            (
+                "insert /*+SET_VAR(dynamic_overwrite = true)*/ overwrite `my_db`.`my_table` partition(p1) (a, b) select 1",
+                INSERT_OVERWRITE, ("my_db", "my_table"), "select 1",
+            ),
+            ("insert into my_db.my_table with label lbl (a) values (1)", INSERT_INTO, ("my_db", "my_table"), "values (1)"),
+            ("insert into my_db.my_table with x as (select 1) select * from x", INSERT_INTO, ("my_db", "my_table"), "with x as"),
+            ("-- comment\n cache select * from my_db.my_table", CACHE_SELECT, None, "select * f"),
+            ("WITH x as (select 1) select * from x", QUERY, None, "WITH x as "),
+            ("show tables", OTHER, None, None),
+            ("create view `my_db`.`my_view` as select 1", OTHER, None, None),
+            ("", OTHER, None, None),
+        ]
+    )
+    def test_classify(self, sql, kind, target, body):
+        statement = classify_statement(sql)
+
+        assert statement.kind == kind
+        assert statement.target == target
+        if body is None:
+            assert statement.body_offset is None
+        else:
+            assert sql[statement.body_offset:].startswith(body)
+
+    @pytest.mark.parametrize(
+        "sql, partitions",
+        [
+            ("insert overwrite `my_db`.`my_table` partition (`p1`, p2) (a) select 1", ("p1", "p2")),
+            ("insert into my_db.my_table temporary partition(tp1) select 1", ("tp1",)),
+            ("insert overwrite my_db.my_table (a) select 1", None),
+        ]
+    )
+    def test_partitions(self, sql, partitions):
+        statement = classify_statement(sql)
+
+        assert statement.partitions == partitions
+        assert sql[statement.body_offset:] == "select 1"
+
+    def test_target_name(self):
+        assert classify_statement("insert into `My_Db`.`My_Table` select 1").target_name == "my_db.my_table"
+
+    @pytest.mark.parametrize(
+        "sql, expected",
+        [
+            ("select 1", "select"),
+            ("/* select */ -- select\nSELECT 1", "/* select */ -- select\nSELECT"),
+            ("with a as (select 1) select * from a", "with a as (select 1) select"),
+            ("with `select` as (select 'select') select 1", "with `select` as (select 'select') select"),
+            ("show tables", None),
+        ]
+    )
+    def test_find_keyword(self, sql, expected):
+        offset = find_keyword(sql, "select")
+
+        assert (sql[:offset] if offset is not None else None) == expected
+
+    def test_pre_create_split(self, tmp_path):
+        (tmp_path / "models" / "pre_create").mkdir(parents=True)
+        (tmp_path / "models" / "pre_create" / "template_my_model.sql").write_text(
+            "create table {relation_name} (a int)"
+        )
+        sql = (
+            "\n  create table `my_db`.`my_model__dbt_tmp`\n    PROPERTIES (\n      \"replication_num\" = \"1\"\n    )\n"
+            "  as \nwith x as (\n  select 1 as a -- one\n)\nselect * from x"
+        )
+        models = {"pre_create": {"my_model": {"insert_columns": ["a"]}}}
+
+        handler = create_adapter(sql=sql, project_root=str(tmp_path), model_paths=["models"], models=models)
+
+        assert handler.create_statement == (
+            "create table `my_db`.`my_model__dbt_tmp` (a int)\n    PROPERTIES (\n      \"replication_num\" = \"1\"\n    )"
+        )
+        # Line comments are kept on their own line
+        assert handler.insert_statement == (
+            "insert into `my_db`.`my_model__dbt_tmp` (a) (with x as (\n  select 1 as a -- one\n)\nselect * from x)"
+        )
+
+
+def _legacy_is_submittable_etl(sql: str) -> bool:
+    sql_clean = sql.strip().replace('\n', '')
+    sql_clean = re.sub(r'\s+', ' ', sql_clean).strip().lower()
+    suitable_etl_patterns = [r'^create\s+table.*select', r'^insert\s+(into|overwrite)\b', r'^cache\s+select\b']
+    return any(re.search(pattern, sql_clean) for pattern in suitable_etl_patterns)
+
+
+def _legacy_is_pre_creatable(sql: str) -> bool:
+    sql_clean = sql.strip().replace('\n', '')
+    sql_clean = re.sub(r'\s+', ' ', sql_clean).strip().lower()
+    return bool(re.search(r'^create\s+table.*select', sql_clean))
+
+
+class TestClassifierBenchmark:
+    # A compiled model of a few MB
+    large_sql = (
+        "create table `my_db`.`my_model__dbt_tmp`\n  PROPERTIES (\n    \"replication_num\" = \"1\"\n  )\nas\nselect\n"
+        + ",\n".join(f"    case when col_{i} is null then 'n/a' else col_{i} end as col_{i}" for i in range(50_000))
+        + "\nfrom `my_db`.`my_source`"
+    )
+
+    def test_same_results(self):
+        assert StarRocksAdapter._is_submittable_etl(self.large_sql) == _legacy_is_submittable_etl(self.large_sql)
+        assert is_pre_creatable(self.large_sql) == _legacy_is_pre_creatable(self.large_sql)
+
+    def test_speedup(self):
+        def legacy():
+            _legacy_is_submittable_etl(self.large_sql)
+            _legacy_is_pre_creatable(self.large_sql)
+
+        def classifier():
+            # What `execute` does: a single classification, shared by the helpers
+            statement = classify_statement(self.large_sql)
+            StarRocksAdapter._is_submittable_etl(self.large_sql, statement)
+
+        legacy_time = min(timeit.repeat(legacy, number=1, repeat=3))
+        classifier_time = min(timeit.repeat(classifier, number=1, repeat=3))
+
+        assert len(self.large_sql) > 2_000_000
+        assert classifier_time * 10 < legacy_time
+
+    def test_classified_once_per_execute(self, tmp_path, monkeypatch):
+        (tmp_path / "models" / "pre_create").mkdir(parents=True)
+        (tmp_path / "models" / "pre_create" / "template_my_model.sql").write_text(
+            "create table {relation_name} (a int)"
+        )
+        config = SimpleNamespace(
+            project_root=str(tmp_path),
+            model_paths=["models"],
+            models={"pre_create": {"my_model": {"insert_columns": ["a"]}}},
+            credentials=SimpleNamespace(is_async=False),
+        )
+        adapter = StarRocksAdapter.__new__(StarRocksAdapter)
+        adapter.config = config
+        adapter._pre_create_templates = PreCreateTemplateIndex(config.project_root, config.model_paths, config.models)
+
+        statements = []
+        monkeypatch.setattr(
+            SQLAdapter, "execute", lambda self, sql, **kwargs: statements.append(sql) or (AdapterResponse("OK"), None)
+        )
+        calls = []
+
+        def counting_classify_statement(sql):
+            calls.append(sql)
+            return classify_statement(sql)
+
+        monkeypatch.setattr(impl, "classify_statement", counting_classify_statement)
+        monkeypatch.setattr(pre_create, "classify_statement", counting_classify_statement)
+
+        adapter.execute(self.large_sql.replace("my_model__dbt_tmp", "my_model"))
+
+        assert len(calls) == 1
+        assert statements[0] == "create table `my_db`.`my_model` (a int)\n  PROPERTIES (\n    \"replication_num\" = \"1\"\n  )"
+        assert statements[1].startswith("insert into `my_db`.`my_model` (a) select\n")
@@ -0,0 +1,177 @@
+import base64
+import datetime
+import decimal
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from dbt.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks.helpers.stream_load import StreamLoader, StreamLoadResult, json_chunks, make_label
+
+
+class StreamLoadStandIn(BaseHTTPRequestHandler):
+    """
+    Mimics Stream Load: the FE redirects to a BE, which loads JSON arrays and answers with the load result.
+    """
+    server: "StandInServer"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, code, payload=None, headers=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path.startswith("/api/"):
+            # FE
+            self._reply(307, headers={"Location": f"http://127.0.0.1:{self.server.server_port}/be{self.path}"})
+            return
+
+        label = self.headers["label"]
+        self.server.requests.append((self.path, self.headers))
+        if self.headers["Authorization"] != "Basic " + base64.b64encode(b"root:secret").decode():
+            self._reply(401)
+            return
+        if label in self.server.drop_once:
+            self.server.drop_once.remove(label)
+            self.close_connection = True
+            self.connection.close()
+            return
+        if label in self.server.labels:
+            self._reply(200, {"Label": label, "Status": "Label Already Exists", "ExistingJobStatus": "FINISHED"})
+            return
+
+        if self.headers.get("compression") == "gzip":
+            body = gzip.decompress(body)
+        rows = json.loads(body)
+        bad = [r for r in rows if r.get("id") is None]
+        if bad:
+            self._reply(200, {
+                "Label": label, "Status": "Fail", "Message": "too many filtered rows",
+                "NumberFilteredRows": len(bad), "ErrorURL": "http://be/api/_load_error_log?file=x",
+            })
+            return
+
+        self.server.labels.add(label)
+        self.server.rows.extend(rows)
+        self._reply(200, {
+            "TxnId": len(self.server.labels), "Label": label, "Status": "Success", "Message": "OK",
+            "NumberTotalRows": len(rows), "NumberLoadedRows": len(rows), "NumberFilteredRows": 0,
+            "NumberUnselectedRows": 0, "LoadBytes": len(body), "LoadTimeMs": 5,
+        })
+
+
+class StandInServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StreamLoadStandIn)
+        self.requests = []
+        self.labels = set()
+        self.rows = []
+        self.drop_once = set()
+
+
+@pytest.fixture
+def server():
+    server = StandInServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _loader(server, **kwargs):
+    return StreamLoader(
+        host="127.0.0.1", port=server.server_port, username="root", password="secret",
+        database="my_db", table="my_table", columns=["id", "name"], **kwargs,
+    )
+
+
+class TestStreamLoader:
+
+    def test_load_chunks(self, server):
+        rows = [(i, f"name {i}") for i in range(5)]
+
+        results = _loader(server, compress=True).load_chunks(json_chunks(rows, ["id", "name"], 2), "dbt_seed_x")
+
+        assert [r.label for r in results] == ["dbt_seed_x_0", "dbt_seed_x_1", "dbt_seed_x_2"]
+        assert [r.rows_loaded for r in results] == [2, 2, 1]
+        assert server.rows == [{"id": i, "name": f"name {i}"} for i in range(5)]
+
+        path, headers = server.requests[0]
+        assert path == "/be/api/my_db/my_table/_stream_load"
+        assert headers["format"] == "json"
+        assert headers["strip_outer_array"] == "true"
+        assert headers["columns"] == "`id`,`name`"
+        assert headers["compression"] == "gzip"
+
+    def test_parallel_chunks(self, server):
+        rows = [(i, f"name {i}") for i in range(10)]
+
+        results = _loader(server).load_chunks(json_chunks(rows, ["id", "name"], 1), "lbl", parallelism=4)
+
+        assert [r.label for r in results] == [f"lbl_{i}" for i in range(10)]
+        assert sorted(r["id"] for r in server.rows) == list(range(10))
+
+    def test_parallel_failure(self, server):
+        chunks = [b'[{"id": 1}]', b'[{"id": null}]', b'[{"id": 3}]']
+
+        with pytest.raises(DbtRuntimeError, match="lbl_1 failed"):
+            _loader(server).load_chunks(iter(chunks), "lbl", parallelism=2)
+
+    def test_idempotent_retry(self, server, monkeypatch):
+        monkeypatch.setattr("time.sleep", lambda _: None)
+        server.drop_once.add("lbl")
+
+        result = _loader(server).load(b'[{"id": 1, "name": "a"}]', "lbl")
+
+        assert result.rows_loaded == 1
+        # Sent again with the same label: a label already loaded isn't loaded twice
+        again = _loader(server).load(b'[{"id": 1, "name": "a"}]', "lbl")
+        assert again.already_loaded and again.succeeded
+        assert server.rows == [{"id": 1, "name": "a"}]
+
+    def test_failed_load(self, server):
+        with pytest.raises(DbtRuntimeError, match="too many filtered rows.*_load_error_log"):
+            _loader(server).load(b'[{"id": null, "name": "a"}]', "lbl")
+
+    def test_unauthorized(self, server):
+        loader = StreamLoader(
+            host="127.0.0.1", port=server.server_port, username="root", password="wrong",
+            database="my_db", table="my_table",
+        )
+
+        with pytest.raises(DbtRuntimeError, match="HTTP 401"):
+            loader.load(b"[]", "lbl")
+
+
+class TestStreamLoadHelpers:
+
+    def test_json_chunks(self):
+        rows = [(datetime.datetime(2024, 1, 1, 10), datetime.date(2024, 1, 2), decimal.Decimal("1.50"), True, None)]
+
+        (chunk,) = json_chunks(rows, ["a", "b", "c", "d", "e"], 10)
+
+        assert json.loads(chunk) == [{"a": "2024-01-01 10:00:00", "b": "2024-01-02", "c": "1.50", "d": 1, "e": None}]
+        assert list(json_chunks([], ["a"], 10)) == []
+
+    def test_make_label(self):
+        assert make_label("dbt_seed", "my db", "my.table", "1234-abcd") == "dbt_seed_my_db_my_table_1234-abcd"
+        assert len(make_label("x" * 200, 1)) == 128
+
+    def test_result(self):
+        result = StreamLoadResult.from_response("lbl", {"Status": "Publish Timeout", "NumberLoadedRows": "3"})
+
+        assert result.succeeded
+        assert result.rows_loaded == 3
+        assert not StreamLoadResult.from_response("lbl", {"Status": "Label Already Exists", "ExistingJobStatus": "RUNNING"}).succeeded
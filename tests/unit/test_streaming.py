@@ -0,0 +1,56 @@
+import pytest
+
+from dbt.adapters.starrocks.connections import StarRocksConnectionManager, _limit_sql
+
+
+class FakeCursor:
+    description = [("id",), ("value",)]
+
+    def __init__(self, total_rows):
+        self.rows = [(i, f"v{i}") for i in range(total_rows)]
+        self.fetch_sizes = []
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+
+class TestStreaming:
+
+    @pytest.mark.parametrize(
+        "sql, expected",
+        [
+            ("select * from t;", "select /*+ SET_VAR(sql_select_limit = 10) */ * from t;"),
+            (
+                " WITH a AS (select 1) select * from a",
+                " WITH a AS (select 1) select /*+ SET_VAR(sql_select_limit = 10) */ * from a",
+            ),
+            (
+                "-- select the rows\n/* of t */ SELECT a.id, b.id from a join b",
+                "-- select the rows\n/* of t */ SELECT /*+ SET_VAR(sql_select_limit = 10) */ a.id, b.id from a join b",
+            ),
+            ("show tables", "show tables"),
+            ("insert into t select 1", "insert into t select 1"),
+        ]
+    )
+    def test_limit_sql(self, sql, expected):
+        assert _limit_sql(sql, 10) == expected
+
+    def test_iter_cursor_reads_bounded_chunks(self):
+        cursor = FakeCursor(total_rows=25)
+
+        rows = list(StarRocksConnectionManager._iter_cursor(cursor, limit=None, chunk_size=10))
+
+        assert len(rows) == 25
+        assert rows[0] == {"id": 0, "value": "v0"}
+        assert cursor.fetch_sizes == [10, 10, 10, 10]
+
+    def test_iter_cursor_stops_at_limit(self):
+        cursor = FakeCursor(total_rows=1000)
+
+        rows = list(StarRocksConnectionManager._iter_cursor(cursor, limit=15, chunk_size=10))
+
+        assert len(rows) == 15
+        assert cursor.fetch_sizes == [10, 5]
+        assert len(cursor.rows) == 985
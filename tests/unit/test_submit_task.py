@@ -1,4 +1,13 @@
+from types import SimpleNamespace
+
+import agate
 import pytest
+from dbt.adapters.contracts.connection import AdapterResponse
+from dbt.adapters.sql import SQLAdapter
+from dbt.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks import impl
+from dbt.adapters.starrocks.helpers.task_poller import TaskPoller
 from dbt.adapters.starrocks.impl import StarRocksAdapter
 
 
@@ -42,4 +51,100 @@ class TestDBTLikeIsSubmittableETL:
         ]
     )
     def test_is_submittable_etl_suitable(self, sql, expected):
-        assert StarRocksAdapter._is_submittable_etl(sql) == expected
\ No newline at end of file
+        assert StarRocksAdapter._is_submittable_etl(sql) == expected
+
+class TestDropOrphanTask:
+
+    def test_drop(self):
+        statements = []
+
+        assert StarRocksAdapter._drop_orphan_task("abc123", statements.append)
+        assert statements == ["drop task abc123"]
+
+    def test_drop_failure_is_reported(self):
+        def run_sql(sql):
+            raise RuntimeError("Task not found")
+
+        assert not StarRocksAdapter._drop_orphan_task("abc123", run_sql)
+
+
+class TestTaskDroppedOnInterrupt:
+
+    @pytest.fixture
+    def adapter(self, monkeypatch):
+        adapter = StarRocksAdapter.__new__(StarRocksAdapter)
+        adapter.config = SimpleNamespace(credentials=SimpleNamespace(async_query_timeout=60, async_resume_key=None))
+        adapter._task_poller = TaskPoller(lambda sql: None)
+        adapter.statements = []
+        monkeypatch.setattr(SQLAdapter, "execute", lambda self, sql, **kwargs: self.statements.append(sql))
+        return adapter
+
+    def _execute(self, adapter, error):
+        def poll(task_id, column=None):
+            raise error
+
+        adapter._poll_for_complete_task = poll
+        with pytest.raises(type(error)):
+            adapter._execute_async_task("insert into `my_db`.`my_table` select 1")
+
+    def test_interrupt(self, adapter):
+        self._execute(adapter, KeyboardInterrupt())
+
+        assert adapter.statements[0].startswith("submit")
+        assert adapter.statements[1].startswith("drop task")
+
+    def test_poll_error_keeps_task(self, adapter):
+        self._execute(adapter, DbtRuntimeError("Lost connection to the server"))
+
+        # The task keeps running, to be resumed by the next attempt
+        assert len(adapter.statements) == 1
+        assert adapter._task_poller.inflight == 0
+
+
+class TestReleaseResumableTasks:
+
+    def test_release(self, monkeypatch):
+        adapter = StarRocksAdapter.__new__(StarRocksAdapter)
+        adapter.config = SimpleNamespace(credentials=SimpleNamespace(is_async=True, async_resume_key="run_1"))
+        monkeypatch.setattr(impl, "get_node_info", lambda: {"unique_id": "model.my_project.my_model"})
+        statements = []
+
+        def execute(sql, fetch=False):
+            statements.append(sql)
+            return None, agate.Table([("dbt_x_1",), ("dbt_x_2",)], ["TASK_NAME"])
+
+        adapter.execute = execute
+        relation = SimpleNamespace(schema="my_db", identifier="my_model__dbt_tmp")
+
+        assert adapter.release_resumable_tasks(relation) == ["dbt_x_1", "dbt_x_2"]
+        assert statements[0].startswith("select task_name from information_schema.tasks where task_name like 'dbt_")
+        assert statements[1:] == ["drop task dbt_x_1", "drop task dbt_x_2"]
+
+    def test_not_resumable(self):
+        adapter = StarRocksAdapter.__new__(StarRocksAdapter)
+        adapter.config = SimpleNamespace(credentials=SimpleNamespace(is_async=True, async_resume_key=None))
+
+        assert adapter.release_resumable_tasks(SimpleNamespace(schema="my_db", identifier="my_model")) == []
+
+
+class TestPollingLatencyReported:
+
+    def test_adapter_response(self):
+        class FinishedTask:
+            polling_latency = 1.23456
+
+            def wait(self, timeout=None):
+                return True
+
+            def result(self):
+                return AdapterResponse("OK", code="SUCCESS"), agate.Table([("SUCCESS",)], ["STATE"])
+
+        adapter = StarRocksAdapter.__new__(StarRocksAdapter)
+        adapter.connections = SimpleNamespace(get_if_exists=lambda: None, begin=lambda: None, open=lambda c: None)
+        adapter._task_poller = SimpleNamespace(submit=lambda task_id, column: FinishedTask())
+
+        response, _ = adapter._poll_for_complete_task("abc123")
+
+        # Serialized in the `adapter_response` of the run results
+        assert response.to_dict(omit_none=True)["polling_latency"] == 1.235
+        assert response.to_dict(omit_none=True)["task_state"] == "SUCCESS"
@@ -0,0 +1,271 @@
+import re
+import threading
+
+import agate
+import pytest
+from dbt.adapters.contracts.connection import AdapterResponse
+from dbt.exceptions import DbtRuntimeError
+
+from dbt.adapters.starrocks.helpers import task_poller
+from dbt.adapters.starrocks.helpers.task_poller import (
+    PendingTask,
+    TaskCancelledError,
+    TaskPoller,
+    compute_poll_delay,
+    estimate_polling_latency,
+    parse_progress,
+)
+
+COLUMNS = ["TASK_NAME", "STATE", "PROGRESS", "ERROR_MESSAGE"]
+
+
+class FakeTaskRuns:
+    """Stand-in for `information_schema.task_runs`, each task finishes after a number of polls."""
+
+    def __init__(self, polls_to_finish):
+        self.polls_to_finish = dict(polls_to_finish)
+        self.queries = []
+        self.lock = threading.Lock()
+
+    def run_query(self, sql):
+        with self.lock:
+            self.queries.append(sql)
+            rows = []
+            for task_id in re.findall(r"'([^']+)'", sql):
+                if task_id not in self.polls_to_finish:
+                    continue
+                self.polls_to_finish[task_id] -= 1
+                state = "SUCCESS" if self.polls_to_finish[task_id] <= 0 else "RUNNING"
+                rows.append((task_id, state, "50%", None))
+        table = agate.Table(rows, COLUMNS, [agate.Text()] * len(COLUMNS))
+        return AdapterResponse(_message="SUCCESS", code="SUCCESS"), table
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(task_poller, "MIN_POLL_DELAY", 0.001)
+    monkeypatch.setattr(task_poller, "MAX_POLL_DELAY", 0.01)
+
+
+class TestTaskPoller:
+
+    def test_single_query_per_tick(self):
+        task_runs = FakeTaskRuns({f"task_{i}": 1 for i in range(40)})
+        poller = TaskPoller(task_runs.run_query)
+
+        tasks = [poller.submit(f"task_{i}") for i in range(40)]
+        results = [task.result() for task in tasks]
+
+        assert all(table[0]["STATE"] == "SUCCESS" for _, table in results)
+        # Registrations are batched, far fewer queries than tasks
+        assert len(task_runs.queries) < 40
+        assert poller.outstanding == []
+
+    def test_waits_until_finished(self):
+        task_runs = FakeTaskRuns({"slow": 3, "fast": 1})
+        poller = TaskPoller(task_runs.run_query)
+
+        slow = poller.submit("slow")
+        fast = poller.submit("fast")
+
+        _, fast_table = fast.result()
+        _, slow_table = slow.result()
+        assert fast_table[0]["TASK_NAME"] == "fast"
+        assert slow_table[0]["TASK_NAME"] == "slow"
+        assert slow_table[0]["STATE"] == "SUCCESS"
+
+    def test_task_runs_by_query_id(self):
+        queries = []
+
+        def run_query(sql):
+            queries.append(sql)
+            table = agate.Table([("mv-1", "q-1", "SUCCESS", "100%", None)], ["TASK_NAME", "QUERY_ID"] + COLUMNS[1:])
+            return AdapterResponse(_message="SUCCESS", code="SUCCESS"), table
+
+        _, table = TaskPoller(run_query).submit("q-1", "QUERY_ID").result()
+
+        assert table[0]["TASK_NAME"] == "mv-1"
+        assert "query_id in ('q-1')" in queries[0]
+
+    def test_missing_task_resolves_empty(self):
+        poller = TaskPoller(FakeTaskRuns({}).run_query)
+
+        _, table = poller.submit("missing").result()
+
+        assert len(table) == 0
+
+    def test_polling_error_is_raised_to_waiters(self):
+        calls = []
+
+        def failing_query(sql):
+            calls.append(sql)
+            raise RuntimeError("FE unavailable")
+
+        poller = TaskPoller(failing_query)
+
+        with pytest.raises(RuntimeError, match="FE unavailable"):
+            poller.submit("task").result()
+        # The tasks only fail after several polls failed in a row
+        assert len(calls) == task_poller.MAX_POLL_FAILURES
+
+    def test_transient_polling_error_is_retried(self):
+        task_runs = FakeTaskRuns({"task_1": 1, "task_2": 2})
+        calls = []
+
+        def flaky_query(sql):
+            calls.append(sql)
+            if len(calls) == 1:
+                raise RuntimeError("Lost connection to the server")
+            return task_runs.run_query(sql)
+
+        poller = TaskPoller(flaky_query)
+        tasks = [poller.submit("task_1"), poller.submit("task_2")]
+
+        assert all(table[0]["STATE"] == "SUCCESS" for _, table in (task.result() for task in tasks))
+        assert len(calls) > 1
+
+    def test_polling_latency_is_recorded(self):
+        task_runs = FakeTaskRuns({"task": 2})
+        poller = TaskPoller(task_runs.run_query)
+
+        task = poller.submit("task")
+        task.result()
+
+        assert task.polling_latency is not None
+        assert task.polling_latency >= 0
+
+
+class TestAdaptivePolling:
+
+    @pytest.mark.parametrize(
+        "progress, expected",
+        [("42%", 0.42), ("100%", 1.0), ("0%", 0.0), ("unknown", None), (None, None), ("250%", None)]
+    )
+    def test_parse_progress(self, progress, expected):
+        assert parse_progress(progress) == expected
+
+    def test_polls_more_often_near_the_end(self):
+        early = compute_poll_delay(elapsed=60, progress=0.1, attempts=3, max_delay=600, jitter=0)
+        late = compute_poll_delay(elapsed=60, progress=0.9, attempts=3, max_delay=600, jitter=0)
+
+        assert early == pytest.approx(270)
+        assert late == pytest.approx(3.33, abs=0.01)
+
+    def test_backoff_without_progress(self):
+        assert compute_poll_delay(elapsed=10, progress=None, attempts=3, jitter=0) == 8
+        assert compute_poll_delay(elapsed=10, progress=0.0, attempts=20, max_delay=60, jitter=0) == 60
+
+    def test_jitter_stays_in_bounds(self):
+        delays = [compute_poll_delay(elapsed=10, progress=None, attempts=3, jitter=0.1) for _ in range(200)]
+
+        assert min(delays) >= 8 * 0.9
+        assert max(delays) <= 8 * 1.1
+        assert len(set(delays)) > 1
+
+    def test_latency_from_task_timings(self):
+        task = PendingTask("task")
+        task.submitted_at = 100.0
+        task.last_running_poll_at = 150.0
+        row = {"CREATE_TIME": "2024-01-01 00:00:00", "FINISH_TIME": "2024-01-01 00:01:00"}
+
+        # Finished 60s after its submission, observed 70s after
+        assert estimate_polling_latency(task, row, observed_at=170.0) == pytest.approx(10.0)
+
+    def test_latency_bounded_by_last_poll(self):
+        task = PendingTask("task")
+        task.submitted_at = 100.0
+        task.last_running_poll_at = 150.0
+
+        assert estimate_polling_latency(task, {}, observed_at=155.0) == pytest.approx(5.0)
+
+
+class TestInflightSlots:
+
+    def test_unbounded_by_default(self):
+        poller = TaskPoller(FakeTaskRuns({}).run_query)
+
+        assert all(poller.acquire_slot(timeout=0) for _ in range(100))
+        assert poller.inflight == 100
+
+    def test_bounded(self):
+        poller = TaskPoller(FakeTaskRuns({}).run_query, max_inflight=2)
+
+        assert poller.acquire_slot(timeout=0)
+        assert poller.acquire_slot(timeout=0)
+        assert not poller.acquire_slot(timeout=0.01)
+
+        poller.release_slot()
+        assert poller.acquire_slot(timeout=0)
+        assert poller.peak_inflight == 2
+
+    def test_more_threads_than_slots(self):
+        task_runs = FakeTaskRuns({f"task_{i}": 2 for i in range(20)})
+        poller = TaskPoller(task_runs.run_query, max_inflight=3)
+        errors = []
+
+        def run(task_id):
+            poller.acquire_slot()
+            try:
+                if poller.inflight > 3:
+                    errors.append(task_id)
+                poller.submit(task_id).result()
+            finally:
+                poller.release_slot()
+
+        threads = [threading.Thread(target=run, args=(f"task_{i}",)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert errors == []
+        assert poller.peak_inflight == 3
+        assert poller.inflight == 0
+
+    def test_invalid_limit(self):
+        with pytest.raises(DbtRuntimeError):
+            TaskPoller(FakeTaskRuns({}).run_query, max_inflight=0)
+
+
+class TestCancel:
+
+    def test_wakes_up_waiting_threads(self):
+        # Never finishes
+        task_runs = FakeTaskRuns({"task_a": 10 ** 6, "task_b": 10 ** 6})
+        poller = TaskPoller(task_runs.run_query)
+        tasks = [poller.submit("task_a"), poller.submit("task_b")]
+
+        assert sorted(poller.cancel()) == ["task_a", "task_b"]
+
+        for task in tasks:
+            with pytest.raises(TaskCancelledError) as e:
+                task.result()
+            assert not e.value.orphan
+        assert poller.outstanding == []
+
+    def test_refuses_new_tasks(self):
+        poller = TaskPoller(FakeTaskRuns({}).run_query)
+        poller.cancel()
+
+        with pytest.raises(TaskCancelledError) as e:
+            poller.submit("late")
+        assert e.value.orphan
+        assert e.value.task_id == "late"
+
+    def test_wakes_up_slot_waiters(self):
+        poller = TaskPoller(FakeTaskRuns({}).run_query, max_inflight=1)
+        poller.acquire_slot()
+        errors = []
+
+        def wait_for_slot():
+            try:
+                poller.acquire_slot()
+            except TaskCancelledError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=wait_for_slot)
+        thread.start()
+        poller.cancel()
+        thread.join(timeout=5)
+
+        assert len(errors) == 1
@@ -0,0 +1,81 @@
+import json
+import threading
+
+import pytest
+
+from dbt.adapters.starrocks.helpers.version import ServerVersionCache, parse_version
+
+
+class TestParseVersion:
+    @pytest.mark.parametrize(
+        "version, expected",
+        [
+            ("3.1.2-4f3fa2b", (3, 1, 2)),
+            ("3.10.12-ee", (3, 10, 12)),
+            ("2.5.21 RELEASE", (2, 5, 21)),
+            ("3.3.0", (3, 3, 0)),
+            ("3.1", (3, 1, 0)),
+            ("v3.2.4", (3, 2, 4)),
+            ("", None),
+            ("main-4f3fa2b", None),
+            ("3", None),
+        ]
+    )
+    def test_parse_version(self, version, expected):
+        assert parse_version(version) == expected
+
+    def test_multi_digit_ordering(self):
+        assert parse_version("3.10.0") > parse_version("3.9.9")
+
+
+class TestServerVersionCache:
+
+    def test_detects_once_per_host(self):
+        cache = ServerVersionCache()
+        calls = []
+
+        def detect():
+            calls.append(1)
+            return "3.3.5-abcdef"
+
+        threads = [
+            threading.Thread(target=cache.get_or_detect, args=("fe:9030", detect))
+            for _ in range(16)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.get("fe:9030") == (3, 3, 5)
+        assert cache.get("other:9030") is None
+        assert len(calls) == 1
+
+    def test_failed_detection_is_not_cached(self):
+        cache = ServerVersionCache()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        assert cache.get_or_detect("fe:9030", fail) is None
+        assert cache.get_or_detect("fe:9030", lambda: "3.1.0") == (3, 1, 0)
+
+    def test_persisted_with_ttl(self, tmp_path):
+        path = str(tmp_path / "target" / "versions.json")
+
+        first = ServerVersionCache()
+        first.configure(path=path, ttl=3600)
+        first.get_or_detect("fe:9030", lambda: "3.4.1-ee")
+
+        second = ServerVersionCache()
+        second.configure(path=path, ttl=3600)
+        assert second.get_or_detect("fe:9030", lambda: pytest.fail("should not detect")) == (3, 4, 1)
+
+    def test_expired_entry_is_detected_again(self, tmp_path):
+        path = tmp_path / "versions.json"
+        path.write_text(json.dumps({"fe:9030": {"version": "3.1.0", "detected_at": 0}}))
+
+        cache = ServerVersionCache()
+        cache.configure(path=str(path), ttl=60)
+
+        assert cache.get_or_detect("fe:9030", lambda: "3.3.0") == (3, 3, 0)